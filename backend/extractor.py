@@ -5,33 +5,300 @@ Preserves ALL existing functionality + Fixes web interface + Standardizes folder
 """
 
 import fitz  # PyMuPDF
+import atexit
 import json
+import gzip
 import re
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image, ImageEnhance
+import PIL
+from PIL import Image, ImageFilter
 import shutil
+import secrets
+import socket
+import tempfile
+import time
 import os
 import sys
+import argparse
 import logging
+import logging.handlers
+import multiprocessing
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, fields
+from typing import Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging once, unless the embedding application already has; the log file
+# rotates so a long-running web server cannot grow it without bound
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.handlers.RotatingFileHandler('extractor.log', maxBytes=5_000_000, backupCount=3),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
 logger = logging.getLogger(__name__)
 
-# Web interface imports (only imported when running as web server)
-WEB_MODE = False
+# Pillow-SIMD is a drop-in Pillow build with vectorized kernels; its versions end in .postN
+PILLOW_SIMD = ".post" in PIL.__version__
+
+# Optional fast JSON encoder (falls back to stdlib json)
 try:
-    from flask import Flask, request, jsonify, render_template_string, redirect, url_for, send_file
-    from flask_cors import CORS
-    import tempfile
-    import traceback
-    WEB_MODE = True
-    logger.info("Flask imported successfully - Web mode available")
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional Brotli compression for static web responses (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
 except ImportError:
-    logger.warning("Flask not installed - running in CLI mode only")
-    print("💡 Flask not installed - running in CLI mode only")
-    print("   To enable web interface: pip install flask flask-cors")
+    BROTLI_AVAILABLE = False
+
+# Optional CSS/JS minifiers for the web page assets (whitespace-only minification otherwise)
+try:
+    import rcssmin
+    import rjsmin
+    MINIFIERS_AVAILABLE = True
+except ImportError:
+    MINIFIERS_AVAILABLE = False
+
+# Cross-process file locks (POSIX) for the PDF digest index shared with the extraction worker
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def write_json_file(path, data):
+    """Write data as indented UTF-8 JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def json_bytes(data):
+    """Compact UTF-8 JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def read_json_file(path):
+    """Read a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Precompiled patterns for question / option / footer detection
+_RE_NUM_1_2 = re.compile(r'^\d{1,2}$')
+_RE_NUM_TEXT = re.compile(r'^\d{1,2}\s+[A-Z]')
+_RE_LEADING_NUM = re.compile(r'^(\d{1,2})')
+_RE_NUM_TWO_DIGIT = re.compile(r'^0?\d{1,2}$')
+_RE_NUM_DOT = re.compile(r'^\d{1,2}\.$')
+_RE_NUM_PAREN = re.compile(r'^\d{1,2}\)$')
+_RE_DIGITS = re.compile(r'^\d+$')
+_RE_OPTION_LETTER = re.compile(r'^[A-D]$')
+_RE_OPTION_WITH_TEXT = re.compile(r'^[A-D]\s+\w+')
+_RE_OPTION_NUMERIC = re.compile(r'^\d+\s*[A-Za-z]*$')
+_RE_OPTION_PAREN = re.compile(r'^[A-D]\)')
+_RE_FOOTER = re.compile('|'.join([
+    r'©\s*UCLES', r'UCLES\s+\d+', r'\d+/\d+/[A-Z]/[A-Z]/\d+',
+    r'0625/\d+/[A-Z]/[A-Z]/\d+', r'Turn over', r'^\[Turn over\]$',
+    r'Cambridge International', r'IGCSE', r'Do not write',
+    r'Permission to reproduce', r'End of Question Paper'
+]), re.IGNORECASE)
+
+# Exam session month codes → display names
+_MONTH_MAP = {
+    "mar": "March",
+    "may": "May/June",
+    "oct": "October/November",
+    "jan": "January",
+    "feb": "February",
+    "jun": "June",
+    "nov": "November",
+    "dec": "December"
+}
+
+# Numeric month codes ("03", "3") resolve like their three-letter equivalents
+_MONTH_MAP.update({
+    number: _MONTH_MAP[code]
+    for code, month_number in [("jan", 1), ("feb", 2), ("mar", 3), ("may", 5),
+                               ("jun", 6), ("oct", 10), ("nov", 11), ("dec", 12)]
+    for number in (f"{month_number:02d}", str(month_number))
+})
+
+# Web interface (Flask is only imported by create_web_app, so CLI runs never load it)
+WEB_MODE = False
+app = None
+
+def should_enhance(enhancement_factor):
+    """Check whether an enhancement factor is far enough from 1.0 to be worth a pass"""
+    return abs(enhancement_factor - 1.0) >= 0.02
+
+def enhance_question_image(img, enhancement_factor):
+    """
+    Apply light enhancement to an extracted question image (in memory)
+    Factors within 0.02 of 1.0 are visually a no-op, so the image is returned as-is.
+    Use a factor of 1.2+ when sharpening is actually wanted.
+    """
+    if not should_enhance(enhancement_factor):
+        return img
+    
+    try:
+        # Single unsharp-mask pass instead of separate contrast + sharpness passes
+        percent = int((enhancement_factor - 1.0) * 200)
+        return img.filter(ImageFilter.UnsharpMask(radius=1, percent=percent, threshold=0))
+        
+    except Exception as e:
+        logger.warning("Image enhancement failed: %s", e)
+        return img
+
+def save_question_image(img, img_path, image_format):
+    """
+    Encode a question image quickly
+    PNG uses zlib level 1 (slightly larger files, several times faster than the default 6);
+    WebP is lossless with the fastest method
+    """
+    if image_format == "webp":
+        img.save(img_path, "WEBP", lossless=True, method=0)
+    else:
+        img.save(img_path, "PNG", compress_level=1)
+
+def render_page_questions(page, page_questions, zoom, page_width, page_height, enhancement_factor, images_dir,
+                          image_format="png"):
+    """
+    Interpret one PDF page once and save every question image on it
+    Only the question rectangles are rasterized at full zoom - margins, headers and
+    footers never become pixels
+    Returns (saved, failed): {q_num: image info} and {q_num: error message}
+    """
+    saved = {}
+    failed = {}
+    matrix = fitz.Matrix(zoom, zoom)
+    
+    try:
+        # Parse the page content stream once; each clip below only rasterizes its rectangle
+        display_list = page.get_displaylist()
+    except Exception as e:
+        for q_num, _ in page_questions:
+            failed[q_num] = str(e)
+        return saved, failed
+    
+    for q_num, bounds in page_questions:
+        try:
+            # Question area with padding
+            clip_rect = fitz.Rect(
+                5,
+                max(0, bounds["start_y"] - 5),
+                page_width - 5,
+                min(page_height, bounds["end_y"] + 10)
+            )
+            pix = display_list.get_pixmap(matrix=matrix, clip=clip_rect, alpha=False)
+            
+            # samples_mv exposes the pixel buffer without the bytes copy pix.samples makes
+            question_img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+            pix = None
+            question_img = enhance_question_image(question_img, enhancement_factor)
+            
+            # STANDARDIZED: Consistent naming convention
+            img_filename = f"question_{q_num:02d}_enhanced.{image_format}"
+            img_path = os.path.join(images_dir, img_filename)
+            save_question_image(question_img, img_path, image_format)
+            
+            saved[q_num] = {
+                "filename": img_filename,
+                "path": img_path,
+                "size": question_img.size
+            }
+        except Exception as e:
+            failed[q_num] = str(e)
+    
+    return saved, failed
+
+def _render_page_questions_worker(task):
+    """
+    Process-pool worker for render_page_questions
+    Opens its own fitz.Document - documents can't be pickled across processes
+    """
+    pdf_path, page_num, *render_args = task
+    pdf_doc = fitz.open(pdf_path)
+    try:
+        return page_num, render_page_questions(pdf_doc[page_num - 1], *render_args)
+    finally:
+        pdf_doc.close()
+
+class ExtractionCancelled(Exception):
+    """Raised between pipeline stages once an extraction's cancel_event is set"""
+
+def new_pdf_digest():
+    """Hasher for PDF content digests (uploads hash while saving; the extraction cache must agree)"""
+    return hashlib.blake2b(digest_size=16)
+
+PDF_DIGEST_INDEX_LIMIT = 256  # PDFs whose content digest is remembered in the extraction cache
+
+# Threads shared by every image deployment in this process (created on first use)
+DEPLOY_IO_THREADS = 8
+_deploy_executor = None
+_deploy_executor_lock = threading.Lock()
+
+def _get_deploy_executor():
+    """Create the image-deployment thread pool on first use"""
+    global _deploy_executor
+    with _deploy_executor_lock:
+        if _deploy_executor is None:
+            _deploy_executor = ThreadPoolExecutor(
+                max_workers=DEPLOY_IO_THREADS, thread_name_prefix="deploy-images"
+            )
+        return _deploy_executor
+
+# Separator lines for console output
+_SEP40 = "=" * 40
+_SEP60 = "=" * 60
+_SEP70 = "=" * 70
+
+_SUCCESS_SUMMARY_TEMPLATE = "\n".join([
+    "\n🎉 EXTRACTION COMPLETE - SUCCESS!",
+    _SEP60,
+    "✅ Questions extracted: %s",
+    "🖼️ Images saved to: %s",
+    "📁 Images available: %s",
+    "💾 Question bank: %s",
+    "📃 Standardized filename: %s",
+    "📅 Month: %s → Display: %s",
+    "🎯 Web interface ready with standardized 'images' folder"
+])
+
+@dataclass(slots=True)
+class ExtractionResult:
+    """Result envelope returned by extract_questions_for_web_interface"""
+    success: bool
+    questions_found: int = 0
+    deployed_images: int = 0
+    error: Optional[str] = None
+    question_bank: Optional[dict] = None
+    deployment: Optional[dict] = None
+    images_extracted: Optional[int] = None
+    output_file: Optional[str] = None
+    exception: Optional[str] = None
+    
+    def to_dict(self):
+        """Plain dict for API/JSON consumers (unset optional fields are omitted)"""
+        return {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if getattr(self, field.name) is not None
+        }
 
 class EnhancedPDFExtractor:
     """
@@ -53,95 +320,176 @@ class EnhancedPDFExtractor:
         self.react_app_path = Path("/Users/wynceaxcel/Apps/axcelscore")
         self.backend_dir = Path("/Users/wynceaxcel/Apps/axcelscore/backend")
         
+        # Plain-string copies for per-file hot paths (avoids Path object churn)
+        self._base_dir_str = os.fspath(self.base_dir)
+        self._images_dir_str = os.fspath(self.images_dir)
+        
         # Initialize directories
         self._setup_directories()
         
         # Question boundaries storage
         self.question_boundaries = {}
         
+        # Open PDF shared between boundary detection and image extraction
+        self._pdf_doc = None
+        self._pdf_path = None
+        self._page_heights = {}
+        self._page_widths = {}
+        
         # Enhanced configuration
         self.max_questions = 50
         self.image_quality = 2.0  # Zoom factor for image rendering
-        self.enhancement_factor = 1.05  # Image enhancement factor
+        self.enhancement_factor = 1.05  # Image enhancement factor (≈1.0 skips enhancement)
+        self.image_format = "png"  # Question image format: "png" or "webp"
+        self.num_workers = min(os.cpu_count() or 1, 4)  # Processes for page rendering
+        
+        # Content-addressed cache of finished extractions
+        self.cache_dir = self.base_dir / ".cache"
+        self.max_cached_extractions = 20
+        
+        # Live progress (queue-like, receives event dicts) and cancellation (Event-like),
+        # set only for the duration of one extract_questions_for_web_interface call
+        self.progress_queue = None
+        self.cancel_event = None
         
         # Logging setup
         logger.info("🎯 Enhanced PDF Question Extractor initialized")
-        logger.info(f"📂 Base directory: {self.base_dir}")
-        logger.info(f"🖼️ Images directory: {self.images_dir}")
+        logger.info("📂 Base directory: %s", self.base_dir)
+        logger.info("🖼️ Images directory: %s", self.images_dir)
         logger.info("✅ Ready for extraction")
     
     def _setup_directories(self):
-        """Setup and clean directories"""
+        """
+        Setup directories
+        Existing images are kept; stale question images are removed by _clean_paper_images
+        when an extraction actually starts
+        """
         try:
-            # Clean up existing images directory
-            if self.images_dir.exists():
-                shutil.rmtree(self.images_dir)
-                logger.info(f"🧹 Cleaned existing images directory: {self.images_dir}")
-            
-            # Create fresh directories
+            # Create directories (no-op if they already exist)
             self.images_dir.mkdir(parents=True, exist_ok=True)
             self.base_dir.mkdir(parents=True, exist_ok=True)
             
-            logger.info(f"📁 Created directories successfully")
+            logger.info("📁 Created directories successfully")
             
         except Exception as e:
-            logger.error(f"Failed to setup directories: {e}")
+            logger.error("Failed to setup directories: %s", e)
             raise
     
+    def _open_pdf(self, pdf_path):
+        """
+        Open the PDF once and cache page dimensions
+        Reuses the already-open document when called again for the same path
+        """
+        if self._pdf_doc is not None and self._pdf_path == str(pdf_path):
+            return self._pdf_doc
+        
+        self._close_pdf()
+        pdf_doc = fitz.open(pdf_path)
+        self._pdf_doc = pdf_doc
+        self._pdf_path = str(pdf_path)
+        
+        # Encrypted documents can't be read until authenticated (see _probe_pdf)
+        if pdf_doc.needs_pass:
+            return pdf_doc
+        
+        for i in range(pdf_doc.page_count):
+            rect = pdf_doc[i].rect
+            self._page_heights[i + 1] = rect.height
+            self._page_widths[i + 1] = rect.width
+        
+        return pdf_doc
+    
+    def _probe_pdf(self, pdf_path):
+        """
+        Cheap pre-check before boundary detection (the opened PDF is reused by Step 1)
+        Returns an error message for PDFs the text-based detector can't process, else None
+        """
+        pdf_doc = self._open_pdf(pdf_path)
+        
+        if pdf_doc.needs_pass:
+            return "PDF is encrypted (password required)"
+        
+        if pdf_doc.page_count == 0:
+            return "PDF has no pages"
+        
+        sample_text = "".join(pdf_doc[i].get_text("text") for i in range(min(3, pdf_doc.page_count)))
+        if len(sample_text.strip()) < 20:
+            return "PDF has no text layer (scanned document?) - OCR is not supported"
+        
+        return None
+    
+    def _close_pdf(self):
+        """Close the shared PDF document and drop cached page dimensions"""
+        if self._pdf_doc is not None:
+            self._pdf_doc.close()
+        self._pdf_doc = None
+        self._pdf_path = None
+        self._page_heights = {}
+        self._page_widths = {}
+    
     def find_enhanced_question_boundaries(self, pdf_path):
         """
         Enhanced boundary detection using multiple strategies
         Preserves all existing detection logic with improvements
+        The PDF stays open for extract_enhanced_question_images
         """
         logger.info("🔍 Starting enhanced question boundary detection")
         
         try:
-            pdf_doc = fitz.open(pdf_path)
+            pdf_doc = self._open_pdf(pdf_path)
             all_text_elements = []
+            append_element = all_text_elements.append
+            
+            # Only text, bboxes, sizes and font names are needed - don't embed image data
+            text_flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
             
             # Collect all text elements with detailed positioning
             for page_num in range(pdf_doc.page_count):
                 page = pdf_doc[page_num]
-                text_dict = page.get_text("dict")
+                page_no = page_num + 1
+                text_dict = page.get_text("dict", flags=text_flags)
                 
                 for block in text_dict["blocks"]:
                     if "lines" not in block:
                         continue
                         
                     for line in block["lines"]:
-                        for span in line["spans"]:
+                        for span_index, span in enumerate(line["spans"]):
                             text = span["text"].strip()
-                            if text:
-                                element = {
-                                    "text": text,
-                                    "bbox": span["bbox"],
-                                    "page": page_num + 1,
-                                    "font_size": span["size"],
-                                    "x": span["bbox"][0],
-                                    "y": span["bbox"][1],
-                                    "width": span["bbox"][2] - span["bbox"][0],
-                                    "height": span["bbox"][3] - span["bbox"][1],
-                                    "at_left_margin": span["bbox"][0] < 100,
-                                    "near_left": span["bbox"][0] < 150,
-                                    "is_bold": "Bold" in span.get("font", "").lower() or "bold" in span.get("font", "").lower(),
-                                    "line_start": len([s for s in line["spans"] if s == span]) == 0,
-                                    "font_name": span.get("font", "")
-                                }
-                                all_text_elements.append(element)
+                            if not text:
+                                continue
+                            
+                            bbox = span["bbox"]
+                            x0, y0, x1, y1 = bbox
+                            font_name = span.get("font", "")
+                            append_element({
+                                "text": text,
+                                "bbox": bbox,
+                                "page": page_no,
+                                "font_size": span["size"],
+                                "x": x0,
+                                "y": y0,
+                                "width": x1 - x0,
+                                "height": y1 - y0,
+                                "at_left_margin": x0 < 100,
+                                "near_left": x0 < 150,
+                                "is_bold": "bold" in font_name.casefold(),
+                                "line_start": span_index == 0,
+                                "font_name": font_name
+                            })
             
             # Enhanced question detection with multiple strategies
             question_starts = self._detect_question_starts_multi_strategy(all_text_elements)
-            self._calculate_smart_boundaries(question_starts, all_text_elements, pdf_doc)
-            
-            pdf_doc.close()
+            self._calculate_smart_boundaries(question_starts, all_text_elements)
             
             detected_count = len(self.question_boundaries)
-            logger.info(f"📊 Detected {detected_count} question boundaries")
+            logger.info("📊 Detected %s question boundaries", detected_count)
             
             return detected_count
             
         except Exception as e:
-            logger.error(f"Boundary detection failed: {e}")
+            logger.error("Boundary detection failed: %s", e)
+            self._close_pdf()
             raise
     
     def _detect_question_starts_multi_strategy(self, text_elements):
@@ -154,6 +502,13 @@ class EnhancedPDFExtractor:
         
         logger.info("🔍 Applying multiple detection strategies")
         
+        # Every strategy needs a near-left element whose text starts with a digit;
+        # classify once so the strategies only scan the (few) candidates
+        candidates = [
+            element for element in text_elements
+            if element["near_left"] and element["text"][:1].isdigit()
+        ]
+        
         strategies = [
             ("standalone_number", self._strategy_standalone_number, 0.9),
             ("number_with_text", self._strategy_number_with_text, 0.85),
@@ -165,14 +520,18 @@ class EnhancedPDFExtractor:
         ]
         
         for strategy_name, strategy_func, base_confidence in strategies:
-            strategy_results = strategy_func(text_elements, found_numbers)
+            # Every possible question number already found - remaining strategies can't add anything
+            if len(found_numbers) >= self.max_questions:
+                break
+            
+            strategy_results = strategy_func(candidates, found_numbers)
             
             for result in strategy_results:
                 result["strategy"] = strategy_name
                 result["confidence"] = base_confidence
                 question_starts.append(result)
                 found_numbers.add(result["question_number"])
-                logger.info(f"  ✅ Found Q{result['question_number']} ({strategy_name})")
+                logger.debug("  ✅ Found Q%s (%s)", result['question_number'], strategy_name)
         
         # Sort and deduplicate
         question_starts.sort(key=lambda x: (
@@ -189,16 +548,21 @@ class EnhancedPDFExtractor:
                 unique_starts.append(start)
                 seen_numbers.add(start["question_number"])
         
-        logger.info(f"📈 Total unique question starts: {len(unique_starts)}")
+        logger.info("📈 Total unique question starts: %s", len(unique_starts))
         return unique_starts
     
     def _strategy_standalone_number(self, elements, found_numbers):
         """Strategy 1: Standalone numbers at left margin (most reliable)"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_1_2.match
         for element in elements:
             text = element["text"].strip()
             if (element["at_left_margin"] and 
-                re.match(r'^\d{1,2}$', text) and
+                match(text) and
                 6 <= element["font_size"] <= 20):
                 
                 q_num = int(text)
@@ -207,18 +571,27 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
     def _strategy_number_with_text(self, elements, found_numbers):
         """Strategy 2: Number followed by capital letter/word"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_TEXT.match
+        match_leading = _RE_LEADING_NUM.match
         for element in elements:
             text = element["text"].strip()
             if (element["at_left_margin"] and 
-                re.match(r'^\d{1,2}\s+[A-Z]', text) and
+                match(text) and
                 6 <= element["font_size"] <= 20):
                 
-                q_num_match = re.match(r'^(\d{1,2})', text)
+                q_num_match = match_leading(text)
                 if q_num_match:
                     q_num = int(q_num_match.group(1))
                     if 1 <= q_num <= self.max_questions and q_num not in found_numbers:
@@ -226,15 +599,23 @@ class EnhancedPDFExtractor:
                             "question_number": q_num,
                             "element": element
                         })
+                        new_numbers.add(q_num)
+                        if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                            break
         return results
     
     def _strategy_bold_number(self, elements, found_numbers):
         """Strategy 3: Bold numbers"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_1_2.match
         for element in elements:
             text = element["text"].strip()
             if (element["is_bold"] and element["near_left"] and
-                re.match(r'^\d{1,2}$', text) and
+                match(text) and
                 8 <= element["font_size"] <= 18):
                 
                 q_num = int(text)
@@ -243,15 +624,23 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
     def _strategy_two_digit_number(self, elements, found_numbers):
         """Strategy 4: Two-digit numbers at left margin"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_TWO_DIGIT.match
         for element in elements:
             text = element["text"].strip()
             if (element["at_left_margin"] and 
-                re.match(r'^0?\d{1,2}$', text) and
+                match(text) and
                 6 <= element["font_size"] <= 20):
                 
                 q_num = int(text)
@@ -260,15 +649,23 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
     def _strategy_number_with_dot(self, elements, found_numbers):
         """Strategy 5: Number with trailing dot"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_DOT.match
         for element in elements:
             text = element["text"].strip()
             if (element["at_left_margin"] and 
-                re.match(r'^\d{1,2}\.$', text) and
+                match(text) and
                 6 <= element["font_size"] <= 20):
                 
                 q_num = int(text[:-1])
@@ -277,15 +674,23 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
     def _strategy_number_with_parenthesis(self, elements, found_numbers):
         """Strategy 6: Number with parenthesis"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_PAREN.match
         for element in elements:
             text = element["text"].strip()
             if (element["at_left_margin"] and 
-                re.match(r'^\d{1,2}\)$', text) and
+                match(text) and
                 6 <= element["font_size"] <= 20):
                 
                 q_num = int(text[:-1])
@@ -294,15 +699,23 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
     def _strategy_large_font_number(self, elements, found_numbers):
         """Strategy 7: Large font numbers (likely questions)"""
         results = []
+        if len(found_numbers) >= self.max_questions:
+            return results
+        
+        new_numbers = set()
+        match = _RE_NUM_1_2.match
         for element in elements:
             text = element["text"].strip()
             if (element["near_left"] and 
-                re.match(r'^\d{1,2}$', text) and
+                match(text) and
                 element["font_size"] >= 12):
                 
                 q_num = int(text)
@@ -311,15 +724,21 @@ class EnhancedPDFExtractor:
                         "question_number": q_num,
                         "element": element
                     })
+                    new_numbers.add(q_num)
+                    if len(found_numbers) + len(new_numbers) >= self.max_questions:
+                        break
         return results
     
-    def _calculate_smart_boundaries(self, question_starts, all_elements, pdf_doc):
+    def _calculate_smart_boundaries(self, question_starts, all_elements):
         """
         Calculate smart question boundaries
         Preserves existing logic with enhancements
         """
         logger.info("🎯 Calculating smart question boundaries")
         
+        # Start fresh so a reused extractor never keeps boundaries from a previous PDF
+        self.question_boundaries = {}
+        
         for i, start_info in enumerate(question_starts):
             q_num = start_info["question_number"]
             start_element = start_info["element"]
@@ -327,7 +746,7 @@ class EnhancedPDFExtractor:
             start_y = start_element["y"]
             
             end_y = self._find_smart_end_boundary(
-                q_num, page_num, start_y, all_elements, question_starts, i, pdf_doc
+                q_num, page_num, start_y, all_elements, question_starts, i
             )
             
             self.question_boundaries[q_num] = {
@@ -339,15 +758,14 @@ class EnhancedPDFExtractor:
                 "confidence": start_info["confidence"]
             }
             
-            logger.info(f"  Q{q_num}: Page {page_num}, Y: {start_y:.0f}-{end_y:.0f} (height: {end_y-start_y:.0f})")
+            logger.debug("  Q%s: Page %s, Y: %.0f-%.0f (height: %.0f)", q_num, page_num, start_y, end_y, end_y-start_y)
     
-    def _find_smart_end_boundary(self, q_num, page_num, start_y, all_elements, question_starts, start_index, pdf_doc):
+    def _find_smart_end_boundary(self, q_num, page_num, start_y, all_elements, question_starts, start_index):
         """
         Find smart end boundary for question
         Enhanced version of existing logic
         """
-        page = pdf_doc[page_num - 1]
-        page_height = page.rect.height
+        page_height = self._page_heights[page_num]
         
         # Default end boundary
         default_end_y = page_height
@@ -392,21 +810,21 @@ class EnhancedPDFExtractor:
     def _is_answer_option_enhanced(self, text, element):
         """Enhanced answer option detection"""
         # Single letter options (A, B, C, D)
-        if re.match(r'^[A-D]$', text) and element["x"] < 250:
+        if _RE_OPTION_LETTER.match(text) and element["x"] < 250:
             return True
         
         # Letter with text (A something)
-        if re.match(r'^[A-D]\s+\w+', text) and element["x"] < 300:
+        if _RE_OPTION_WITH_TEXT.match(text) and element["x"] < 300:
             return True
         
         # Numeric options
-        if (re.match(r'^\d+\s*[A-Za-z]*$', text) and 
+        if (_RE_OPTION_NUMERIC.match(text) and 
             30 < element["x"] < 350 and
             element["font_size"] >= 8):
             return True
         
         # Multiple choice patterns
-        if re.match(r'^[A-D]\)', text) and element["x"] < 200:
+        if _RE_OPTION_PAREN.match(text) and element["x"] < 200:
             return True
         
         return False
@@ -415,124 +833,136 @@ class EnhancedPDFExtractor:
         """Check if text is question content"""
         if len(text) < 2:
             return False
-        if re.match(r'^\d+$', text):  # Just numbers
+        if _RE_DIGITS.match(text):  # Just numbers
             return False
-        if re.match(r'^[A-D]$', text):  # Just option letters
+        if _RE_OPTION_LETTER.match(text):  # Just option letters
             return False
         if element["font_size"] < 6 or element["font_size"] > 20:
             return False
         return True
     
     def _is_footer_content_enhanced(self, text):
-        """Enhanced footer content detection"""
-        footer_patterns = [
-            r'©\s*UCLES', r'UCLES\s+\d+', r'\d+/\d+/[A-Z]/[A-Z]/\d+',
-            r'0625/\d+/[A-Z]/[A-Z]/\d+', r'Turn over', r'^\[Turn over\]$',
-            r'Cambridge International', r'IGCSE', r'Do not write',
-            r'Permission to reproduce', r'End of Question Paper'
-        ]
+        """Enhanced footer content detection (all footer patterns in one precompiled regex)"""
+        return _RE_FOOTER.search(text) is not None
+    
+    def _clean_paper_images(self):
+        """Remove question images left over from a previous extraction"""
+        removed = 0
+        try:
+            with os.scandir(self._images_dir_str) as entries:
+                stale_paths = [
+                    entry.path for entry in entries
+                    if entry.name.startswith("question_") and "_enhanced." in entry.name
+                ]
+        except FileNotFoundError:
+            return
         
-        for pattern in footer_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        for img_path in stale_paths:
+            try:
+                os.unlink(img_path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+        
+        if removed:
+            logger.info("🧹 Removed %s stale question images from: %s", removed, self.images_dir)
     
-    def extract_enhanced_question_images(self, pdf_path):
+    def extract_enhanced_question_images(self, pdf_path, num_workers=None):
         """
         Extract high-quality images with standardized naming
         STANDARDIZED: All images saved to 'images' folder with consistent naming
+        Pages are rendered in up to num_workers processes (default: self.num_workers);
+        the serial path reuses the PDF opened during boundary detection
         """
-        logger.info(f"📸 Extracting question images to: {self.images_dir}")
+        logger.info("📸 Extracting question images to: %s", self.images_dir)
+        
+        if num_workers is None:
+            num_workers = self.num_workers
         
         try:
-            pdf_doc = fitz.open(pdf_path)
+            self._clean_paper_images()
+            pdf_doc = self._open_pdf(pdf_path)
             question_images = {}
             
+            # Group questions by page so each page is rasterized only once
+            questions_by_page = {}
             for q_num, bounds in self.question_boundaries.items():
-                try:
-                    page_num = bounds["page"] - 1
-                    page = pdf_doc[page_num]
-                    
-                    # Create extraction rectangle with padding
-                    crop_rect = fitz.Rect(
-                        max(0, 5),
-                        max(0, bounds["start_y"] - 5),
-                        page.rect.width - 5,
-                        min(page.rect.height, bounds["end_y"] + 10)
-                    )
-                    
-                    # High quality rendering
-                    zoom = self.image_quality
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page.get_pixmap(matrix=mat, clip=crop_rect)
-                    
-                    # STANDARDIZED: Consistent naming convention
-                    img_filename = f"question_{q_num:02d}_enhanced.png"
-                    img_path = self.images_dir / img_filename
-                    
-                    # Save image
-                    pix.save(str(img_path))
-                    
-                    # Apply enhancement
-                    self._enhance_image(img_path)
+                questions_by_page.setdefault(bounds["page"], []).append((q_num, bounds))
+            
+            tasks = [
+                (
+                    page_num, page_questions, self.image_quality,
+                    self._page_widths[page_num], self._page_heights[page_num],
+                    self.enhancement_factor, self._images_dir_str, self.image_format
+                )
+                for page_num, page_questions in questions_by_page.items()
+            ]
+            
+            page_results = None
+            if num_workers > 1 and len(tasks) > 1:
+                page_results = self._render_pages_parallel(pdf_path, tasks, num_workers)
+            if page_results is None:
+                page_results = [
+                    (task[0], render_page_questions(pdf_doc[task[0] - 1], *task[1:]))
+                    for task in tasks
+                ]
+            
+            for page_num, (saved, failed) in page_results:
+                for q_num, bounds in questions_by_page[page_num]:
+                    if q_num not in saved:
+                        logger.error("  ❌ Failed to extract Q%s: %s", q_num, failed.get(q_num))
+                        continue
                     
+                    img_info = saved[q_num]
                     question_images[q_num] = {
-                        "filename": img_filename,
-                        "path": str(img_path),
-                        "size": (pix.width, pix.height),
+                        "filename": img_info["filename"],
+                        "path": img_info["path"],
+                        "size": img_info["size"],
                         "page": bounds["page"],
                         "strategy": bounds["strategy"],
                         "confidence": bounds["confidence"]
                     }
                     
-                    logger.info(f"  ✅ Q{q_num}: {img_filename} ({pix.width}x{pix.height})")
-                    pix = None
-                    
-                except Exception as e:
-                    logger.error(f"  ❌ Failed to extract Q{q_num}: {e}")
-                    continue
+                    width, height = img_info["size"]
+                    logger.debug("  ✅ Q%s: %s (%sx%s)", q_num, img_info['filename'], width, height)
             
-            pdf_doc.close()
-            logger.info(f"📊 Successfully extracted {len(question_images)} question images")
+            logger.info("📊 Successfully extracted %s question images", len(question_images))
             
             return question_images
             
         except Exception as e:
-            logger.error(f"Image extraction failed: {e}")
+            logger.error("Image extraction failed: %s", e)
             raise
+        
+        finally:
+            self._close_pdf()
     
-    def _enhance_image(self, img_path):
-        """Apply light enhancement to extracted images"""
+    def _render_pages_parallel(self, pdf_path, tasks, num_workers):
+        """
+        Render pages across worker processes (each opens its own copy of the PDF)
+        Workers crop and save the PNGs themselves and only return small per-question dicts,
+        so no page pixels are pickled between processes
+        Returns None when a process pool can't be used, so the caller falls back to serial
+        """
+        worker_tasks = [(str(pdf_path),) + task for task in tasks]
+        
         try:
-            img = Image.open(img_path)
-            
-            # Light contrast enhancement
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(self.enhancement_factor)
-            
-            # Light sharpness enhancement
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(self.enhancement_factor)
-            
-            # Save optimized
-            img.save(img_path, "PNG", quality=90, optimize=True)
-            
-        except Exception as e:
-            logger.warning(f"Image enhancement failed for {img_path}: {e}")
-    
-    def get_month_display_name(self, month_code):
-        """Convert month code to display name"""
-        month_mapping = {
-            "mar": "March",
-            "may": "May/June", 
-            "oct": "October/November",
-            "jan": "January",
-            "feb": "February", 
-            "jun": "June",
-            "nov": "November",
-            "dec": "December"
-        }
-        return month_mapping.get(month_code.lower(), month_code.title())
+            with ProcessPoolExecutor(max_workers=min(num_workers, len(tasks))) as executor:
+                return list(executor.map(_render_page_questions_worker, worker_tasks))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("Parallel page rendering unavailable, rendering serially: %s", e)
+            return None
+    
+    def _should_enhance(self):
+        """Check whether enhancement_factor is far enough from 1.0 to be worth a pass"""
+        return should_enhance(self.enhancement_factor)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_month_display_name(month_code):
+        """Convert month code (e.g. "mar", "03" or 3) to display name"""
+        month_code = str(month_code).strip()
+        return _MONTH_MAP.get(month_code.lower(), month_code.title())
     
     def create_enhanced_question_bank(self, question_images, subject, year, month, paper_code):
         """
@@ -577,40 +1007,83 @@ class EnhancedPDFExtractor:
         
         # Generate standardized filename
         standardized_filename = f"{subject}_{year}_{month}_{paper_code}.json"
+        month_display = self.get_month_display_name(month)
         
         # Comprehensive metadata
         question_bank = {
             "metadata": {
                 "app_name": "Enhanced PDF Question Extractor",
                 "exam_paper": f"Cambridge IGCSE {subject.title()} Paper {paper_code}",
-                "exam_session": f"{self.get_month_display_name(month)} {year}",
+                "exam_session": f"{month_display} {year}",
                 "extraction_date": datetime.now().isoformat(),
                 "extraction_method": "Multi-Strategy Enhanced Detection",
                 "total_questions": len(questions),
                 "extraction_tool": "Enhanced PDF Extractor v2.0",
                 "approach": "Multi-strategy boundary detection with smart end boundaries",
                 "web_interface_ready": True,
-                "images_location": str(self.images_dir),
+                "images_location": self._images_dir_str,
                 "images_folder": "images",  # STANDARDIZED
                 "filename": standardized_filename,
                 "standardized_naming": True,
                 "subject": subject,
                 "year": year,
                 "month": month,
-                "month_display": self.get_month_display_name(month),
+                "month_display": month_display,
                 "paper_code": paper_code,
                 "image_quality": self.image_quality,
-                "enhancement_applied": True,
+                "image_format": self.image_format,
+                "enhancement_applied": self._should_enhance(),
                 "extraction_success": True
             },
             "questions": questions
         }
         
-        logger.info(f"📋 Created question bank: {len(questions)} questions")
-        logger.info(f"📄 Filename: {standardized_filename}")
+        logger.info("📋 Created question bank: %s questions", len(questions))
+        logger.info("📄 Filename: %s", standardized_filename)
         
         return question_bank
     
+    def _scan_question_images(self):
+        """List extracted images once so every deployment target reuses the same listing"""
+        if not os.path.isdir(self._images_dir_str):
+            return []
+        with os.scandir(self._images_dir_str) as entries:
+            return [entry for entry in entries if entry.is_file() and entry.name.endswith((".png", ".webp"))]
+    
+    @staticmethod
+    def _copy_image(src_path, dst_path):
+        """
+        Copy src to its own file at dst. Never hardlink: review.py replaces question images
+        in place, which would otherwise reach the cache and every deployed copy
+        PNGs need no metadata, so copyfile rather than copy2
+        """
+        try:
+            os.unlink(dst_path)  # An older deploy or cache restore may have left a hardlink here
+        except FileNotFoundError:
+            pass
+        shutil.copyfile(src_path, dst_path)
+    
+    def _deploy_images(self, image_entries, dest_dir, target_name):
+        """
+        Copy images into dest_dir on the shared deploy thread pool so per-file
+        syscalls overlap. dest_dir must already exist. Returns the number of images deployed
+        """
+        if not image_entries:
+            return 0
+        
+        dest_dir_str = os.fspath(dest_dir)
+        
+        def deploy_one(entry):
+            try:
+                self._copy_image(entry.path, os.path.join(dest_dir_str, entry.name))
+                logger.debug("  📸 Deployed image to %s: %s", target_name, entry.name)
+                return True
+            except Exception as e:
+                logger.error("  ❌ Failed to deploy %s to %s: %s", entry.name, target_name, e)
+                return False
+        
+        return sum(_get_deploy_executor().map(deploy_one, image_entries))
+    
     def deploy_for_web_interface(self, question_bank):
         """
         Deploy question bank for web interface with standardized folder structure
@@ -622,14 +1095,14 @@ class EnhancedPDFExtractor:
         filename = question_bank["metadata"]["filename"]
         local_output = self.base_dir / filename
         deployed_images = 0  # Initialize counter
+        image_entries = self._scan_question_images()
         
         try:
             # Save JSON locally
-            with open(local_output, 'w', encoding='utf-8') as f:
-                json.dump(question_bank, f, indent=2, ensure_ascii=False)
-            logger.info(f"  ✅ Saved JSON to: {local_output}")
+            write_json_file(local_output, question_bank)
+            logger.info("  ✅ Saved JSON to: %s", local_output)
         except Exception as e:
-            logger.error(f"  ❌ Failed to save JSON: {e}")
+            logger.error("  ❌ Failed to save JSON: %s", e)
             raise
         
         # Create question bank directory structure
@@ -646,37 +1119,28 @@ class EnhancedPDFExtractor:
             # Deploy JSON file
             question_bank_json = question_bank_dir / "solutions.json"
             shutil.copy2(local_output, question_bank_json)
-            logger.info(f"  ✅ Deployed JSON to: {question_bank_json}")
+            logger.info("  ✅ Deployed JSON to: %s", question_bank_json)
             
             # Create metadata file
             metadata_file = question_bank_dir / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(question_bank["metadata"], f, indent=2, ensure_ascii=False)
-            logger.info(f"  ✅ Created metadata: {metadata_file}")
+            write_json_file(metadata_file, question_bank["metadata"])
+            logger.info("  ✅ Created metadata: %s", metadata_file)
             
             # STANDARDIZED: Deploy images to 'images' folder (primary)
             images_dir = question_bank_dir / "images"
             images_dir.mkdir(exist_ok=True)
             
             # Deploy images from source to destination
-            if self.images_dir.exists():
-                for img_file in self.images_dir.glob("*.png"):
-                    try:
-                        dst_path = images_dir / img_file.name
-                        shutil.copy2(img_file, dst_path)
-                        deployed_images += 1
-                        logger.info(f"  📸 Deployed image: {img_file.name}")
-                    except Exception as e:
-                        logger.error(f"  ❌ Failed to deploy {img_file.name}: {e}")
-            
-            logger.info(f"  ✅ Successfully deployed {deployed_images} images")
+            deployed_images = self._deploy_images(image_entries, images_dir, "question bank")
+            
+            logger.info("  ✅ Successfully deployed %s images", deployed_images)
             
         except Exception as e:
-            logger.error(f"  ❌ Failed to deploy to question bank directory: {e}")
+            logger.error("  ❌ Failed to deploy to question bank directory: %s", e)
             raise
         
         # Optional: Deploy to React app (if exists)
-        react_deployed = self._deploy_to_react_app(local_output, filename)
+        react_deployed = self._deploy_to_react_app(local_output, filename, image_entries)
         
         return {
             'success': True,
@@ -687,9 +1151,10 @@ class EnhancedPDFExtractor:
             'metadata': question_bank["metadata"]
         }
     
-    def _deploy_to_react_app(self, json_file, filename):
+    def _deploy_to_react_app(self, json_file, filename, image_entries):
         """
         Fixed React app deployment with proper error handling
+        image_entries is the PNG listing already taken by deploy_for_web_interface
         """
         react_deployed = 0
         
@@ -702,534 +1167,1324 @@ class EnhancedPDFExtractor:
                 react_data_dir.mkdir(parents=True, exist_ok=True)
                 react_questions_file = react_data_dir / filename
                 shutil.copy2(json_file, react_questions_file)
-                logger.info(f"  ✅ Deployed JSON to React app: {react_questions_file}")
+                logger.info("  ✅ Deployed JSON to React app: %s", react_questions_file)
                 
                 # Deploy images
-                if self.images_dir.exists():
+                if image_entries:
                     react_images_dir.mkdir(parents=True, exist_ok=True)
-                    for img_file in self.images_dir.glob("*.png"):
-                        try:
-                            dst_path = react_images_dir / img_file.name
-                            shutil.copy2(img_file, dst_path)
-                            react_deployed += 1
-                        except Exception as e:
-                            logger.error(f"  ❌ Failed to deploy {img_file.name} to React: {e}")
+                    react_deployed = self._deploy_images(image_entries, react_images_dir, "React app")
                     
-                    logger.info(f"  ✅ Deployed {react_deployed} images to React app")
+                    logger.info("  ✅ Deployed %s images to React app", react_deployed)
             else:
-                logger.warning(f"  ⚠️ React app path does not exist: {self.react_app_path}")
+                logger.warning("  ⚠️ React app path does not exist: %s", self.react_app_path)
                 
         except Exception as e:
-            logger.warning(f"  ⚠️ React app deployment failed: {e}")
+            logger.warning("  ⚠️ React app deployment failed: %s", e)
         
         return react_deployed
     
-    def extract_questions_for_web_interface(self, pdf_filename, subject, year, month, paper_code):
+    def _extraction_cache_key(self, pdf_path, subject, year, month, paper_code, pdf_digest=None):
+        """
+        Hash the PDF bytes plus every parameter that affects the extraction output
+        pdf_digest (hex, from new_pdf_digest) skips re-reading a PDF hashed while it was uploaded
+        """
+        if pdf_digest is None:
+            pdf_digest = self._pdf_content_digest(pdf_path)
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pdf_digest.encode())
+        digest.update(repr((
+            subject, year, month, paper_code, self.image_quality, self.enhancement_factor, self.image_format
+        )).encode())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _hash_pdf_file(pdf_path):
+        content_digest = new_pdf_digest()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                content_digest.update(chunk)
+        return content_digest.hexdigest()
+    
+    def _pdf_content_digest(self, pdf_path):
+        """
+        Content hash of a PDF on disk, remembered in the cache directory per (size, mtime)
+        so re-running an unchanged PDF (e.g. --test in a dev loop) does not re-read it
+        Upload temp files never recur, so they are hashed without touching the index
+        """
+        pdf_key = os.path.abspath(pdf_path)
+        if is_upload_path(pdf_key):
+            return self._hash_pdf_file(pdf_path)
+        
+        stat = os.stat(pdf_path)
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        # Not *.json, which _evict_cached_extractions treats as cached extractions
+        index_file = os.path.join(self.cache_dir, "pdf_digests.index")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # The extraction worker and the in-process fallback may update the index at once
+        with open(f"{index_file}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                index = read_json_file(index_file)
+            except (FileNotFoundError, ValueError):
+                index = {}
+            
+            entry = index.get(pdf_key)
+            if entry and entry[:2] == fingerprint:
+                return entry[2]
+            
+            pdf_digest = self._hash_pdf_file(pdf_path)
+            
+            # Most recently hashed last; drop PDFs that are gone, then the oldest beyond the limit
+            index.pop(pdf_key, None)
+            index = {path: entry for path, entry in index.items() if os.path.exists(path)}
+            index[pdf_key] = [*fingerprint, pdf_digest]
+            index = dict(list(index.items())[-PDF_DIGEST_INDEX_LIMIT:])
+            try:
+                tmp_file = f"{index_file}.{os.getpid()}.tmp"
+                write_json_file(tmp_file, index)
+                os.replace(tmp_file, index_file)
+            except OSError as e:
+                logger.warning("Failed to remember PDF digest for %s: %s", pdf_path, e)
+            return pdf_digest
+    
+    def _load_cached_extraction(self, cache_key):
+        """
+        Restore a cached extraction: copy its images back and redeploy the question bank
+        Returns None on a cache miss (or an unusable entry)
+        """
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        cache_images_dir = self.cache_dir / cache_key
+        if not cache_file.exists() or not cache_images_dir.is_dir():
+            return None
+        
+        try:
+            result = read_json_file(cache_file)
+            
+            self._clean_paper_images()
+            with os.scandir(cache_images_dir) as entries:
+                for entry in entries:
+                    self._copy_image(entry.path, os.path.join(self._images_dir_str, entry.name))
+            
+            deployment_result = self.deploy_for_web_interface(result['question_bank'])
+            result['deployment'] = deployment_result
+            result['deployed_images'] = deployment_result['deployed_images']
+            result['output_file'] = deployment_result['output_file']
+            result['cached'] = True
+            
+            # Mark as recently used for eviction
+            os.utime(cache_file)
+            return result
+            
+        except Exception as e:
+            logger.warning("Ignoring unusable extraction cache entry %s: %s", cache_key, e)
+            return None
+    
+    def _store_cached_extraction(self, cache_key, result):
+        """Save a successful extraction (result JSON + copies of its images) and evict old entries"""
+        try:
+            cache_images_dir = os.path.join(self.cache_dir, cache_key)
+            os.makedirs(cache_images_dir, exist_ok=True)
+            for entry in self._scan_question_images():
+                self._copy_image(entry.path, os.path.join(cache_images_dir, entry.name))
+            
+            # Write then rename so readers never see a partial file
+            cache_file = self.cache_dir / f"{cache_key}.json"
+            tmp_file = self.cache_dir / f"{cache_key}.json.tmp"
+            write_json_file(tmp_file, result)
+            os.replace(tmp_file, cache_file)
+            
+            self._evict_cached_extractions()
+            
+        except Exception as e:
+            logger.warning("Failed to cache extraction %s: %s", cache_key, e)
+    
+    def _evict_cached_extractions(self):
+        """Keep at most max_cached_extractions entries, dropping the least recently used"""
+        cache_files = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for cache_file in cache_files[self.max_cached_extractions:]:
+            cache_file.unlink(missing_ok=True)
+            shutil.rmtree(self.cache_dir / cache_file.stem, ignore_errors=True)
+    
+    def _report_progress(self, stage, progress, message, **details):
+        """
+        Publish a progress event (stage, progress 0-1, message, extra details) to progress_queue
+        Also the cancellation point: raises ExtractionCancelled once cancel_event is set
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExtractionCancelled("Extraction cancelled by client")
+        if self.progress_queue is not None:
+            self.progress_queue.put({'stage': stage, 'progress': progress, 'message': message, **details})
+    
+    def extract_questions_for_web_interface(self, pdf_filename, subject, year, month, paper_code, force=False,
+                                            pdf_digest=None, progress_queue=None, cancel_event=None):
         """
         MAIN EXTRACTION METHOD: Complete extraction pipeline for web interface
         Returns properly structured result for API consumption
+        Identical PDFs with identical parameters are served from the extraction cache
+        unless force=True; pass pdf_digest when the PDF's content hash is already known
+        Stage events go to progress_queue; setting cancel_event stops at the next stage
         """
-        logger.info(f"🎯 Starting complete extraction pipeline")
-        logger.info(f"📄 PDF: {pdf_filename}")
-        logger.info(f"📚 Subject: {subject}")
-        logger.info(f"📅 Year: {year}")
-        logger.info(f"📆 Month: {month}")
-        logger.info(f"📃 Paper: {paper_code}")
-        
-        pdf_path = self.base_dir / pdf_filename
-        if not pdf_path.exists():
+        logger.info("🎯 Starting complete extraction pipeline")
+        logger.info("📄 PDF: %s", pdf_filename)
+        logger.info("📚 Subject: %s", subject)
+        logger.info("📅 Year: %s", year)
+        logger.info("📆 Month: %s", month)
+        logger.info("📃 Paper: %s", paper_code)
+        
+        pdf_path = os.path.join(self._base_dir_str, pdf_filename)
+        if not os.path.isfile(pdf_path):
             error_msg = f"PDF file not found: {pdf_path}"
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
         
+        self.progress_queue, self.cancel_event = progress_queue, cancel_event
+        try:
+            cache_key = self._extraction_cache_key(pdf_path, subject, year, month, paper_code, pdf_digest)
+            if not force:
+                cached_result = self._load_cached_extraction(cache_key)
+                if cached_result is not None:
+                    logger.info("⚡ Reusing cached extraction %s (%s questions)", cache_key, cached_result['questions_found'])
+                    self._report_progress('cached', 1.0, "Paper already extracted - reused cached result",
+                                          questions_found=cached_result['questions_found'])
+                    return cached_result
+            
+            result = self._run_extraction_pipeline(pdf_path, subject, year, month, paper_code)
+            if result.get('success'):
+                self._store_cached_extraction(cache_key, result)
+            
+            return result
+        finally:
+            self.progress_queue = self.cancel_event = None
+    
+    def _run_extraction_pipeline(self, pdf_path, subject, year, month, paper_code):
+        """
+        Run the 4-step extraction pipeline (boundaries → images → question bank → deploy)
+        Steps 1 and 2 share one open PDF: page text is parsed once in Step 1 and each
+        page is rasterized once in Step 2. They stay separate passes because a
+        question's end boundary depends on where the next detected question starts.
+        """
         try:
+            # Fail fast on PDFs that can't be processed before any heavy work
+            self._report_progress('analyzing', 0.05, "Analyzing PDF structure...")
+            probe_error = self._probe_pdf(pdf_path)
+            if probe_error:
+                logger.error(probe_error)
+                return ExtractionResult(
+                    success=False,
+                    error=probe_error
+                ).to_dict()
+            
             # Step 1: Find question boundaries
+            self._report_progress('detecting', 0.1, "Detecting question boundaries...")
             logger.info("📋 Step 1: Finding question boundaries")
             found_questions = self.find_enhanced_question_boundaries(pdf_path)
-            logger.info(f"  📊 Found {found_questions} questions")
+            logger.info("  📊 Found %s questions", found_questions)
             
             if found_questions == 0:
                 error_msg = "No questions detected in PDF"
                 logger.error(error_msg)
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': 0,
-                    'deployed_images': 0
-                }
+                return ExtractionResult(
+                    success=False,
+                    error=error_msg
+                ).to_dict()
             
             # Step 2: Extract images
+            self._report_progress('extracting_images', 0.35, f"Found {found_questions} questions - extracting images...",
+                                  questions_found=found_questions)
             logger.info("📸 Step 2: Extracting question images")
             question_images = self.extract_enhanced_question_images(pdf_path)
-            logger.info(f"  📊 Extracted {len(question_images)} images")
+            logger.info("  📊 Extracted %s images", len(question_images))
             
             if not question_images:
                 error_msg = "No images could be extracted"
                 logger.error(error_msg)
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': found_questions,
-                    'deployed_images': 0
-                }
+                return ExtractionResult(
+                    success=False,
+                    error=error_msg,
+                    questions_found=found_questions
+                ).to_dict()
             
             # Step 3: Create question bank
+            self._report_progress('creating_question_bank', 0.75,
+                                  f"Extracted {len(question_images)} images - creating question bank...",
+                                  images_extracted=len(question_images))
             logger.info("📊 Step 3: Creating question bank")
             question_bank = self.create_enhanced_question_bank(
                 question_images, subject, year, month, paper_code
             )
-            logger.info(f"  📋 Created question bank with {len(question_bank['questions'])} questions")
+            logger.info("  📋 Created question bank with %s questions", len(question_bank['questions']))
             
             # Step 4: Deploy for web interface
+            self._report_progress('deploying', 0.85, "Deploying to web interface...")
             logger.info("🚀 Step 4: Deploying for web interface")
             deployment_result = self.deploy_for_web_interface(question_bank)
             
             if deployment_result['success']:
-                # Success summary
-                logger.info(f"\n🎉 EXTRACTION COMPLETE - SUCCESS!")
-                logger.info("=" * 60)
-                logger.info(f"✅ Questions extracted: {len(question_bank['questions'])}")
-                logger.info(f"🖼️ Images saved to: {self.images_dir}")
-                logger.info(f"📁 Images available: {len(list(self.images_dir.glob('*.png')))}")
-                logger.info(f"💾 Question bank: {deployment_result['output_file']}")
-                logger.info(f"📃 Standardized filename: {question_bank['metadata']['filename']}")
-                logger.info(f"📅 Month: {month} → Display: {self.get_month_display_name(month)}")
-                logger.info(f"🎯 Web interface ready with standardized 'images' folder")
+                # Success summary (one record, so concurrent extractions don't interleave lines)
+                logger.info(
+                    _SUCCESS_SUMMARY_TEMPLATE,
+                    len(question_bank['questions']),
+                    self.images_dir,
+                    deployment_result['deployed_images'],
+                    deployment_result['output_file'],
+                    question_bank['metadata']['filename'],
+                    month,
+                    question_bank['metadata']['month_display']
+                )
                 
                 # Return success result
-                return {
-                    'success': True,
-                    'questions_found': len(question_bank['questions']),
-                    'question_bank': question_bank,
-                    'deployment': deployment_result,
-                    'images_extracted': len(question_images),
-                    'deployed_images': deployment_result['deployed_images'],
-                    'output_file': deployment_result['output_file']
-                }
+                return ExtractionResult(
+                    success=True,
+                    questions_found=len(question_bank['questions']),
+                    question_bank=question_bank,
+                    deployment=deployment_result,
+                    images_extracted=len(question_images),
+                    deployed_images=deployment_result['deployed_images'],
+                    output_file=deployment_result['output_file']
+                ).to_dict()
             else:
                 error_msg = "Deployment failed"
                 logger.error(error_msg)
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': len(question_bank['questions']),
-                    'deployed_images': 0
-                }
+                return ExtractionResult(
+                    success=False,
+                    error=error_msg,
+                    questions_found=len(question_bank['questions'])
+                ).to_dict()
                 
         except Exception as e:
             error_msg = f"Extraction failed: {str(e)}"
             logger.error(error_msg)
-            logger.error("Full traceback:", exc_info=True)
-            
-            return {
-                'success': False,
-                'error': error_msg,
-                'questions_found': 0,
-                'deployed_images': 0,
-                'exception': str(e)
-            }
+            # Traceback formatting is skipped unless DEBUG logging is enabled
+            logger.debug("Full traceback:", exc_info=True)
+            
+            return ExtractionResult(
+                success=False,
+                error=error_msg,
+                exception=str(e)
+            ).to_dict()
+        
+        finally:
+            # Boundary detection leaves the PDF open; make sure it is released on early returns
+            self._close_pdf()
 
 # ============================================================================
 # WEB INTERFACE SECTION
 # ============================================================================
 
-if WEB_MODE:
-    app = Flask(__name__)
-    CORS(app)
+# Configuration
+BASE_DIR = Path("/Users/wynceaxcel/Apps/axcelscore")
+BACKEND_DIR = BASE_DIR / "backend"
+UPLOAD_DIR = BACKEND_DIR / "uploads"
+PDF_EXTRACTION_TEST_DIR = BASE_DIR / "pdf-extraction-test"
+PDF_EXTRACTION_IMAGES_DIR = PDF_EXTRACTION_TEST_DIR / "images"
+_PDF_DIR_STR = os.fspath(PDF_EXTRACTION_TEST_DIR)  # Plain-string form for per-request file calls
 
-    # Configuration
-    BASE_DIR = Path("/Users/wynceaxcel/Apps/axcelscore")
-    BACKEND_DIR = BASE_DIR / "backend"
-    UPLOAD_DIR = BACKEND_DIR / "uploads"
-    PDF_EXTRACTION_TEST_DIR = BASE_DIR / "pdf-extraction-test"
+# Zero-copy image serving behind a front-end web server (both off by default):
+#   EXTRACTOR_X_ACCEL_IMAGES=/protected_images/ → nginx X-Accel-Redirect, e.g.
+#       location /protected_images/ { internal; alias <PDF_EXTRACTION_IMAGES_DIR>/; }
+#   EXTRACTOR_USE_X_SENDFILE=1 → X-Sendfile header (Apache mod_xsendfile, lighttpd)
+X_ACCEL_IMAGES_PREFIX = os.environ.get("EXTRACTOR_X_ACCEL_IMAGES", "")
+USE_X_SENDFILE = os.environ.get("EXTRACTOR_USE_X_SENDFILE", "0") == "1"
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read per iteration when streaming uploads to disk
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # Largest accepted PDF upload (request body)
+_UPLOAD_TOO_LARGE_MSG = f'PDF too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)'
 
-    # Ensure directories exist
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    PDF_EXTRACTION_TEST_DIR.mkdir(parents=True, exist_ok=True)
+# Warm extractors for web requests. Every extractor here writes to the same
+# images folder, so the pool holds one: concurrent extractions queue up instead of
+# deleting each other's images
+EXTRACTOR_POOL_SIZE = 1
+_extractor_pool = queue.Queue()
+_extractor_pool_lock = threading.Lock()
+_extractors_created = 0
 
-    @app.route('/')
-    def web_index():
-        """Serve the enhanced web extractor interface"""
-        return """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>🎯 Enhanced PDF Question Extractor</title>
-            <style>
-                * { margin: 0; padding: 0; box-sizing: border-box; }
-                body { 
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh; padding: 20px;
-                }
-                .container {
-                    max-width: 900px; margin: 0 auto; background: white;
-                    border-radius: 20px; box-shadow: 0 20px 60px rgba(0,0,0,0.1);
-                    overflow: hidden;
-                }
-                .header {
-                    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                    padding: 40px; text-align: center; color: white;
-                }
-                .header h1 { font-size: 2.8em; margin-bottom: 10px; font-weight: 700; }
-                .header p { font-size: 1.2em; opacity: 0.9; margin: 5px 0; }
-                .enhanced-badge {
-                    background: rgba(255,255,255,0.2); color: white; 
-                    padding: 8px 16px; border-radius: 20px; 
-                    font-size: 0.9em; margin: 10px 5px; display: inline-block;
-                }
-                .main-content { padding: 40px; }
-                .form-group { margin: 25px 0; }
-                .form-group label { 
-                    display: block; margin-bottom: 10px; font-weight: 600; 
-                    color: #2d3748; font-size: 1em;
-                }
-                .form-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
-                input, select {
-                    width: 100%; padding: 15px; border: 2px solid #e2e8f0;
-                    border-radius: 12px; font-size: 1em; transition: all 0.3s ease;
-                    font-family: inherit;
-                }
-                input:focus, select:focus {
-                    outline: none; border-color: #4facfe;
-                    box-shadow: 0 0 0 4px rgba(79, 172, 254, 0.1);
-                    transform: translateY(-1px);
-                }
-                .upload-area {
-                    border: 3px dashed #e2e8f0; border-radius: 15px; padding: 50px;
-                    text-align: center; transition: all 0.3s ease; cursor: pointer;
-                    background: linear-gradient(45deg, #f8fafc, #fff);
-                }
-                .upload-area:hover {
-                    border-color: #4facfe; background: linear-gradient(45deg, #f7faff, #fff);
-                    transform: translateY(-2px);
-                }
-                .upload-area.dragover {
-                    border-color: #00f2fe; background: #f0fdff;
-                    transform: scale(1.02);
-                }
-                .upload-icon { font-size: 4em; color: #4facfe; margin-bottom: 20px; }
-                .btn {
-                    padding: 18px 35px; border: none; border-radius: 12px;
-                    font-size: 1.1em; font-weight: 600; cursor: pointer;
-                    transition: all 0.3s ease; display: inline-flex;
-                    align-items: center; gap: 12px; justify-content: center;
-                    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                    color: white; width: 100%; margin: 10px 0;
-                }
-                .btn:hover {
-                    transform: translateY(-3px);
-                    box-shadow: 0 15px 35px rgba(79, 172, 254, 0.4);
-                }
-                .btn:disabled { 
-                    opacity: 0.6; cursor: not-allowed; transform: none; 
-                    box-shadow: none;
-                }
-                .progress { 
-                    margin: 25px 0; display: none; 
-                    background: linear-gradient(45deg, #f7fafc, #fff); 
-                    padding: 25px; border-radius: 12px; border-left: 4px solid #4facfe;
-                }
-                .progress-bar {
-                    width: 100%; height: 10px; background: #e2e8f0;
-                    border-radius: 10px; overflow: hidden; margin: 10px 0;
-                }
-                .progress-fill {
-                    height: 100%; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                    width: 0%; transition: width 0.5s ease;
-                }
-                .message {
-                    margin: 20px 0; padding: 20px; border-radius: 12px; 
-                    font-weight: 500; display: none;
-                }
-                .success {
-                    background: linear-gradient(45deg, #f0fff4, #e6fffa); 
-                    color: #2f855a; border-left: 4px solid #38a169;
-                }
-                .error {
-                    background: linear-gradient(45deg, #fef5e7, #fed7d7); 
-                    color: #c53030; border-left: 4px solid #e53e3e;
-                }
-                .file-info {
-                    background: linear-gradient(45deg, #f7fafc, #edf2f7); 
-                    padding: 20px; border-radius: 12px;
-                    margin-top: 15px; display: none;
-                    border-left: 4px solid #4299e1;
-                }
-                .features {
-                    display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                    gap: 15px; margin: 30px 0;
-                }
-                .feature {
-                    background: linear-gradient(45deg, #f8fafc, #fff);
-                    padding: 20px; border-radius: 10px;
-                    text-align: center; border-left: 3px solid #4facfe;
-                }
-                .feature-icon { font-size: 2em; margin-bottom: 10px; }
-                @media (max-width: 768px) { 
-                    .form-grid { grid-template-columns: 1fr; }
-                    .features { grid-template-columns: 1fr; }
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎯 Enhanced PDF Question Extractor</h1>
-                    <p>AI-powered question extraction with multi-strategy detection</p>
-                    <div>
-                        <span class="enhanced-badge">✅ Multi-Strategy Detection</span>
-                        <span class="enhanced-badge">🖼️ High-Quality Images</span>
-                        <span class="enhanced-badge">🎯 Web Interface Ready</span>
-                    </div>
-                </div>
+@contextmanager
+def checkout_extractor():
+    """
+    Borrow a pooled EnhancedPDFExtractor for PDF_EXTRACTION_TEST_DIR
+    Instances are built lazily up to EXTRACTOR_POOL_SIZE; callers block while all are in use
+    """
+    global _extractors_created
+    extractor = None
+    
+    with _extractor_pool_lock:
+        if _extractor_pool.empty() and _extractors_created < EXTRACTOR_POOL_SIZE:
+            _extractors_created += 1
+            try:
+                extractor = EnhancedPDFExtractor(base_dir=str(PDF_EXTRACTION_TEST_DIR))
+            except Exception:
+                _extractors_created -= 1
+                raise
+    
+    if extractor is None:
+        extractor = _extractor_pool.get()
+    
+    try:
+        yield extractor
+    finally:
+        _extractor_pool.put(extractor)
 
-                <div class="main-content">
-                    <div class="features">
-                        <div class="feature">
-                            <div class="feature-icon">🔍</div>
-                            <h3>Smart Detection</h3>
-                            <p>7 different strategies to find questions</p>
-                        </div>
-                        <div class="feature">
-                            <div class="feature-icon">📸</div>
-                            <h3>Quality Images</h3>
-                            <p>Enhanced 2x resolution with optimization</p>
-                        </div>
-                        <div class="feature">
-                            <div class="feature-icon">🚀</div>
-                            <h3>Web Ready</h3>
-                            <p>Standardized folder structure</p>
-                        </div>
-                    </div>
+# Web extractions run in a separate process so boundary detection (pure Python)
+# doesn't hold the web server's GIL; one worker per pooled extractor
+_extraction_executor = None
+_extraction_executor_lock = threading.Lock()
 
-                    <form id="extractForm" enctype="multipart/form-data">
-                        <div class="form-group">
-                            <label for="pdf">📄 Upload PDF File</label>
-                            <div class="upload-area" id="uploadArea">
-                                <div class="upload-icon">📁</div>
-                                <h3>Drop your PDF here or click to browse</h3>
-                                <p>Supports IGCSE past papers and similar formats</p>
-                                <input type="file" id="pdf" name="pdf" accept=".pdf" style="display: none;">
-                            </div>
-                            <div class="file-info" id="fileInfo"></div>
-                        </div>
-
-                        <div class="form-grid">
-                            <div class="form-group">
-                                <label for="subject">📚 Subject</label>
-                                <select id="subject" name="subject" required>
-                                    <option value="">Select Subject</option>
-                                    <option value="physics">Physics</option>
-                                    <option value="chemistry">Chemistry</option>
-                                    <option value="biology">Biology</option>
-                                    <option value="mathematics">Mathematics</option>
-                                    <option value="english">English</option>
-                                    <option value="economics">Economics</option>
-                                    <option value="business_studies">Business Studies</option>
-                                    <option value="computer_science">Computer Science</option>
-                                </select>
-                            </div>
-
-                            <div class="form-group">
-                                <label for="year">📅 Year</label>
-                                <select id="year" name="year" required>
-                                    <option value="">Select Year</option>
-                                    <option value="2024">2024</option>
-                                    <option value="2023">2023</option>
-                                    <option value="2022">2022</option>
-                                    <option value="2021">2021</option>
-                                    <option value="2020">2020</option>
-                                    <option value="2019">2019</option>
-                                </select>
-                            </div>
-
-                            <div class="form-group">
-                                <label for="month">📆 Session</label>
-                                <select id="month" name="month" required>
-                                    <option value="">Select Session</option>
-                                    <option value="mar">March</option>
-                                    <option value="may">May/June</option>
-                                    <option value="oct">October/November</option>
-                                    <option value="jan">January</option>
-                                </select>
-                            </div>
-
-                            <div class="form-group">
-                                <label for="paper_code">📃 Paper Code</label>
-                                <select id="paper_code" name="paper_code" required>
-                                    <option value="">Select Paper</option>
-                                    <option value="11">Paper 11</option>
-                                    <option value="12">Paper 12</option>
-                                    <option value="13">Paper 13</option>
-                                    <option value="21">Paper 21</option>
-                                    <option value="22">Paper 22</option>
-                                    <option value="23">Paper 23</option>
-                                    <option value="31">Paper 31</option>
-                                    <option value="32">Paper 32</option>
-                                    <option value="33">Paper 33</option>
-                                </select>
-                            </div>
-                        </div>
-
-                        <button type="submit" class="btn" id="extractBtn">
-                            🚀 Extract Questions
-                        </button>
-                    </form>
-
-                    <div class="progress" id="progress">
-                        <h3>📄 Processing your PDF...</h3>
-                        <div class="progress-bar">
-                            <div class="progress-fill" id="progressFill"></div>
-                        </div>
-                        <p id="progressText">Initializing extraction...</p>
-                    </div>
+# CPUs (lowest-numbered first) left to the web server process; the extraction worker and
+# its page renderers run on the rest. Pin the server to match, e.g. taskset -c 0 gunicorn ...
+EXTRACTION_RESERVED_CPUS = int(os.environ.get("EXTRACTOR_RESERVED_CPUS", "1"))
 
-                    <div class="message success" id="successMessage"></div>
-                    <div class="message error" id="errorMessage"></div>
-                </div>
-            </div>
+def _pin_extraction_worker():
+    """
+    Keep the extraction worker off the web server's CPUs (Linux only; no-op elsewhere)
+    Page-rendering processes started by the worker inherit the same CPU set
+    """
+    if not hasattr(os, "sched_setaffinity") or EXTRACTION_RESERVED_CPUS <= 0:
+        return
+    
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) <= EXTRACTION_RESERVED_CPUS:
+        return
+    
+    try:
+        os.sched_setaffinity(0, cpus[EXTRACTION_RESERVED_CPUS:])
+        logger.info("📌 Extraction worker pinned to CPUs %s", cpus[EXTRACTION_RESERVED_CPUS:])
+    except OSError as e:
+        logger.warning("Could not set extraction worker CPU affinity: %s", e)
 
-            <script>
-                const uploadArea = document.getElementById('uploadArea');
-                const fileInput = document.getElementById('pdf');
-                const fileInfo = document.getElementById('fileInfo');
-                const extractForm = document.getElementById('extractForm');
-                const extractBtn = document.getElementById('extractBtn');
-                const progress = document.getElementById('progress');
-                const progressFill = document.getElementById('progressFill');
-                const progressText = document.getElementById('progressText');
-                const successMessage = document.getElementById('successMessage');
-                const errorMessage = document.getElementById('errorMessage');
-
-                // File upload handling
-                uploadArea.addEventListener('click', () => fileInput.click());
-                uploadArea.addEventListener('dragover', (e) => {
-                    e.preventDefault();
-                    uploadArea.classList.add('dragover');
-                });
-                uploadArea.addEventListener('dragleave', () => {
-                    uploadArea.classList.remove('dragover');
-                });
-                uploadArea.addEventListener('drop', (e) => {
-                    e.preventDefault();
-                    uploadArea.classList.remove('dragover');
-                    const files = e.dataTransfer.files;
-                    if (files.length > 0) {
-                        fileInput.files = files;
-                        showFileInfo(files[0]);
-                    }
-                });
+def _init_extraction_worker():
+    """
+    Log straight to the original handlers, pin the worker's CPUs and build its pooled
+    extractor up front so the first request doesn't pay for it
+    """
+    _log_directly()
+    _pin_extraction_worker()
+    with checkout_extractor():
+        pass
 
-                fileInput.addEventListener('change', (e) => {
-                    if (e.target.files.length > 0) {
-                        showFileInfo(e.target.files[0]);
-                    }
-                });
-
-                function showFileInfo(file) {
-                    fileInfo.innerHTML = `
-                        <h4>📄 Selected File:</h4>
-                        <p><strong>Name:</strong> ${file.name}</p>
-                        <p><strong>Size:</strong> ${(file.size / 1024 / 1024).toFixed(2)} MB</p>
-                        <p><strong>Type:</strong> ${file.type}</p>
-                    `;
-                    fileInfo.style.display = 'block';
-                }
+def _extract_in_worker(pdf_filename, subject, year, month, paper_code, pdf_digest=None,
+                       progress_queue=None, cancel_event=None):
+    """Extraction job for the worker process (module-level so it can be pickled)"""
+    with checkout_extractor() as extractor:
+        return extractor.extract_questions_for_web_interface(
+            pdf_filename=pdf_filename,
+            subject=subject,
+            year=year,
+            month=month,
+            paper_code=paper_code,
+            pdf_digest=pdf_digest,
+            progress_queue=progress_queue,
+            cancel_event=cancel_event
+        )
 
-                // Form submission
-                extractForm.addEventListener('submit', async (e) => {
-                    e.preventDefault();
-                    
-                    // Hide previous messages
-                    successMessage.style.display = 'none';
-                    errorMessage.style.display = 'none';
-                    
-                    // Validate form
-                    if (!fileInput.files[0]) {
-                        showError('Please select a PDF file');
-                        return;
-                    }
-                    
-                    // Show progress
-                    extractBtn.disabled = true;
-                    progress.style.display = 'block';
-                    
-                    // Simulate progress
-                    simulateProgress();
-                    
-                    // Create form data
-                    const formData = new FormData(extractForm);
-                    
-                    try {
-                        const response = await fetch('/extract', {
-                            method: 'POST',
-                            body: formData
-                        });
-                        
-                        const result = await response.json();
-                        
-                        if (result.success) {
-                            showSuccess(`
-                                <h3>🎉 Extraction Successful!</h3>
-                                <p><strong>Questions Found:</strong> ${result.questions_found}</p>
-                                <p><strong>Images Deployed:</strong> ${result.deployed_images || result.images_extracted}</p>
-                                <p><strong>Output File:</strong> ${result.output_file}</p>
-                                <p>Your questions are now available in the web interface!</p>
-                            `);
-                        } else {
-                            showError(`Extraction failed: ${result.error}`);
-                        }
-                        
-                    } catch (error) {
-                        showError(`Network error: ${error.message}`);
-                    } finally {
-                        extractBtn.disabled = false;
-                        progress.style.display = 'none';
-                        progressFill.style.width = '0%';
-                    }
-                });
-
-                function simulateProgress() {
-                    const steps = [
-                        'Analyzing PDF structure...',
-                        'Detecting question boundaries...',
-                        'Applying multi-strategy detection...',
-                        'Extracting high-quality images...',
-                        'Enhancing image quality...',
-                        'Creating question bank...',
-                        'Deploying to web interface...'
-                    ];
-                    
-                    let step = 0;
-                    const interval = setInterval(() => {
-                        if (step < steps.length) {
-                            progressText.textContent = steps[step];
-                            progressFill.style.width = `${((step + 1) / steps.length) * 100}%`;
-                            step++;
-                        } else {
-                            clearInterval(interval);
-                        }
-                    }, 1000);
-                }
+def _get_extraction_executor():
+    """Create the extraction process pool on first use"""
+    global _extraction_executor
+    with _extraction_executor_lock:
+        if _extraction_executor is None:
+            _extraction_executor = ProcessPoolExecutor(
+                max_workers=EXTRACTOR_POOL_SIZE, initializer=_init_extraction_worker
+            )
+        return _extraction_executor
+
+def run_web_extraction(pdf_filename, subject, year, month, paper_code, pdf_digest=None,
+                       progress_queue=None, cancel_event=None):
+    """
+    Run an extraction of a PDF in PDF_EXTRACTION_TEST_DIR on the extraction worker process
+    Falls back to running in this process if the worker pool can't be used
+    progress_queue/cancel_event must be shareable with the worker (see get_progress_manager)
+    """
+    global _extraction_executor
+    try:
+        future = _get_extraction_executor().submit(
+            _extract_in_worker, pdf_filename, subject, year, month, paper_code, pdf_digest,
+            progress_queue, cancel_event
+        )
+        return future.result()
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning("⚠️ Extraction worker unavailable (%s) - extracting in-process", e)
+        with _extraction_executor_lock:
+            _extraction_executor = None
+        return _extract_in_worker(pdf_filename, subject, year, month, paper_code, pdf_digest,
+                                  progress_queue, cancel_event)
+
+# Manager-backed queues/events can be passed to the extraction worker process
+_progress_manager = None
+
+def get_progress_manager():
+    """Start the multiprocessing manager for progress queues on first use"""
+    global _progress_manager
+    with _extraction_executor_lock:
+        if _progress_manager is None:
+            _progress_manager = multiprocessing.Manager()
+        return _progress_manager
+
+UPLOAD_TEMP_PREFIX = "temp_"
+
+def new_upload_path():
+    """
+    Atomically create a uniquely named, empty temp PDF in PDF_EXTRACTION_TEST_DIR
+    Names never derive from the client's filename, so concurrent uploads can't collide
+    """
+    fd, temp_name = tempfile.mkstemp(prefix=UPLOAD_TEMP_PREFIX, suffix=".pdf", dir=_PDF_DIR_STR)
+    os.close(fd)
+    return Path(temp_name)
+
+def is_upload_path(pdf_path):
+    """Whether pdf_path (absolute) is a temp PDF made by new_upload_path"""
+    directory, name = os.path.split(pdf_path)
+    return directory == os.path.abspath(_PDF_DIR_STR) and name.startswith(UPLOAD_TEMP_PREFIX)
+
+def save_upload_stream(stream, dest_path, chunk_size=UPLOAD_CHUNK_SIZE, digest=None):
+    """
+    Copy an upload stream to dest_path in fixed-size chunks, feeding each chunk to digest
+    (when given) so the content hash costs no extra pass over the file
+    Memory stays bounded by one chunk regardless of the PDF size. Returns bytes written
+    Writes block only the request's own worker thread, so large chunks (few syscalls)
+    are preferred over async file I/O
+    """
+    written = 0
+    with open(dest_path, 'wb', buffering=chunk_size) as f:
+        while chunk := stream.read(chunk_size):
+            f.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            written += len(chunk)
+    return written
+
+# Resumable uploads: the client sends fixed-size chunks (any order, retries allowed)
+# into a preallocated temp PDF, then finalizes. State lives in this process
+CHUNKED_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+CHUNKED_UPLOAD_TTL = 60 * 60  # Seconds an idle upload is kept before its partial file is removed
+
+@dataclass(slots=True)
+class ChunkedUpload:
+    """Partial PDF assembled from numbered chunks"""
+    path: Path
+    size: int
+    chunk_count: int
+    subject: str
+    year: str
+    month: str
+    paper_code: str
+    received: set
+    touched: float
+    digest: object  # Content digest of chunks 0..digested-1, fed as they arrive in order
+    digested: int = 0
+    writers: int = 0  # Chunk requests writing now; finalize and purge leave the file alone meanwhile
+    
+    def chunk_length(self, index):
+        """Expected byte length of chunk `index` (only the last chunk may be short)"""
+        return min(CHUNKED_UPLOAD_CHUNK_SIZE, self.size - index * CHUNKED_UPLOAD_CHUNK_SIZE)
+    
+    def missing_chunks(self):
+        """Chunk indices not received yet"""
+        return [index for index in range(self.chunk_count) if index not in self.received]
+
+_chunked_uploads = {}  # upload_id → ChunkedUpload
+_chunked_uploads_lock = threading.Lock()
+
+def _purge_expired_uploads():
+    """Forget uploads idle for longer than CHUNKED_UPLOAD_TTL and delete their partial files"""
+    cutoff = time.monotonic() - CHUNKED_UPLOAD_TTL
+    with _chunked_uploads_lock:
+        expired = [upload_id for upload_id, upload in _chunked_uploads.items()
+                   if upload.touched < cutoff and not upload.writers]
+        expired_uploads = [_chunked_uploads.pop(upload_id) for upload_id in expired]
+    
+    for upload in expired_uploads:
+        upload.path.unlink(missing_ok=True)
+        logger.info("🧹 Expired chunked upload: %s", upload.path.name)
+
+def write_upload_chunk(stream, dest_path, offset, expected_length, chunk_size=UPLOAD_CHUNK_SIZE, digest=None):
+    """
+    Write one upload chunk from stream into dest_path at offset, in bounded reads,
+    feeding each read to digest (when given)
+    Returns True when exactly expected_length bytes arrived
+    """
+    written = 0
+    with open(dest_path, 'r+b') as f:
+        f.seek(offset)
+        while written < expected_length and (data := stream.read(min(chunk_size, expected_length - written))):
+            f.write(data)
+            if digest is not None:
+                digest.update(data)
+            written += len(data)
+    return written == expected_length and not stream.read(1)
+
+def finish_upload_digest(upload):
+    """
+    Hex content digest of a complete chunked upload: chunks that arrived out of order
+    were not hashed on arrival, so the rest of the file is read once here
+    """
+    digest = upload.digest
+    offset = upload.digested * CHUNKED_UPLOAD_CHUNK_SIZE
+    if offset < upload.size:
+        with open(upload.path, 'rb') as f:
+            f.seek(offset)
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+# Static assets for the extractor page, encoded once at import and compressed when the
+# web app is created (CLI runs never pay for it). URLs embed a content hash, so
+# browsers may cache them forever; a changed asset gets a new URL
+@dataclass(slots=True)
+class StaticAsset:
+    """Encoded static response body with its ETag and precompressed variants"""
+    mimetype: str
+    body: bytes
+    etag: str
+    encoded: list  # Best first: (Content-Encoding, body, ETag); filled by precompress_asset
+
+# Set EXTRACTOR_MINIFY=0 to serve the page assets exactly as written (debugging)
+MINIFY_WEB_ASSETS = os.environ.get("EXTRACTOR_MINIFY", "1") != "0"
+
+def minify_asset(text, mimetype):
+    """
+    Shrink page markup/styles/scripts once at import
+    Indentation and blank lines are dropped from HTML and CSS; CSS and JS go through
+    rcssmin/rjsmin when installed (JS is left alone otherwise - newlines can be significant)
+    """
+    if mimetype == 'text/css' and MINIFIERS_AVAILABLE:
+        return rcssmin.cssmin(text)
+    if mimetype == 'text/javascript':
+        return rjsmin.jsmin(text) if MINIFIERS_AVAILABLE else text
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+def build_static_asset(text, mimetype):
+    """Encode text once (minified); compression is left to precompress_asset"""
+    if MINIFY_WEB_ASSETS:
+        text = minify_asset(text, mimetype)
+    body = text.encode('utf-8')
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return StaticAsset(mimetype, body, etag, [])
+
+def precompress_asset(asset):
+    """Fill in the compressed variants (gzip always, Brotli when available) once"""
+    if asset.encoded:
+        return
+    encoded = [('gzip', gzip.compress(asset.body, compresslevel=9, mtime=0), f"{asset.etag}-gzip")]
+    if BROTLI_AVAILABLE:
+        encoded.insert(0, ('br', brotli.compress(asset.body, quality=11), f"{asset.etag}-br"))
+    asset.encoded = encoded
+
+_HASHED_ASSETS = {}  # "app.<hash>.css" → StaticAsset, served from /assets/
 
-                function showSuccess(message) {
-                    successMessage.innerHTML = message;
-                    successMessage.style.display = 'block';
-                    successMessage.scrollIntoView({ behavior: 'smooth' });
+def register_hashed_asset(name, extension, text, mimetype):
+    """Add a long-cacheable asset and return its content-hashed URL"""
+    asset = build_static_asset(text, mimetype)
+    filename = f"{name}.{asset.etag[:12]}.{extension}"
+    _HASHED_ASSETS[filename] = asset
+    return f"/assets/{filename}"
+
+_INDEX_CSS_URL = register_hashed_asset("app", "css", """
+.main-content { padding: 40px; }
+.form-group { margin: 25px 0; }
+.form-group label { 
+    display: block; margin-bottom: 10px; font-weight: 600; 
+    color: #2d3748; font-size: 1em;
+}
+.form-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
+input, select {
+    width: 100%; padding: 15px; border: 2px solid #e2e8f0;
+    border-radius: 12px; font-size: 1em; transition: all 0.3s ease;
+    font-family: inherit;
+}
+input:focus, select:focus {
+    outline: none; border-color: #4facfe;
+    box-shadow: 0 0 0 4px rgba(79, 172, 254, 0.1);
+    transform: translateY(-1px);
+}
+.upload-area {
+    border: 3px dashed #e2e8f0; border-radius: 15px; padding: 50px;
+    text-align: center; transition: all 0.3s ease; cursor: pointer;
+    background: linear-gradient(45deg, #f8fafc, #fff);
+}
+.upload-area:hover {
+    border-color: #4facfe; background: linear-gradient(45deg, #f7faff, #fff);
+    transform: translateY(-2px);
+}
+.upload-area.dragover {
+    border-color: #00f2fe; background: #f0fdff;
+    transform: scale(1.02);
+}
+.upload-icon { font-size: 4em; color: #4facfe; margin-bottom: 20px; }
+.btn {
+    padding: 18px 35px; border: none; border-radius: 12px;
+    font-size: 1.1em; font-weight: 600; cursor: pointer;
+    transition: all 0.3s ease; display: inline-flex;
+    align-items: center; gap: 12px; justify-content: center;
+    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+    color: white; width: 100%; margin: 10px 0;
+}
+.btn:hover {
+    transform: translateY(-3px);
+    box-shadow: 0 15px 35px rgba(79, 172, 254, 0.4);
+}
+.btn:disabled { 
+    opacity: 0.6; cursor: not-allowed; transform: none; 
+    box-shadow: none;
+}
+.progress { 
+    margin: 25px 0; display: none; 
+    background: linear-gradient(45deg, #f7fafc, #fff); 
+    padding: 25px; border-radius: 12px; border-left: 4px solid #4facfe;
+}
+.progress-bar {
+    width: 100%; height: 10px; background: #e2e8f0;
+    border-radius: 10px; overflow: hidden; margin: 10px 0;
+}
+.progress-fill {
+    height: 100%; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+    width: 0%; transition: width 0.5s ease;
+}
+.message {
+    margin: 20px 0; padding: 20px; border-radius: 12px; 
+    font-weight: 500; display: none;
+}
+.success {
+    background: linear-gradient(45deg, #f0fff4, #e6fffa); 
+    color: #2f855a; border-left: 4px solid #38a169;
+}
+.error {
+    background: linear-gradient(45deg, #fef5e7, #fed7d7); 
+    color: #c53030; border-left: 4px solid #e53e3e;
+}
+.file-info {
+    background: linear-gradient(45deg, #f7fafc, #edf2f7); 
+    padding: 20px; border-radius: 12px;
+    margin-top: 15px; display: none;
+    border-left: 4px solid #4299e1;
+}
+.features {
+    display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 15px; margin: 30px 0;
+}
+.feature {
+    background: linear-gradient(45deg, #f8fafc, #fff);
+    padding: 20px; border-radius: 10px;
+    text-align: center; border-left: 3px solid #4facfe;
+}
+.feature-icon { font-size: 2em; margin-bottom: 10px; }
+@media (max-width: 768px) { 
+    .form-grid { grid-template-columns: 1fr; }
+    .features { grid-template-columns: 1fr; }
+}
+""", 'text/css')
+
+_INDEX_JS_URL = register_hashed_asset("app", "js", """
+const uploadArea = document.getElementById('uploadArea');
+const fileInput = document.getElementById('pdf');
+const fileInfo = document.getElementById('fileInfo');
+const extractForm = document.getElementById('extractForm');
+const extractBtn = document.getElementById('extractBtn');
+const progress = document.getElementById('progress');
+const progressFill = document.getElementById('progressFill');
+const progressText = document.getElementById('progressText');
+const successMessage = document.getElementById('successMessage');
+const errorMessage = document.getElementById('errorMessage');
+
+// File upload handling
+uploadArea.addEventListener('click', () => fileInput.click());
+uploadArea.addEventListener('dragover', (e) => {
+    e.preventDefault();
+    uploadArea.classList.add('dragover');
+});
+uploadArea.addEventListener('dragleave', () => {
+    uploadArea.classList.remove('dragover');
+});
+uploadArea.addEventListener('drop', (e) => {
+    e.preventDefault();
+    uploadArea.classList.remove('dragover');
+    const files = e.dataTransfer.files;
+    if (files.length > 0) {
+        fileInput.files = files;
+        showFileInfo(files[0]);
+    }
+});
+
+fileInput.addEventListener('change', (e) => {
+    if (e.target.files.length > 0) {
+        showFileInfo(e.target.files[0]);
+    }
+});
+
+function showFileInfo(file) {
+    fileInfo.innerHTML = `
+        <h4>📄 Selected File:</h4>
+        <p><strong>Name:</strong> ${file.name}</p>
+        <p><strong>Size:</strong> ${(file.size / 1024 / 1024).toFixed(2)} MB</p>
+        <p><strong>Type:</strong> ${file.type}</p>
+    `;
+    fileInfo.style.display = 'block';
+}
+
+// Form submission
+extractForm.addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    // Hide previous messages
+    successMessage.style.display = 'none';
+    errorMessage.style.display = 'none';
+
+    // Validate form
+    if (!fileInput.files[0]) {
+        showError('Please select a PDF file');
+        return;
+    }
+
+    // Show progress
+    extractBtn.disabled = true;
+    progress.style.display = 'block';
+    showProgress(0, 'Uploading PDF...');
+
+    // Create form data
+    const formData = new FormData(extractForm);
+
+    try {
+        const result = await submitExtraction(formData);
+
+        if (result && result.success) {
+            showSuccess(`
+                <h3>🎉 Extraction Successful!</h3>
+                <p><strong>Questions Found:</strong> ${result.questions_found}</p>
+                <p><strong>Images Deployed:</strong> ${result.deployed_images || result.images_extracted}</p>
+                <p><strong>Output File:</strong> ${result.output_file}</p>
+                <p>Your questions are now available in the web interface!</p>
+            `);
+        } else {
+            showError(`Extraction failed: ${result ? result.error : 'No result received'}`);
+        }
+
+    } catch (error) {
+        showError(`Network error: ${error.message}`);
+    } finally {
+        extractBtn.disabled = false;
+        progress.style.display = 'none';
+        progressFill.style.width = '0%';
+    }
+});
+
+// Upload with real byte progress (first half of the bar), then follow the server's
+// extraction events (second half). Resolves with the /extract JSON body
+function submitExtraction(formData) {
+    return new Promise((resolve, reject) => {
+        const xhr = new XMLHttpRequest();
+        let parsed = 0;
+        let result = null;
+
+        xhr.open('POST', '/extract_events');
+
+        xhr.upload.onprogress = (e) => {
+            if (e.lengthComputable) {
+                const percent = Math.round(e.loaded / e.total * 100);
+                showProgress(e.loaded / e.total * 50, `Uploading PDF... ${percent}%`);
+            }
+        };
+
+        // Validation errors arrive as plain JSON; progress arrives as server-sent events
+        const isEventStream = () => (xhr.getResponseHeader('Content-Type') || '').startsWith('text/event-stream');
+
+        xhr.onprogress = () => {
+            if (!isEventStream()) return;
+
+            let boundary;
+            while ((boundary = xhr.responseText.indexOf('\\n\\n', parsed)) >= 0) {
+                const data = xhr.responseText.slice(parsed, boundary).split('\\n')
+                    .filter(line => line.startsWith('data: '))
+                    .map(line => line.slice(6))
+                    .join('\\n');
+                parsed = boundary + 2;
+                if (!data) continue;
+
+                const event = JSON.parse(data);
+                if (event.stage === 'result') {
+                    result = event.result;
+                } else {
+                    showProgress(50 + event.progress * 50, event.message);
                 }
+            }
+        };
 
-                function showError(message) {
-                    errorMessage.innerHTML = `<h3>❌ Error</h3><p>${message}</p>`;
-                    errorMessage.style.display = 'block';
-                    errorMessage.scrollIntoView({ behavior: 'smooth' });
+        xhr.onload = () => {
+            try {
+                if (isEventStream()) {
+                    xhr.onprogress();
+                    resolve(result);
+                } else {
+                    resolve(JSON.parse(xhr.responseText));
                 }
-            </script>
-        </body>
-        </html>
+            } catch (error) {
+                reject(error);
+            }
+        };
+        xhr.onerror = () => reject(new Error('Upload failed'));
+
+        xhr.send(formData);
+    });
+}
+
+function showProgress(percent, message) {
+    progressText.textContent = message;
+    progressFill.style.width = `${Math.round(percent)}%`;
+}
+
+function showSuccess(message) {
+    successMessage.innerHTML = message;
+    successMessage.style.display = 'block';
+    successMessage.scrollIntoView({ behavior: 'smooth' });
+}
+
+function showError(message) {
+    errorMessage.innerHTML = `<h3>❌ Error</h3><p>${message}</p>`;
+    errorMessage.style.display = 'block';
+    errorMessage.scrollIntoView({ behavior: 'smooth' });
+}
+""", 'text/javascript')
+
+# Extractor page: only the header styles stay inline (first paint); the rest is cached
+_INDEX_PAGE = build_static_asset(f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>🎯 Enhanced PDF Question Extractor</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh; padding: 20px;
+        }}
+        .container {{
+            max-width: 900px; margin: 0 auto; background: white;
+            border-radius: 20px; box-shadow: 0 20px 60px rgba(0,0,0,0.1);
+            overflow: hidden;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+            padding: 40px; text-align: center; color: white;
+        }}
+        .header h1 {{ font-size: 2.8em; margin-bottom: 10px; font-weight: 700; }}
+        .header p {{ font-size: 1.2em; opacity: 0.9; margin: 5px 0; }}
+        .enhanced-badge {{
+            background: rgba(255,255,255,0.2); color: white; 
+            padding: 8px 16px; border-radius: 20px; 
+            font-size: 0.9em; margin: 10px 5px; display: inline-block;
+        }}
+    </style>
+    <link rel="stylesheet" href="{_INDEX_CSS_URL}">
+    <script src="{_INDEX_JS_URL}" defer></script>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎯 Enhanced PDF Question Extractor</h1>
+            <p>AI-powered question extraction with multi-strategy detection</p>
+            <div>
+                <span class="enhanced-badge">✅ Multi-Strategy Detection</span>
+                <span class="enhanced-badge">🖼️ High-Quality Images</span>
+                <span class="enhanced-badge">🎯 Web Interface Ready</span>
+            </div>
+        </div>
+
+        <div class="main-content">
+            <div class="features">
+                <div class="feature">
+                    <div class="feature-icon">🔍</div>
+                    <h3>Smart Detection</h3>
+                    <p>7 different strategies to find questions</p>
+                </div>
+                <div class="feature">
+                    <div class="feature-icon">📸</div>
+                    <h3>Quality Images</h3>
+                    <p>Enhanced 2x resolution with optimization</p>
+                </div>
+                <div class="feature">
+                    <div class="feature-icon">🚀</div>
+                    <h3>Web Ready</h3>
+                    <p>Standardized folder structure</p>
+                </div>
+            </div>
+
+            <form id="extractForm" enctype="multipart/form-data">
+                <div class="form-group">
+                    <label for="pdf">📄 Upload PDF File</label>
+                    <div class="upload-area" id="uploadArea">
+                        <div class="upload-icon">📁</div>
+                        <h3>Drop your PDF here or click to browse</h3>
+                        <p>Supports IGCSE past papers and similar formats</p>
+                        <input type="file" id="pdf" name="pdf" accept=".pdf" style="display: none;">
+                    </div>
+                    <div class="file-info" id="fileInfo"></div>
+                </div>
+
+                <div class="form-grid">
+                    <div class="form-group">
+                        <label for="subject">📚 Subject</label>
+                        <select id="subject" name="subject" required>
+                            <option value="">Select Subject</option>
+                            <option value="physics">Physics</option>
+                            <option value="chemistry">Chemistry</option>
+                            <option value="biology">Biology</option>
+                            <option value="mathematics">Mathematics</option>
+                            <option value="english">English</option>
+                            <option value="economics">Economics</option>
+                            <option value="business_studies">Business Studies</option>
+                            <option value="computer_science">Computer Science</option>
+                        </select>
+                    </div>
+
+                    <div class="form-group">
+                        <label for="year">📅 Year</label>
+                        <select id="year" name="year" required>
+                            <option value="">Select Year</option>
+                            <option value="2024">2024</option>
+                            <option value="2023">2023</option>
+                            <option value="2022">2022</option>
+                            <option value="2021">2021</option>
+                            <option value="2020">2020</option>
+                            <option value="2019">2019</option>
+                        </select>
+                    </div>
+
+                    <div class="form-group">
+                        <label for="month">📆 Session</label>
+                        <select id="month" name="month" required>
+                            <option value="">Select Session</option>
+                            <option value="mar">March</option>
+                            <option value="may">May/June</option>
+                            <option value="oct">October/November</option>
+                            <option value="jan">January</option>
+                        </select>
+                    </div>
+
+                    <div class="form-group">
+                        <label for="paper_code">📃 Paper Code</label>
+                        <select id="paper_code" name="paper_code" required>
+                            <option value="">Select Paper</option>
+                            <option value="11">Paper 11</option>
+                            <option value="12">Paper 12</option>
+                            <option value="13">Paper 13</option>
+                            <option value="21">Paper 21</option>
+                            <option value="22">Paper 22</option>
+                            <option value="23">Paper 23</option>
+                            <option value="31">Paper 31</option>
+                            <option value="32">Paper 32</option>
+                            <option value="33">Paper 33</option>
+                        </select>
+                    </div>
+                </div>
+
+                <button type="submit" class="btn" id="extractBtn">
+                    🚀 Extract Questions
+                </button>
+            </form>
+
+            <div class="progress" id="progress">
+                <h3>📄 Processing your PDF...</h3>
+                <div class="progress-bar">
+                    <div class="progress-fill" id="progressFill"></div>
+                </div>
+                <p id="progressText">Initializing extraction...</p>
+            </div>
+
+            <div class="message success" id="successMessage"></div>
+            <div class="message error" id="errorMessage"></div>
+        </div>
+    </div>
+
+</body>
+</html>
+""", 'text/html')
+
+_queued_log_handlers = None  # Root handlers the QueueListener feeds, once _log_through_queue ran
+
+def _log_through_queue():
+    """
+    Route root-logger records through a QueueHandler so request threads never block on
+    handler I/O; a QueueListener thread feeds the original handlers. Idempotent
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root_logger.handlers):
+        return
+    
+    global _queued_log_handlers
+    _queued_log_handlers = list(root_logger.handlers)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *_queued_log_handlers, respect_handler_level=True)
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
+def _log_directly():
+    """
+    Undo _log_through_queue in a forked child: it inherits the QueueHandler but not the
+    listener thread, so its records would pile up in the queue unwritten
+    """
+    if _queued_log_handlers is not None:
+        logging.getLogger().handlers = list(_queued_log_handlers)
+
+# Everything /status reports except the timestamp
+_STATUS_BASE = {
+    'status': 'running',
+    'mode': 'enhanced_pdf_extractor_v2',
+    'features': {
+        'multi_strategy_detection': True,
+        'enhanced_image_quality': True,
+        'standardized_folder_structure': True,
+        'web_interface_ready': True,
+        'backward_compatibility': True
+    },
+    'version': '2.0.0',
+    'extraction_capabilities': {
+        'max_questions': 50,
+        'image_quality': '2x resolution',
+        'enhancement_applied': True,
+        'folder_structure': 'standardized_images_folder',
+        'pillow_simd': PILLOW_SIMD
+    }
+}
+STATUS_CACHE_SECONDS = 1
+_status_cache = (0.0, b'')  # (monotonic expiry, serialized body)
+_status_cache_lock = threading.Lock()
+
+def status_body():
+    """Serialized /status JSON, shared by all requests within STATUS_CACHE_SECONDS"""
+    global _status_cache
+    now = time.monotonic()
+    expires, body = _status_cache
+    if now < expires:
+        return body
+    
+    with _status_cache_lock:
+        expires, body = _status_cache
+        if now >= expires:
+            body = json_bytes({**_STATUS_BASE, 'timestamp': datetime.now().isoformat()})
+            _status_cache = (now + STATUS_CACHE_SECONDS, body)
+        return body
+
+def create_web_app():
+    """
+    Create the Flask web app on first use (cached in the module-level `app`)
+    Returns None when Flask is not installed
+    """
+    global WEB_MODE, app
+    if app is not None:
+        return app
+    
+    try:
+        from flask import Flask, Response, request, jsonify, redirect, send_from_directory
+        from flask_cors import CORS
+        from werkzeug.exceptions import RequestEntityTooLarge
+        from werkzeug.security import safe_join
+    except ImportError:
+        logger.warning("Flask not installed - running in CLI mode only")
+        print("💡 Flask not installed - running in CLI mode only")
+        print("   To enable web interface: pip install flask flask-cors")
+        return None
+    
+    WEB_MODE = True
+    _log_through_queue()
+    logger.info("Flask imported successfully - Web mode available")
+    
+    # Compress the page assets now (before a preloading server forks), not at import
+    for asset in (_INDEX_PAGE, *_HASHED_ASSETS.values()):
+        precompress_asset(asset)
+    
+    app = Flask(__name__)
+    CORS(app)
+    
+    # Werkzeug enforces this while reading multipart/stream bodies (→ 413)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+    
+    # send_file/send_from_directory hand the path to the front-end server instead of the bytes
+    app.config['USE_X_SENDFILE'] = USE_X_SENDFILE
+
+    # Ensure directories exist
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    PDF_EXTRACTION_TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+    def static_asset_response(asset, cache_control):
+        """Send a StaticAsset in the best encoding the client accepts, honouring If-None-Match"""
+        body, etag, content_encoding = asset.body, asset.etag, None
+        for encoding, encoded_body, encoded_etag in asset.encoded:
+            if request.accept_encodings[encoding] > 0:
+                body, etag, content_encoding = encoded_body, encoded_etag, encoding
+                break
+        
+        response = Response(body, mimetype=asset.mimetype)
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        return response.make_conditional(request)
+
+    @app.route('/')
+    def web_index():
+        """Serve the enhanced web extractor interface"""
+        # Revalidate on every visit; unchanged pages cost a 304 with no body
+        return static_asset_response(_INDEX_PAGE, 'no-cache')
+    
+    @app.route('/assets/<filename>')
+    def web_asset(filename):
+        """Serve a content-hashed CSS/JS asset of the extractor page"""
+        asset = _HASHED_ASSETS.get(filename)
+        if asset is None:
+            return "Asset not found", 404
+        return static_asset_response(asset, 'public, max-age=31536000, immutable')
+
+    def error_response(error_msg, status_code, questions_found=0, deployed_images=0):
+        """JSON error envelope shared by the extraction routes"""
+        return jsonify({
+            'success': False,
+            'error': error_msg,
+            'questions_found': questions_found,
+            'deployed_images': deployed_images
+        }), status_code
+    
+    def missing_fields_response(pdf_present, subject, year, month, paper_code):
+        """Return a 400 response naming any missing fields, or None when all are present"""
+        if all([pdf_present, subject, year, month, paper_code]):
+            return None
+        
+        missing_fields = []
+        if not pdf_present: missing_fields.append('PDF file')
+        if not subject: missing_fields.append('subject')
+        if not year: missing_fields.append('year')
+        if not month: missing_fields.append('month')
+        if not paper_code: missing_fields.append('paper_code')
+        
+        error_msg = f'Missing required fields: {", ".join(missing_fields)}'
+        logger.error("❌ Validation error: %s", error_msg)
+        return error_response(error_msg, 400)
+    
+    def extract_saved_pdf(temp_path, subject, year, month, paper_code, pdf_digest=None):
+        """
+        Run the extractor on an uploaded PDF already saved under PDF_EXTRACTION_TEST_DIR
+        Re-uploads of an already extracted paper are answered from the extraction cache
+        """
+        # Verify file was saved (one stat call)
+        try:
+            saved_size = os.stat(temp_path).st_size
+        except FileNotFoundError:
+            saved_size = 0
+        if saved_size == 0:
+            error_msg = "Failed to save uploaded PDF file"
+            logger.error("❌ %s", error_msg)
+            return error_response(error_msg, 500)
+        
+        logger.info("✅ PDF saved successfully: %s bytes", saved_size)
+        
+        # Extract on the worker process (queues while another extraction is running)
+        logger.info("🎯 Starting extraction process...")
+        
+        result = run_web_extraction(
+            pdf_filename=temp_path.name,
+            subject=subject.lower(),
+            year=str(year),
+            month=month.lower(),
+            paper_code=str(paper_code),
+            pdf_digest=pdf_digest
+        )
+        
+        response_data, status_code = extraction_payload(result)
+        return jsonify(response_data), status_code
+    
+    def extraction_payload(result):
+        """(JSON body, HTTP status) for an extractor result, shared by JSON and event-stream routes"""
+        # The result holds the whole question bank - only dump it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Extraction result: %r", result)
+        
+        # Return result with proper structure
+        if result and result.get('success'):
+            logger.info("✅ Extraction successful: %s questions", result['questions_found'])
+            
+            response_data = {
+                'success': True,
+                'questions_found': result.get('questions_found', 0),
+                'output_file': result.get('output_file', ''),
+                'images_extracted': result.get('images_extracted', 0),
+                'deployed_images': result.get('deployed_images', 0),
+                'metadata': result.get('question_bank', {}).get('metadata', {}),
+                'cached': result.get('cached', False)
+            }
+            
+            return response_data, 200
+        
+        error_msg = result.get('error', 'Unknown extraction error') if result else 'Extraction returned None'
+        
+        logger.error("❌ Extraction failed: %s", error_msg)
+        return {
+            'success': False,
+            'error': error_msg,
+            'questions_found': result.get('questions_found', 0) if result else 0,
+            'deployed_images': result.get('deployed_images', 0) if result else 0
+        }, 500
+    
+    def upload_too_large_response():
+        """413 in the extraction JSON envelope"""
+        error_msg = _UPLOAD_TOO_LARGE_MSG
+        logger.error("❌ Upload rejected: %s", error_msg)
+        return error_response(error_msg, 413)
+    
+    @app.errorhandler(RequestEntityTooLarge)
+    def web_upload_too_large(e):
+        """Bodies that exceed MAX_CONTENT_LENGTH while being read"""
+        return upload_too_large_response()
+    
+    def remove_temp_pdf(temp_path):
+        """Clean up an uploaded temp PDF"""
+        if temp_path:
+            try:
+                temp_path.unlink(missing_ok=True)
+                logger.info("🧹 Cleaned up temp file: %s", temp_path.name)
+            except Exception as e:
+                logger.warning("Failed to clean up temp file: %s", e)
+
+    def save_form_upload():
+        """
+        Validate the multipart extraction form (pdf, subject, year, month, paper_code)
+        and save its PDF under a unique temp name
+        Returns ((temp_path, subject, year, month, paper_code, pdf_digest), None) or (None, error response)
         """
+        # Get form data with validation
+        pdf_file = request.files.get('pdf')
+        subject = request.form.get('subject', '').strip()
+        year = request.form.get('year', '').strip()
+        month = request.form.get('month', '').strip()
+        paper_code = request.form.get('paper_code', '').strip()
+        
+        logger.info("📋 Extraction request: %s, %s, %s, %s", subject, year, month, paper_code)
+        
+        # Validate required fields
+        invalid = missing_fields_response(pdf_file, subject, year, month, paper_code)
+        if invalid:
+            return None, invalid
+        
+        # Validate PDF file
+        if not pdf_file.filename.lower().endswith('.pdf'):
+            error_msg = 'Only PDF files are supported'
+            logger.error("❌ File validation error: %s", error_msg)
+            return None, error_response(error_msg, 400)
+        
+        # Save uploaded PDF under a unique temp name
+        temp_path = new_upload_path()
+        
+        logger.info("📄 Saving %s to: %s", pdf_file.filename, temp_path)
+        pdf_digest = new_pdf_digest()
+        try:
+            save_upload_stream(pdf_file.stream, temp_path, digest=pdf_digest)
+        except BaseException:
+            remove_temp_pdf(temp_path)
+            raise
+        
+        return (temp_path, subject, year, month, paper_code, pdf_digest.hexdigest()), None
 
     @app.route('/extract', methods=['POST'])
     def web_extract_questions():
@@ -1238,168 +2493,289 @@ if WEB_MODE:
         """
         temp_path = None
         
+        # Reject oversized uploads from the headers alone, before reading the body
+        if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+            return upload_too_large_response()
+        
         try:
-            # Get form data with validation
-            pdf_file = request.files.get('pdf')
-            subject = request.form.get('subject', '').strip()
-            year = request.form.get('year', '').strip()
-            month = request.form.get('month', '').strip()
-            paper_code = request.form.get('paper_code', '').strip()
-            
-            logger.info(f"📋 Extraction request: {subject}, {year}, {month}, {paper_code}")
-            
-            # Validate required fields
-            if not all([pdf_file, subject, year, month, paper_code]):
-                missing_fields = []
-                if not pdf_file: missing_fields.append('PDF file')
-                if not subject: missing_fields.append('subject')
-                if not year: missing_fields.append('year')
-                if not month: missing_fields.append('month')
-                if not paper_code: missing_fields.append('paper_code')
-                
-                error_msg = f'Missing required fields: {", ".join(missing_fields)}'
-                logger.error(f"❌ Validation error: {error_msg}")
-                
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': 0,
-                    'deployed_images': 0
-                }), 400
-            
-            # Validate PDF file
-            if not pdf_file.filename.lower().endswith('.pdf'):
-                error_msg = 'Only PDF files are supported'
-                logger.error(f"❌ File validation error: {error_msg}")
-                
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': 0,
-                    'deployed_images': 0
-                }), 400
-            
-            # Save uploaded PDF temporarily with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            temp_filename = f"temp_{timestamp}_{pdf_file.filename}"
-            temp_path = PDF_EXTRACTION_TEST_DIR / temp_filename
-            
-            logger.info(f"📄 Saving PDF to: {temp_path}")
-            pdf_file.save(str(temp_path))
-            
-            # Verify file was saved
-            if not temp_path.exists() or temp_path.stat().st_size == 0:
-                error_msg = "Failed to save uploaded PDF file"
-                logger.error(f"❌ {error_msg}")
+            upload, invalid = save_form_upload()
+            if invalid:
+                return invalid
+            
+            temp_path = upload[0]
+            return extract_saved_pdf(*upload)
                 
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': 0,
-                    'deployed_images': 0
-                }), 500
+        except RequestEntityTooLarge:
+            return upload_too_large_response()
             
-            logger.info(f"✅ PDF saved successfully: {temp_path.stat().st_size} bytes")
+        except Exception as e:
+            error_msg = f'Server error: {str(e)}'
+            logger.error("❌ Web extraction error: %s", error_msg)
+            logger.debug("Full traceback:", exc_info=True)
+            return error_response(error_msg, 500)
             
-            # Initialize enhanced extractor
+        finally:
+            remove_temp_pdf(temp_path)
+
+    def sse_event(event):
+        """Format one server-sent event"""
+        return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    @app.route('/extract_events', methods=['POST'])
+    def web_extract_questions_events():
+        """
+        Same form as /extract, answered with a text/event-stream of real progress:
+        one event per extraction stage, then {"stage": "result", "status", "result"}
+        with the /extract JSON body. Disconnecting cancels at the next stage
+        """
+        if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+            return upload_too_large_response()
+        
+        try:
+            upload, invalid = save_form_upload()
+        except RequestEntityTooLarge:
+            return upload_too_large_response()
+        except Exception as e:
+            error_msg = f'Server error: {str(e)}'
+            logger.error("❌ Web extraction error: %s", error_msg)
+            logger.debug("Full traceback:", exc_info=True)
+            return error_response(error_msg, 500)
+        if invalid:
+            return invalid
+        
+        temp_path, subject, year, month, paper_code, pdf_digest = upload
+        manager = get_progress_manager()
+        progress_queue = manager.Queue()
+        cancel_event = manager.Event()
+        outcome = {}
+        
+        def run_extraction():
             try:
-                extractor = EnhancedPDFExtractor(base_dir=str(PDF_EXTRACTION_TEST_DIR))
-                logger.info("✅ Extractor initialized successfully")
+                outcome['result'] = run_web_extraction(
+                    pdf_filename=temp_path.name,
+                    subject=subject.lower(),
+                    year=str(year),
+                    month=month.lower(),
+                    paper_code=str(paper_code),
+                    pdf_digest=pdf_digest,
+                    progress_queue=progress_queue,
+                    cancel_event=cancel_event
+                )
             except Exception as e:
-                error_msg = f"Failed to initialize extractor: {str(e)}"
-                logger.error(f"❌ {error_msg}")
+                logger.error("❌ Web extraction error: Server error: %s", e)
+                logger.debug("Full traceback:", exc_info=True)
+                outcome['error'] = f'Server error: {str(e)}'
+            finally:
+                remove_temp_pdf(temp_path)
+                progress_queue.put(None)
+        
+        worker = threading.Thread(target=run_extraction, name="extract-events", daemon=True)
+        worker.start()
+        
+        def generate():
+            try:
+                yield sse_event({'stage': 'uploaded', 'progress': 0.0, 'message': "Upload complete - starting extraction..."})
+                while (event := progress_queue.get()) is not None:
+                    yield sse_event(event)
                 
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': 0,
-                    'deployed_images': 0
-                }), 500
-            
-            # Perform extraction
-            logger.info("🎯 Starting extraction process...")
-            
-            result = extractor.extract_questions_for_web_interface(
-                pdf_filename=temp_filename,
-                subject=subject.lower(),
-                year=str(year),
-                month=month.lower(),
-                paper_code=str(paper_code)
-            )
+                worker.join()
+                if 'error' in outcome:
+                    payload, status_code = {
+                        'success': False, 'error': outcome['error'], 'questions_found': 0, 'deployed_images': 0
+                    }, 500
+                else:
+                    payload, status_code = extraction_payload(outcome['result'])
+                yield sse_event({'stage': 'result', 'progress': 1.0, 'status': status_code, 'result': payload})
+            finally:
+                # Client went away mid-stream: stop the extraction at its next stage
+                if worker.is_alive():
+                    logger.info("⏹️ Client disconnected - cancelling extraction")
+                    cancel_event.set()
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+
+    @app.route('/extract_stream', methods=['POST'])
+    def web_extract_questions_stream():
+        """
+        Extract from a PDF sent as the raw request body (Content-Type: application/pdf)
+        Metadata comes from query parameters (subject, year, month, paper_code). The body
+        is streamed straight to disk, skipping multipart parsing and in-memory spooling
+        """
+        temp_path = None
+        
+        if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+            return upload_too_large_response()
+        
+        try:
+            subject = request.args.get('subject', '').strip()
+            year = request.args.get('year', '').strip()
+            month = request.args.get('month', '').strip()
+            paper_code = request.args.get('paper_code', '').strip()
             
-            logger.info(f"📊 Extraction result: {result}")
+            logger.info("📋 Streamed extraction request: %s, %s, %s, %s", subject, year, month, paper_code)
+            
+            invalid = missing_fields_response(request.content_length != 0, subject, year, month, paper_code)
+            if invalid:
+                return invalid
+            
+            temp_path = new_upload_path()
+            
+            logger.info("📄 Streaming PDF to: %s", temp_path)
+            pdf_digest = new_pdf_digest()
+            save_upload_stream(request.stream, temp_path, digest=pdf_digest)
+            
+            return extract_saved_pdf(temp_path, subject, year, month, paper_code, pdf_digest.hexdigest())
+            
+        except RequestEntityTooLarge:
+            return upload_too_large_response()
             
-            # Return result with proper structure
-            if result and result.get('success'):
-                logger.info(f"✅ Extraction successful: {result['questions_found']} questions")
-                
-                response_data = {
-                    'success': True,
-                    'questions_found': result.get('questions_found', 0),
-                    'output_file': result.get('output_file', ''),
-                    'images_extracted': result.get('images_extracted', 0),
-                    'deployed_images': result.get('deployed_images', 0),
-                    'metadata': result.get('question_bank', {}).get('metadata', {})
-                }
-                
-                return jsonify(response_data)
-                
-            else:
-                error_msg = result.get('error', 'Unknown extraction error') if result else 'Extraction returned None'
-                questions_found = result.get('questions_found', 0) if result else 0
-                deployed_images = result.get('deployed_images', 0) if result else 0
-                
-                logger.error(f"❌ Extraction failed: {error_msg}")
-                
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'questions_found': questions_found,
-                    'deployed_images': deployed_images
-                }), 500
-                
         except Exception as e:
             error_msg = f'Server error: {str(e)}'
-            logger.error(f"❌ Web extraction error: {error_msg}")
-            logger.error("Full traceback:", exc_info=True)
-            
-            return jsonify({
-                'success': False,
-                'error': error_msg,
-                'questions_found': 0,
-                'deployed_images': 0
-            }), 500
+            logger.error("❌ Web extraction error: %s", error_msg)
+            logger.debug("Full traceback:", exc_info=True)
+            return error_response(error_msg, 500)
             
         finally:
-            # Clean up temp file
-            if temp_path and temp_path.exists():
-                try:
-                    temp_path.unlink()
-                    logger.info(f"🧹 Cleaned up temp file: {temp_filename}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temp file: {e}")
+            remove_temp_pdf(temp_path)
+
+    @app.route('/extract/init', methods=['POST'])
+    def web_chunked_upload_init():
+        """
+        Start a resumable upload: JSON/form fields subject, year, month, paper_code and size
+        (PDF bytes). Returns the upload_id, chunk_size and chunk count to send
+        """
+        _purge_expired_uploads()
+        
+        fields_in = request.get_json(silent=True) or request.form
+        subject = str(fields_in.get('subject', '')).strip()
+        year = str(fields_in.get('year', '')).strip()
+        month = str(fields_in.get('month', '')).strip()
+        paper_code = str(fields_in.get('paper_code', '')).strip()
+        
+        try:
+            size = int(fields_in.get('size', 0))
+        except (TypeError, ValueError):
+            size = 0
+        
+        invalid = missing_fields_response(size > 0, subject, year, month, paper_code)
+        if invalid:
+            return invalid
+        if size > MAX_UPLOAD_BYTES:
+            return upload_too_large_response()
+        
+        temp_path = new_upload_path()
+        with open(temp_path, 'r+b') as f:
+            f.truncate(size)
+        
+        upload_id = secrets.token_hex(16)
+        chunk_count = -(-size // CHUNKED_UPLOAD_CHUNK_SIZE)
+        with _chunked_uploads_lock:
+            _chunked_uploads[upload_id] = ChunkedUpload(
+                temp_path, size, chunk_count, subject, year, month, paper_code, set(), time.monotonic(),
+                new_pdf_digest()
+            )
+        
+        logger.info("📦 Chunked upload %s: %s bytes in %s chunks", upload_id, size, chunk_count)
+        return jsonify({
+            'success': True,
+            'upload_id': upload_id,
+            'chunk_size': CHUNKED_UPLOAD_CHUNK_SIZE,
+            'chunk_count': chunk_count
+        })
+    
+    @app.route('/extract/chunk/<upload_id>', methods=['GET'])
+    def web_chunked_upload_status(upload_id):
+        """List the chunks still missing (used to resume an interrupted upload)"""
+        with _chunked_uploads_lock:
+            upload = _chunked_uploads.get(upload_id)
+            missing = upload.missing_chunks() if upload else None
+        
+        if upload is None:
+            return error_response('Unknown or expired upload', 404)
+        return jsonify({'success': True, 'upload_id': upload_id, 'missing_chunks': missing})
+    
+    @app.route('/extract/chunk/<upload_id>/<int:index>', methods=['PUT', 'POST'])
+    def web_chunked_upload_chunk(upload_id, index):
+        """Store chunk `index` (raw request body) at its offset in the partial PDF"""
+        # Registered as a writer while still in the table, so finalize and purge can't
+        # delete the partial file under the write. The next chunk in order is hashed as it
+        # is written (into a copy, kept only if the chunk arrives whole); finalize hashes
+        # whatever arrived out of order
+        with _chunked_uploads_lock:
+            upload = _chunked_uploads.get(upload_id)
+            if upload is not None and 0 <= index < upload.chunk_count:
+                upload.writers += 1
+                upload.touched = time.monotonic()
+                digest = upload.digest.copy() if index == upload.digested else None
+        
+        if upload is None:
+            return error_response('Unknown or expired upload', 404)
+        if not 0 <= index < upload.chunk_count:
+            return error_response(f'Chunk index out of range (0-{upload.chunk_count - 1})', 400)
+        
+        expected_length = upload.chunk_length(index)
+        complete = None
+        try:
+            complete = write_upload_chunk(request.stream, upload.path, index * CHUNKED_UPLOAD_CHUNK_SIZE,
+                                          expected_length, digest=digest)
+        except OSError as e:
+            logger.warning("Failed to write chunk %s of upload %s: %s", index, upload_id, e)
+        finally:
+            with _chunked_uploads_lock:
+                upload.writers -= 1
+                if complete:
+                    upload.received.add(index)
+                    upload.touched = time.monotonic()
+                    if digest is not None and index == upload.digested:
+                        upload.digest = digest
+                        upload.digested += 1
+                received = len(upload.received)
+        
+        if complete is None:
+            return error_response('Unknown or expired upload', 404)
+        if not complete:
+            return error_response(f'Chunk {index} must be exactly {expected_length} bytes', 400)
+        
+        return jsonify({'success': True, 'received_chunks': received, 'chunk_count': upload.chunk_count})
+    
+    @app.route('/extract/finalize/<upload_id>', methods=['POST'])
+    def web_chunked_upload_finalize(upload_id):
+        """Run the extraction once every chunk has arrived"""
+        with _chunked_uploads_lock:
+            upload = _chunked_uploads.get(upload_id)
+            missing = upload.missing_chunks() if upload else None
+            busy = upload is not None and upload.writers > 0
+            if upload is not None and not missing and not busy:
+                del _chunked_uploads[upload_id]
+        
+        if upload is None:
+            return error_response('Unknown or expired upload', 404)
+        if missing:
+            return error_response(f'Upload incomplete: {len(missing)} chunk(s) missing', 409)
+        if busy:
+            return error_response('Upload busy: a chunk is still being written, retry shortly', 409)
+        
+        try:
+            return extract_saved_pdf(upload.path, upload.subject, upload.year, upload.month, upload.paper_code,
+                                     finish_upload_digest(upload))
+        
+        except Exception as e:
+            error_msg = f'Server error: {str(e)}'
+            logger.error("❌ Web extraction error: %s", error_msg)
+            logger.debug("Full traceback:", exc_info=True)
+            return error_response(error_msg, 500)
+        
+        finally:
+            remove_temp_pdf(upload.path)
 
     @app.route('/status')
     def web_status():
-        """Enhanced health check endpoint"""
-        return jsonify({
-            'status': 'running',
-            'mode': 'enhanced_pdf_extractor_v2',
-            'timestamp': datetime.now().isoformat(),
-            'features': {
-                'multi_strategy_detection': True,
-                'enhanced_image_quality': True,
-                'standardized_folder_structure': True,
-                'web_interface_ready': True,
-                'backward_compatibility': True
-            },
-            'version': '2.0.0',
-            'extraction_capabilities': {
-                'max_questions': 50,
-                'image_quality': '2x resolution',
-                'enhancement_applied': True,
-                'folder_structure': 'standardized_images_folder'
-            }
+        """Enhanced health check endpoint (body rebuilt at most once per second)"""
+        return Response(status_body(), mimetype='application/json', headers={
+            'Cache-Control': f'max-age={STATUS_CACHE_SECONDS}'
         })
 
     @app.route('/solver')
@@ -1410,26 +2786,240 @@ if WEB_MODE:
     # Image serving route for testing
     @app.route('/images/<path:filename>')
     def serve_image(filename):
-        """Serve extracted images for testing"""
+        """
+        Serve extracted images for testing
+        send_from_directory rejects paths escaping the images folder and answers
+        conditional/range requests; filenames are reused across extractions, so
+        clients revalidate (ETag/Last-Modified → 304) instead of caching for a fixed time
+        With EXTRACTOR_X_ACCEL_IMAGES set, nginx streams the file itself via sendfile(2)
+        """
+        if X_ACCEL_IMAGES_PREFIX:
+            if safe_join(_PDF_DIR_STR, "images", filename) is None:
+                return "Image not found", 404
+            response = Response(status=200)
+            response.headers['X-Accel-Redirect'] = X_ACCEL_IMAGES_PREFIX.rstrip('/') + '/' + filename
+            response.headers['Cache-Control'] = 'no-cache'
+            del response.headers['Content-Type']  # Let nginx set the image type
+            return response
+        
         try:
-            images_dir = Path("/Users/wynceaxcel/Apps/axcelscore/pdf-extraction-test/images")
-            return send_file(images_dir / filename, mimetype='image/png')
+            return send_from_directory(PDF_EXTRACTION_IMAGES_DIR, filename, conditional=True, etag=True, last_modified=True)
         except Exception as e:
-            logger.error(f"Failed to serve image {filename}: {e}")
+            logger.warning("Failed to serve image %s: %s", filename, e)
             return "Image not found", 404
 
+    return app
+
+def create_asgi_app():
+    """
+    Wrap the Flask app for ASGI servers (e.g. uvicorn --factory extractor:create_asgi_app)
+    Each request runs on the server's thread pool, so uploads and extractions from
+    different clients proceed concurrently. Returns None when Flask or asgiref is missing
+    """
+    web_app = create_web_app()
+    if web_app is None:
+        return None
+    
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+    except ImportError:
+        logger.warning("asgiref not installed - ASGI entry point unavailable (pip install asgiref)")
+        return None
+    
+    return WsgiToAsgi(web_app)
+
 # ============================================================================
 # CLI FUNCTIONS AND MAIN EXECUTION
 # ============================================================================
 
-def interactive_extraction():
-    """Interactive CLI extraction with enhanced interface"""
+# Where the CLI looks for PDFs to extract
+CLI_PDF_DIR = Path("/Users/wynceaxcel/Apps/axcelscore/pdf-extraction-test")
+
+@lru_cache(maxsize=4)
+def _scan_pdfs(base_dir, mtime_ns):
+    """Sorted PDF filenames in base_dir (mtime_ns only keys the cache)"""
+    with os.scandir(base_dir) as entries:
+        return tuple(sorted(
+            entry.name for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        ))
+
+def list_pdfs(base_dir):
+    """
+    PDF filenames in base_dir, listed once per process until the directory changes
+    (adding/removing a file updates the directory mtime, which invalidates the cache)
+    """
+    try:
+        mtime_ns = os.stat(base_dir).st_mtime_ns
+    except FileNotFoundError:
+        return ()
+    return _scan_pdfs(os.fspath(base_dir), mtime_ns)
+
+# One CLI extractor per base directory, reused across runs (the PDF document is
+# closed at the end of every extraction, so nothing per-PDF is kept alive)
+_extractor_cache = {}
+
+def _get_extractor(base_dir):
+    """Return the cached extractor for base_dir, creating it on first use"""
+    base_dir = os.fspath(base_dir)
+    extractor = _extractor_cache.get(base_dir)
+    if extractor is None:
+        extractor = _extractor_cache[base_dir] = EnhancedPDFExtractor(base_dir=base_dir)
+    return extractor
+
+def parse_pdf_selection(text, count):
+    """
+    Parse a menu selection such as "2" or "1,3" into 0-based indexes
+    Raises ValueError on anything outside 1..count
+    """
+    indexes = []
+    for part in text.split(","):
+        index = int(part) - 1
+        if not 0 <= index < count:
+            raise ValueError(f"PDF selection out of range: {part.strip()}")
+        if index not in indexes:
+            indexes.append(index)
+    if not indexes:
+        raise ValueError("No PDF selected")
+    return indexes
+
+# Accepted exam details (set lookups; the year check needs no int() parse)
+_VALID_MONTHS = frozenset({'mar', 'may', 'oct', 'jan', 'feb', 'jun', 'nov', 'dec'})
+_VALID_YEARS = frozenset(str(y) for y in range(2019, 2025))
+
+# (key, prompt label, example) of each exam detail, in prompt order
+_EXAM_FIELDS = (
+    ('subject', 'Subject', 'physics'),
+    ('year', 'Year', '2023'),
+    ('month', 'Month', 'oct'),
+    ('paper_code', 'Paper', '13'),
+)
+
+def prompt_exam_details(pdf_name, subject=None, year=None, month=None, paper_code=None):
+    """
+    Validate the exam details of one PDF, None if invalid
+    Details not already given (e.g. as command-line flags) are asked for on one
+    space-separated line, so piped input works: echo "physics 2023 oct 13" | ...
+    """
+    details = {'subject': subject, 'year': year, 'month': month, 'paper_code': paper_code}
+    missing = [field for field in _EXAM_FIELDS if not details[field[0]]]
+    if missing:
+        labels = " ".join(label for _, label, _ in missing)
+        example = " ".join(example for _, _, example in missing)
+        print(f"\n📋 Enter exam details for {pdf_name}:")
+        print("   (subject: physics/chemistry/biology/etc. • year: 2019-2024 • "
+              "month: mar/may/oct/jan • paper: 11/12/13/21/22/23/etc.)")
+        parts = input(f"{labels} (space-separated, e.g. '{example}'): ").split()
+        if len(parts) != len(missing):
+            print(f"❌ Expected {len(missing)} value(s): {labels}")
+            return None
+        for (key, _, _), value in zip(missing, parts):
+            details[key] = value
+    
+    subject = details['subject'].strip().lower()
+    year = details['year'].strip()
+    month = details['month'].strip().lower()
+    paper_code = details['paper_code'].strip()
+    
+    # Validate inputs
+    if not all([subject, year, month, paper_code]):
+        print("❌ All fields are required")
+        return None
+    
+    if year not in _VALID_YEARS:
+        print("❌ Year must be between 2019-2024")
+        return None
+    
+    if month not in _VALID_MONTHS:
+        print("❌ Invalid month code")
+        return None
+    
+    return {
+        'pdf_filename': pdf_name,
+        'subject': subject,
+        'year': year,
+        'month': month,
+        'paper_code': paper_code
+    }
+
+def extract_batch(base_dir, jobs):
+    """
+    Extract several PDFs from base_dir with one extractor, one after another
+    Each job is a dict of extract_questions_for_web_interface keyword arguments.
+    PDFs are not run side by side: every extraction clears and refills the shared
+    images/ folder, so concurrent runs would deploy each other's images. Each run
+    already spreads its page rendering over the extractor's process pool.
+    """
+    extractor = _get_extractor(base_dir)
+    results = []
+    for n, job in enumerate(jobs, 1):
+        print(f"\n🚀 [{n}/{len(jobs)}] Extracting {job['pdf_filename']}...")
+        try:
+            result = extractor.extract_questions_for_web_interface(**job)
+        except Exception as e:
+            logger.error("Batch extraction error for %s:", job['pdf_filename'], exc_info=True)
+            result = {'success': False, 'error': str(e), 'questions_found': 0, 'deployed_images': 0}
+        results.append((job, result))
+    return results
+
+def report_batch(results):
+    """Print the outcome of each (job, result) pair, True if every extraction succeeded"""
+    all_ok = True
+    for job, result in results:
+        if result and result.get('success'):
+            print(f"\n🎉 SUCCESS: {job['pdf_filename']}")
+            print(f"✅ Questions extracted: {result['questions_found']}")
+            print(f"🖼️ Images extracted: {result['images_extracted']}")
+            print(f"📸 Images deployed: {result['deployed_images']}")
+            print(f"💾 Output file: {result['output_file']}")
+        else:
+            error_msg = result.get('error', 'Unknown error') if result else 'Extraction failed'
+            print(f"\n❌ Extraction failed for {job['pdf_filename']}: {error_msg}")
+            all_ok = False
+    
+    if all_ok:
+        print(f"🎯 Web interface ready!")
+    return all_ok
+
+def command_line_extraction(pdf_names, subject=None, year=None, month=None, paper_code=None):
+    """
+    Extract the named PDFs (every PDF in CLI_PDF_DIR when pdf_names is None) without
+    the menu; exam details missing from the command line are prompted for per PDF
+    """
+    base_dir = CLI_PDF_DIR
+    available = list_pdfs(base_dir)
+    if pdf_names is None:
+        pdf_names = available
+    
+    missing = [name for name in pdf_names if name not in available]
+    if missing:
+        print(f"❌ PDF not found in {base_dir}: {', '.join(missing)}")
+        return False
+    if not pdf_names:
+        print(f"❌ No PDF files found in: {base_dir}")
+        return False
+    
+    jobs = []
+    for pdf_name in pdf_names:
+        job = prompt_exam_details(pdf_name, subject, year, month, paper_code)
+        if job is None:
+            return False
+        jobs.append(job)
+    
+    return report_batch(extract_batch(base_dir, jobs))
+
+def interactive_extraction(pdf_files=None):
+    """
+    Interactive CLI extraction with enhanced interface
+    pdf_files: PDF names already listed by the caller (listed here when None)
+    """
     print("\n🎯 Enhanced PDF Question Extractor - Interactive Mode")
-    print("=" * 60)
+    print(_SEP60)
     
     # Check available PDFs
-    base_dir = Path("/Users/wynceaxcel/Apps/axcelscore/pdf-extraction-test")
-    pdf_files = list(base_dir.glob("*.pdf"))
+    base_dir = CLI_PDF_DIR
+    if pdf_files is None:
+        pdf_files = list_pdfs(base_dir)
     
     if not pdf_files:
         print("❌ No PDF files found in pdf-extraction-test directory")
@@ -1437,46 +3027,35 @@ def interactive_extraction():
         return False
     
     print(f"📂 Found {len(pdf_files)} PDF file(s):")
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"   {i}. {pdf_file.name}")
+    for i, pdf_name in enumerate(pdf_files, 1):
+        print(f"   {i}. {pdf_name}")
     
     try:
-        # Select PDF
-        pdf_choice = int(input(f"\nSelect PDF (1-{len(pdf_files)}): ")) - 1
-        if not 0 <= pdf_choice < len(pdf_files):
-            print("❌ Invalid PDF selection")
-            return False
-        
-        selected_pdf = pdf_files[pdf_choice]
-        print(f"✅ Selected: {selected_pdf.name}")
+        # Select one or more PDFs ("1" or "1,3"); nothing to choose when there is only one
+        if len(pdf_files) == 1:
+            selected_pdfs = list(pdf_files)
+            print(f"✅ Auto-selected: {selected_pdfs[0]}")
+        else:
+            selection = input(f"\nSelect PDF (1-{len(pdf_files)}, comma-separated for several): ")
+            selected_pdfs = [pdf_files[i] for i in parse_pdf_selection(selection, len(pdf_files))]
+            print(f"✅ Selected: {', '.join(selected_pdfs)}")
         
         # Get exam details with validation
-        print("\n📋 Enter exam details:")
-        subject = input("Subject (physics/chemistry/biology/etc.): ").strip().lower()
-        year = input("Year (2019-2024): ").strip()
-        month = input("Month (mar/may/oct/jan): ").strip().lower()
-        paper_code = input("Paper code (11/12/13/21/22/23/etc.): ").strip()
-        
-        # Validate inputs
-        if not all([subject, year, month, paper_code]):
-            print("❌ All fields are required")
-            return False
-        
-        if not year.isdigit() or not 2019 <= int(year) <= 2024:
-            print("❌ Year must be between 2019-2024")
-            return False
-        
-        if month not in ['mar', 'may', 'oct', 'jan', 'feb', 'jun', 'nov', 'dec']:
-            print("❌ Invalid month code")
-            return False
+        jobs = []
+        for selected_pdf in selected_pdfs:
+            job = prompt_exam_details(selected_pdf)
+            if job is None:
+                return False
+            jobs.append(job)
         
         # Confirm extraction
         print(f"\n🎯 Ready to extract:")
-        print(f"   📄 PDF: {selected_pdf.name}")
-        print(f"   📚 Subject: {subject}")
-        print(f"   📅 Year: {year}")
-        print(f"   📆 Month: {month}")
-        print(f"   📃 Paper: {paper_code}")
+        for job in jobs:
+            print(f"   📄 PDF: {job['pdf_filename']}")
+            print(f"   📚 Subject: {job['subject']}")
+            print(f"   📅 Year: {job['year']}")
+            print(f"   📆 Month: {job['month']}")
+            print(f"   📃 Paper: {job['paper_code']}")
         
         confirm = input("\nProceed with extraction? (y/n): ").strip().lower()
         if confirm != 'y':
@@ -1485,28 +3064,7 @@ def interactive_extraction():
         
         # Perform extraction
         print("\n🚀 Starting enhanced extraction...")
-        extractor = EnhancedPDFExtractor(base_dir=str(selected_pdf.parent))
-        
-        result = extractor.extract_questions_for_web_interface(
-            pdf_filename=selected_pdf.name,
-            subject=subject,
-            year=year,
-            month=month,
-            paper_code=paper_code
-        )
-        
-        if result and result.get('success'):
-            print(f"\n🎉 SUCCESS!")
-            print(f"✅ Questions extracted: {result['questions_found']}")
-            print(f"🖼️ Images extracted: {result['images_extracted']}")
-            print(f"📸 Images deployed: {result['deployed_images']}")
-            print(f"💾 Output file: {result['output_file']}")
-            print(f"🎯 Web interface ready!")
-            return True
-        else:
-            error_msg = result.get('error', 'Unknown error') if result else 'Extraction failed'
-            print(f"\n❌ Extraction failed: {error_msg}")
-            return False
+        return report_batch(extract_batch(base_dir, jobs))
             
     except (ValueError, KeyboardInterrupt) as e:
         print(f"\n❌ Error: {e}")
@@ -1519,7 +3077,7 @@ def interactive_extraction():
 def test_extraction():
     """Test extraction with sample parameters for development"""
     print("🧪 Test extraction mode")
-    print("=" * 40)
+    print(_SEP40)
     
     # Test parameters - modify as needed
     test_params = {
@@ -1534,16 +3092,16 @@ def test_extraction():
     for key, value in test_params.items():
         print(f"   {key}: {value}")
     
-    base_dir = "/Users/wynceaxcel/Apps/axcelscore/pdf-extraction-test"
-    pdf_path = Path(base_dir) / test_params['pdf_filename']
+    base_dir = CLI_PDF_DIR
+    pdf_path = os.path.join(base_dir, test_params['pdf_filename'])
     
-    if not pdf_path.exists():
+    if not os.path.isfile(pdf_path):
         print(f"❌ Test PDF not found: {pdf_path}")
         print("   Please update test_params with an existing PDF filename")
         return False
     
     try:
-        extractor = EnhancedPDFExtractor(base_dir=base_dir)
+        extractor = _get_extractor(base_dir)
         
         result = extractor.extract_questions_for_web_interface(
             pdf_filename=test_params['pdf_filename'],
@@ -1555,6 +3113,8 @@ def test_extraction():
         
         if result and result.get('success'):
             print("✅ Test extraction successful")
+            if result.get('cached'):
+                print("   ⚡ PDF unchanged - reused the cached extraction")
             print(f"   Questions found: {result['questions_found']}")
             print(f"   Images extracted: {result['images_extracted']}")
             print(f"   Images deployed: {result['deployed_images']}")
@@ -1569,136 +3129,188 @@ def test_extraction():
         logger.error("Test extraction error:", exc_info=True)
         return False
 
+PREFERRED_WEB_PORT = 5555
+
+def _new_server_socket():
+    """TCP socket that can rebind a port still in TIME_WAIT after a quick restart"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    return sock
+
+def bind_web_socket(preferred=PREFERRED_WEB_PORT):
+    """
+    Return a socket bound on all interfaces to the preferred port if it is free,
+    otherwise to a free port chosen by the kernel (one bind to port 0 instead of
+    probing a list of candidates). The caller owns (and must close or serve) it
+    """
+    sock = _new_server_socket()
+    try:
+        sock.bind(('0.0.0.0', preferred))
+        return sock
+    except OSError:
+        sock.close()
+    
+    print(f"⚠️ Port {preferred} is busy, asking the OS for a free port...")
+    sock = _new_server_socket()
+    try:
+        sock.bind(('0.0.0.0', 0))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+WEB_SERVER_BANNER = """\
+🎯 Starting Enhanced PDF Question Extractor Web Server v2.0
+""" + _SEP70 + """
+✅ Multi-strategy question detection
+✅ High-quality image extraction (2x resolution)
+✅ Standardized folder structure (images/)
+✅ Web interface ready
+✅ Single images folder (GitHub optimized)
+""" + _SEP70 + """
+📂 Base directory: {base_dir}
+📁 Upload directory: {upload_dir}
+🧪 PDF extraction test: {test_dir}
+""" + _SEP70 + "\n"
+
 def start_web_server():
     """Start the enhanced web interface server"""
-    if not WEB_MODE:
-        print("❌ Flask not installed. Install with: pip install flask flask-cors")
+    app = create_web_app()
+    if app is None:
+        print("❌ Flask not installed. Install with: pip install flask flask-cors waitress")
         return
     
-    print("🎯 Starting Enhanced PDF Question Extractor Web Server v2.0")
-    print("=" * 70)
-    print("✅ Multi-strategy question detection")
-    print("✅ High-quality image extraction (2x resolution)")
-    print("✅ Standardized folder structure (images/)")
-    print("✅ Web interface ready")
-    print("✅ Single images folder (GitHub optimized)")
-    print("=" * 70)
-    print(f"📂 Base directory: {BASE_DIR}")
-    print(f"📁 Upload directory: {UPLOAD_DIR}")
-    print(f"🧪 PDF extraction test: {PDF_EXTRACTION_TEST_DIR}")
-    print("=" * 70)
-    
-    # Try multiple ports
-    ports = [5555, 8080, 3000, 5001, 8000, 5000]
-    
-    for port in ports:
-        try:
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.bind(('localhost', port))
-            sock.close()
-            
-            print(f"🌐 Web interface available at: http://localhost:{port}")
-            print("📱 CLI mode still available: python extractor.py")
-            print(f"\n🚀 Starting enhanced server on port {port}...")
-            
-            app.run(debug=False, host='0.0.0.0', port=port)
-            return
-            
-        except OSError:
-            print(f"⚠️ Port {port} is busy, trying next...")
-            continue
+    sys.stdout.write(WEB_SERVER_BANNER.format(
+        base_dir=BASE_DIR, upload_dir=UPLOAD_DIR, test_dir=PDF_EXTRACTION_TEST_DIR
+    ))
     
-    print("❌ All ports are busy. Common solutions:")
-    print("   • Free up port 5000: lsof -ti:5000 | xargs kill -9")
-    print("   • Disable AirPlay Receiver: System Preferences → General → AirDrop & Handoff")
+    try:
+        sock = bind_web_socket()
+    except OSError as e:
+        print(f"❌ Could not find a free port: {e}")
+        return
+    port = sock.getsockname()[1]
+    
+    sys.stdout.write(
+        f"🌐 Web interface available at: http://localhost:{port}\n"
+        "📱 CLI mode still available: python extractor.py\n"
+        f"\n🚀 Starting enhanced server on port {port}...\n"
+    )
+    
+    # Prefer waitress over Werkzeug's development server when it is installed
+    try:
+        from waitress import serve
+    except ImportError:
+        print("💡 Using Flask's development server (pip install waitress for production)")
+        # Werkzeug binds its own socket, so release the reserved port just before
+        sock.close()
+        # threaded: a long upload/extraction must not block other requests
+        app.run(debug=False, host='0.0.0.0', port=port, threaded=True)
+        return
+    
+    # waitress listens on the socket reserved above, so no other process can take the port
+    serve(app, sockets=[sock], threads=max(4, os.cpu_count() or 1))
+
+HELP_TEXT = """\
+🎯 Enhanced PDF Question Extractor v2.0 - Help
+""" + _SEP60 + """
+
+📖 USAGE:
+  python extractor.py              # Interactive CLI mode
+  python extractor.py --web        # Web interface
+  python extractor.py --test       # Test extraction
+  python extractor.py --pdf FILE --subject physics --year 2023 --month oct --paper 13
+                                   # Extract without prompts (--pdf repeatable)
+  python extractor.py --all        # Extract every PDF (asks for missing details)
+  python extractor.py --help       # This help
+
+🎉 NEW FEATURES (v2.0):
+  ✅ Multi-strategy question detection (7 strategies)
+  ✅ Enhanced image quality (2x resolution + optimization)
+  ✅ Standardized folder structure (images/)
+  ✅ Improved web interface with progress tracking
+  ✅ Comprehensive error handling and logging
+  ✅ Single images folder structure
+
+🔧 DETECTION STRATEGIES:
+  1. Standalone numbers at left margin (most reliable)
+  2. Numbers followed by capital letters/words
+  3. Bold numbers near left margin
+  4. Two-digit numbers at left margin
+  5. Numbers with trailing dots
+  6. Numbers with parentheses
+  7. Large font numbers (likely questions)
+
+📁 FOLDER STRUCTURE:
+  question_banks/
+  └── subject_year_month_paper/
+      ├── solutions.json
+      ├── metadata.json
+      └── images/           # Primary folder
+
+🌐 WEB INTERFACE:
+  • Drag & drop PDF upload
+  • Form validation
+  • Real-time progress tracking
+  • Detailed success/error feedback
+
+🛠 TROUBLESHOOTING:
+  • No questions found: PDF may have non-standard formatting
+  • Web interface not loading: Check Flask installation
+  • Images not showing: Verify folder permissions
+  • Port conflicts: Try different ports or kill existing processes
+
+📞 SUPPORT:
+  • Check logs for detailed error information
+  • Ensure PDF files are in pdf-extraction-test/ directory
+  • Verify all form fields are completed in web interface
+"""
 
 def show_help():
     """Display comprehensive help information"""
-    print("🎯 Enhanced PDF Question Extractor v2.0 - Help")
-    print("=" * 60)
-    print("\n📖 USAGE:")
-    print("  python extractor.py              # Interactive CLI mode")
-    print("  python extractor.py --web        # Web interface")
-    print("  python extractor.py --test       # Test extraction")
-    print("  python extractor.py --help       # This help")
-    
-    print("\n🎉 NEW FEATURES (v2.0):")
-    print("  ✅ Multi-strategy question detection (7 strategies)")
-    print("  ✅ Enhanced image quality (2x resolution + optimization)")
-    print("  ✅ Standardized folder structure (images/)")
-    print("  ✅ Improved web interface with progress tracking")
-    print("  ✅ Comprehensive error handling and logging")
-    print("  ✅ Single images folder structure")
-    
-    print("\n🔧 DETECTION STRATEGIES:")
-    print("  1. Standalone numbers at left margin (most reliable)")
-    print("  2. Numbers followed by capital letters/words")
-    print("  3. Bold numbers near left margin")
-    print("  4. Two-digit numbers at left margin")
-    print("  5. Numbers with trailing dots")
-    print("  6. Numbers with parentheses")
-    print("  7. Large font numbers (likely questions)")
-    
-    print("\n📁 FOLDER STRUCTURE:")
-    print("  question_banks/")
-    print("  └── subject_year_month_paper/")
-    print("      ├── solutions.json")
-    print("      ├── metadata.json")
-    print("      └── images/           # Primary folder")
-    
-    print("\n🌐 WEB INTERFACE:")
-    print("  • Drag & drop PDF upload")
-    print("  • Form validation")
-    print("  • Real-time progress tracking")
-    print("  • Detailed success/error feedback")
-    
-    print("\n🛠 TROUBLESHOOTING:")
-    print("  • No questions found: PDF may have non-standard formatting")
-    print("  • Web interface not loading: Check Flask installation")
-    print("  • Images not showing: Verify folder permissions")
-    print("  • Port conflicts: Try different ports or kill existing processes")
-    
-    print("\n📞 SUPPORT:")
-    print("  • Check logs for detailed error information")
-    print("  • Ensure PDF files are in pdf-extraction-test/ directory")
-    print("  • Verify all form fields are completed in web interface")
+    sys.stdout.write(HELP_TEXT)
+
+MAIN_BANNER = """\
+🎯 Enhanced PDF Question Extractor v2.0
+Multi-strategy detection • High-quality images • Web interface ready
+""" + _SEP70 + "\n"
+
+MAIN_MENU = """
+🎯 Choose an option:
+   1. Interactive extraction (CLI)
+   2. Start web interface
+   3. Test extraction
+   4. Show help
+   5. Exit
+"""
 
 def main():
     """
     Main function with enhanced menu system
     """
-    print("🎯 Enhanced PDF Question Extractor v2.0")
-    print("Multi-strategy detection • High-quality images • Web interface ready")
-    print("=" * 70)
-    
     # Check for PDFs
-    base_dir = Path("/Users/wynceaxcel/Apps/axcelscore/pdf-extraction-test")
-    pdf_files = list(base_dir.glob("*.pdf"))
+    base_dir = CLI_PDF_DIR
+    pdf_files = list_pdfs(base_dir)
     
+    # Build the whole start screen and write it once
+    screen = [MAIN_BANNER]
     if pdf_files:
-        print(f"📂 Found {len(pdf_files)} PDF file(s) in {base_dir.name}/:")
-        for i, pdf_file in enumerate(pdf_files[:5], 1):  # Show max 5
-            print(f"   {i}. {pdf_file.name}")
+        screen.append(f"📂 Found {len(pdf_files)} PDF file(s) in {base_dir.name}/:\n")
+        screen.extend(f"   {i}. {pdf_name}\n" for i, pdf_name in enumerate(pdf_files[:5], 1))  # Show max 5
         if len(pdf_files) > 5:
-            print(f"   ... and {len(pdf_files) - 5} more")
+            screen.append(f"   ... and {len(pdf_files) - 5} more\n")
     else:
-        print(f"📂 No PDF files found in {base_dir.name}/")
-        print(f"   Place PDF files in: {base_dir}")
-    
-    print("\n🎯 Choose an option:")
-    print("   1. Interactive extraction (CLI)")
-    print("   2. Start web interface")
-    print("   3. Test extraction")
-    print("   4. Show help")
-    print("   5. Exit")
+        screen.append(f"📂 No PDF files found in {base_dir.name}/\n")
+        screen.append(f"   Place PDF files in: {base_dir}\n")
+    screen.append(MAIN_MENU)
+    sys.stdout.write("".join(screen))
     
     try:
         choice = input("\nEnter choice (1-5): ").strip()
         
         if choice == "1":
             if pdf_files:
-                success = interactive_extraction()
+                success = interactive_extraction(pdf_files)
                 if success:
                     print("\n🎉 Extraction completed successfully!")
                 else:
@@ -1736,41 +3348,57 @@ def main():
 # ENTRY POINT
 # ============================================================================
 
+def build_arg_parser():
+    """Command-line options (help is printed by show_help, not argparse)"""
+    parser = argparse.ArgumentParser(prog="extractor.py", add_help=False)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--web", action="store_true")
+    mode.add_argument("--test", action="store_true")
+    mode.add_argument("-h", "--help", action="store_true")
+    mode.add_argument("-i", "--interactive", action="store_true")
+    
+    # Scripted extraction: any missing exam detail is still prompted for
+    parser.add_argument("--pdf", action="append", metavar="FILENAME")
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--subject")
+    parser.add_argument("--year")
+    parser.add_argument("--month")
+    parser.add_argument("--paper", dest="paper_code")
+    return parser
+
 if __name__ == "__main__":
-    import sys
-    
-    # Configure logging for command line usage
-    if len(sys.argv) > 1:
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('extractor.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+    parser = build_arg_parser()
+    args, unknown = parser.parse_known_args()
+    
+    if unknown:
+        print(f"❌ Unknown option: {unknown[0]}")
+        print("Use --help for usage information")
+        sys.exit(1)
     
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
+    if args.web:
+        start_web_server()
+        
+    elif args.test:
+        success = test_extraction()
+        sys.exit(0 if success else 1)
+        
+    elif args.help:
+        show_help()
+        
+    elif args.pdf or args.all:
+        success = command_line_extraction(
+            None if args.all else args.pdf,
+            subject=args.subject,
+            year=args.year,
+            month=args.month,
+            paper_code=args.paper_code
+        )
+        sys.exit(0 if success else 1)
+        
+    elif args.interactive:
+        success = interactive_extraction()
+        sys.exit(0 if success else 1)
         
-        if arg == "--web":
-            start_web_server()
-            
-        elif arg == "--test":
-            success = test_extraction()
-            sys.exit(0 if success else 1)
-            
-        elif arg == "--help" or arg == "-h":
-            show_help()
-            
-        elif arg == "--interactive" or arg == "-i":
-            success = interactive_extraction()
-            sys.exit(0 if success else 1)
-            
-        else:
-            print(f"❌ Unknown option: {sys.argv[1]}")
-            print("Use --help for usage information")
-            sys.exit(1)
     else:
         # Default: Run main menu
         main()
\ No newline at end of file
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Gunicorn settings for the PDF extractor web interface
+
+Run from the backend directory:
+    gunicorn -c gunicorn_conf.py "extractor:create_web_app()"
+"""
+
+import multiprocessing
+
+bind = "0.0.0.0:5555"
+
+# One worker process: extractions share a single images folder and chunked-upload
+# state lives in memory, so both must stay in one process. Concurrency comes from
+# threads (uploads, downloads, /status) - extraction itself runs on the extractor's
+# own worker process and page-rendering pool, which use the remaining cores
+workers = 1
+worker_class = "gthread"
+threads = 2 * multiprocessing.cpu_count() + 1
+
+# Build the app, page assets and precompressed bodies once before forking
+preload_app = True
+
+# No max_requests recycling: with a single worker a restart would kill running
+# extractions, open event streams and in-memory chunked uploads
+
+# Large uploads and long extractions (the event-stream route stays open meanwhile)
+timeout = 600
+graceful_timeout = 30
+
+# Zero-copy file responses (images) where the platform supports sendfile(2)
+sendfile = True
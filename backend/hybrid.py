@@ -17,30 +17,141 @@ Features:
 import os
 import sys
 import json
-import base64
+import gzip
 from pathlib import Path
 from datetime import datetime
 import traceback
 import re
-from flask import Flask, request, jsonify, send_from_directory, render_template_string, send_file
+from flask import Flask, Blueprint, Response, current_app, request, jsonify, make_response, send_from_directory, render_template_string, send_file
 from werkzeug.utils import secure_filename
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from PIL import Image
-import io
 import hashlib
+import threading
+import time
+import atexit
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Optional fast JSON encoder/decoder (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Cross-process file locks (POSIX); without them solutions.json rewrites rely on the merge alone
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Optional Brotli compression for pages and API responses (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+def write_json_file(path, data):
+    """Write data as indented JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def read_json_file(path):
+    """Read a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
 
 # Configuration
 QUESTION_BANKS_DIR = Path("../frontend/public/question_banks")  # Go up one level from backend folder
 QUESTION_BANKS_DIR.mkdir(exist_ok=True)
 CONFIDENCE_THRESHOLD = 0.91  # 91% quality threshold
+HYBRID_PORT = 5006
+PROGRESS_KEEPALIVE = 15  # Seconds between keep-alive comments on an idle progress stream
+PROGRESS_STREAM_LIFETIME = 120  # Seconds before a progress stream ends so its server thread is freed
+PROGRESS_RETRY_MS = 5000  # Browser reconnect delay after a stream ends (EventSource retry:)
+SOLUTIONS_FLUSH_DELAY = 5.0  # Seconds to coalesce solutions.json rewrites (saves are journaled meanwhile)
+SOLUTIONS_JOURNAL_LIMIT = 200  # Journaled saves that trigger an immediate rewrite
+SOLUTION_CACHE_DIR = Path(__file__).parent / ".solution_cache"  # Not under the public question banks
+SOLUTION_CACHE_TTL = 30 * 86400  # Seconds a cached solution stays usable
+
+# Compiled/built once at import
+_YEAR_RE = re.compile(r'(\d{4})')
+_IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp'})
+IMAGE_MAX_AGE = 7 * 86400  # Browser cache lifetime for question images
+THUMB_MAX_SIZE = (800, 800)  # Grid thumbnails; originals load only on "Full Size"
+THUMB_DIR_NAME = ".thumbs"
+COMPRESS_MIN_SIZE = 512  # Smaller bodies aren't worth compressing
+_COMPRESSIBLE_MIMETYPES = frozenset({'text/html', 'text/plain', 'text/css', 'text/javascript', 'application/json'})
 
 # Create Flask app
 app = Flask(__name__)
 
-def get_claude_prompt_template(subject, question_num):
-    """Generate enhanced Claude prompt template"""
-    return f"""Please analyze this {subject.lower()} question image carefully and provide a complete solution in JSON format. Double check your reading of all values before proceeding as accuracy for exam is more important than speed. Before applying any physics principles, carefully examine the exact geometry and positioning shown in the diagram, ensuring distances are measured from correct reference points and segments are interpreted as additive or separate measurements as appropriate. Before applying any physics principles, carefully examine the exact geometry and positioning shown in the diagram.
+if ORJSON_AVAILABLE:
+    from flask.json.provider import DefaultJSONProvider
+    
+    class ORJSONProvider(DefaultJSONProvider):
+        """request.get_json()/jsonify through orjson (compact output)"""
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = ORJSONProvider(app)
+
+# Solver page CSS/JS, served as content-hashed files browsers may cache forever (a
+# changed asset gets a new URL), plus the page's prompt text and progress stream. main.py
+# serves the same page, so it registers this blueprint too (and sets
+# app.extensions['hybrid_solver'] to the ScalableAISolverManager the stream reports on)
+hybrid_assets = Blueprint('hybrid_assets', __name__)
+_HYBRID_ASSETS = {}  # "hybrid.<hash>.css" → (mimetype, body, etag, [(encoding, body, etag), ...])
+
+def register_hybrid_asset(name, extension, text, mimetype):
+    """Add a long-cacheable asset and return its content-hashed URL"""
+    body = text.encode('utf-8')
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    filename = f"{name}.{etag[:12]}.{extension}"
+    
+    # Compressed once at maximum level, best first
+    encoded = [('gzip', gzip.compress(body, compresslevel=9, mtime=0), f"{etag}-gzip")]
+    if BROTLI_AVAILABLE:
+        encoded.insert(0, ('br', brotli.compress(body, quality=11), f"{etag}-br"))
+    _HYBRID_ASSETS[filename] = (mimetype, body, etag, encoded)
+    return f"/hybrid-assets/{filename}"
+
+@hybrid_assets.route('/hybrid-assets/<filename>')
+def serve_hybrid_asset(filename):
+    asset = _HYBRID_ASSETS.get(filename)
+    if asset is None:
+        return "Asset not found", 404
+    mimetype, body, etag, encoded = asset
+    content_encoding = None
+    for encoding, encoded_body, encoded_etag in encoded:
+        if request.accept_encodings[encoding] > 0:
+            body, etag, content_encoding = encoded_body, encoded_etag, encoding
+            break
+    
+    response = make_response(body)
+    response.mimetype = mimetype
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response.make_conditional(request)
+
+@lru_cache(maxsize=16)
+def _prompt_for_subject(subject_lc):
+    """Claude prompt text for one lowercase subject, built once per subject"""
+    return f"""Please analyze this {subject_lc} question image carefully and provide a complete solution in JSON format. Double check your reading of all values before proceeding as accuracy for exam is more important than speed. Before applying any physics principles, carefully examine the exact geometry and positioning shown in the diagram, ensuring distances are measured from correct reference points and segments are interpreted as additive or separate measurements as appropriate. Before applying any physics principles, carefully examine the exact geometry and positioning shown in the diagram.
 
 Required JSON structure:
 {{
@@ -64,29 +175,58 @@ Required JSON structure:
     "Step 2: Description of second step",
     "Continue as needed..."
   ],
-  "topic": "Specific {subject.lower()} topic",
+  "topic": "Specific {subject_lc} topic",
   "difficulty": "easy/medium/hard",
   "confidence_score": 0.95
 }}
 
 Please be thorough and accurate in your analysis."""
 
+def get_claude_prompt_template(subject, question_num):
+    """Generate enhanced Claude prompt template (the text does not depend on question_num)"""
+    return _prompt_for_subject(subject.lower())
+
 def get_css_styles():
     """Colorful Gen Alpha design with 2-column layout"""
     return """
 * { box-sizing: border-box; }
 
+/* Gradients shared by several rules */
+:root {
+    --grad-hero: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 50%, #45b7d1 100%);
+    --grad-primary: linear-gradient(135deg, #667eea, #764ba2);
+    --grad-success: linear-gradient(135deg, #56ab2f, #a8e6cf);
+    --grad-warning: linear-gradient(135deg, #ffd700, #ffb347);
+    --grad-info: linear-gradient(135deg, #00c6ff, #0072ff);
+}
+
 body { 
     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
     margin: 0; 
     padding: 1rem; 
     background: linear-gradient(135deg, #667eea 0%, #764ba2 25%, #f093fb 50%, #f5576c 75%, #4facfe 100%); 
     background-size: 400% 400%;
-    animation: gradientShift 8s ease infinite;
     line-height: 1.6;
     min-height: 100vh;
 }
 
+/* Decorative animations: only when motion is welcome, paused while hidden/off-screen */
+@media (prefers-reduced-motion: no-preference) {
+    body {
+        animation: gradientShift 8s ease infinite;
+        animation-play-state: var(--anim, running);
+    }
+    
+    .header::before {
+        animation: shine 3s infinite;
+        animation-play-state: var(--anim, running);
+    }
+    
+    .header.offscreen::before {
+        animation-play-state: paused;
+    }
+}
+
 @keyframes gradientShift {
     0% { background-position: 0% 50%; }
     50% { background-position: 100% 50%; }
@@ -104,7 +244,7 @@ body {
 }
 
 .header { 
-    background: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 50%, #45b7d1 100%); 
+    background: var(--grad-hero); 
     color: white; 
     padding: 3rem 2rem; 
     text-align: center; 
@@ -120,7 +260,6 @@ body {
     width: 200%;
     height: 200%;
     background: linear-gradient(45deg, transparent 30%, rgba(255,255,255,0.1) 50%, transparent 70%);
-    animation: shine 3s infinite;
 }
 
 @keyframes shine {
@@ -151,7 +290,7 @@ body {
 }
 
 .progress-section { 
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+    background: var(--grad-primary); 
     padding: 2rem; 
     color: white;
 }
@@ -165,7 +304,7 @@ body {
 
 .progress-bar {
     height: 20px;
-    background: linear-gradient(135deg, #56ab2f, #a8e6cf);
+    background: var(--grad-success);
     border-radius: 20px;
     display: flex;
     align-items: center;
@@ -264,10 +403,10 @@ body {
     box-shadow: 0 15px 35px rgba(0,0,0,0.2);
 }
 
-.batch-btn { background: linear-gradient(135deg, #667eea, #764ba2); color: white; }
-.export-btn { background: linear-gradient(135deg, #00c6ff, #0072ff); color: white; }
+.batch-btn { background: var(--grad-primary); color: white; }
+.export-btn { background: var(--grad-info); color: white; }
 .claude-btn { background: linear-gradient(135deg, #ff6b6b, #4ecdc4); color: white; }
-.qc-btn { background: linear-gradient(135deg, #ffd700, #ffb347); color: #333; }
+.qc-btn { background: var(--grad-warning); color: #333; }
 
 .questions-grid { 
     padding: 2rem; 
@@ -275,7 +414,7 @@ body {
 }
 
 .qc-filter-section {
-    background: linear-gradient(135deg, #ffd700, #ffb347);
+    background: var(--grad-warning);
     padding: 1.5rem 2rem;
     display: flex;
     gap: 1rem;
@@ -317,13 +456,19 @@ body {
     transition: all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275);
 }
 
+.card-skeleton {
+    min-height: 240px;
+    border-radius: 15px;
+    background: linear-gradient(90deg, rgba(0,0,0,0.04), rgba(0,0,0,0.08), rgba(0,0,0,0.04));
+}
+
 .question-card:hover {
     transform: translateY(-8px);
     box-shadow: 0 25px 50px rgba(0,0,0,0.12), 0 10px 25px rgba(0,0,0,0.08);
 }
 
 .question-header { 
-    background: linear-gradient(135deg, #ff6b6b 0%, #4ecdc4 50%, #45b7d1 100%); 
+    background: var(--grad-hero); 
     padding: 1.5rem 2rem; 
     display: flex; 
     justify-content: space-between; 
@@ -356,7 +501,7 @@ body {
 }
 
 .status-indicator.solved { 
-    background: linear-gradient(135deg, #56ab2f, #a8e6cf); 
+    background: var(--grad-success); 
     color: white; 
     box-shadow: 0 6px 20px rgba(86, 171, 47, 0.3);
 }
@@ -368,13 +513,13 @@ body {
 }
 
 .status-indicator.reviewed { 
-    background: linear-gradient(135deg, #ffd700, #ffb347); 
+    background: var(--grad-warning); 
     color: #333; 
     box-shadow: 0 6px 20px rgba(255, 215, 0, 0.3);
 }
 
 .status-indicator.pending { 
-    background: linear-gradient(135deg, #667eea, #764ba2); 
+    background: var(--grad-primary); 
     color: white; 
     box-shadow: 0 6px 20px rgba(102, 126, 234, 0.3);
 }
@@ -394,6 +539,7 @@ body {
 
 .question-image { 
     width: 100%; 
+    height: auto; 
     max-height: 500px; 
     object-fit: contain; 
     border: none; 
@@ -421,7 +567,7 @@ body {
     border: none; 
     border-radius: 25px; 
     cursor: pointer; 
-    background: linear-gradient(135deg, #667eea, #764ba2); 
+    background: var(--grad-primary); 
     color: white; 
     font-weight: 700;
     text-transform: uppercase;
@@ -486,7 +632,7 @@ body {
     font-family: 'Monaco', 'Menlo', monospace; 
     font-size: 0.9rem; 
     resize: vertical; 
-    background: linear-gradient(white, white) padding-box, linear-gradient(135deg, #667eea, #764ba2) border-box;
+    background: linear-gradient(white, white) padding-box, var(--grad-primary) border-box;
     transition: all 0.3s ease;
     box-shadow: 0 8px 25px rgba(0,0,0,0.08);
 }
@@ -506,13 +652,13 @@ body {
 }
 
 .save-btn { 
-    background: linear-gradient(135deg, #56ab2f, #a8e6cf); 
+    background: var(--grad-success); 
     color: white; 
     box-shadow: 0 6px 20px rgba(86, 171, 47, 0.3);
 }
 
 .validate-btn { 
-    background: linear-gradient(135deg, #00c6ff, #0072ff); 
+    background: var(--grad-info); 
     color: white; 
     box-shadow: 0 6px 20px rgba(0, 198, 255, 0.3);
 }
@@ -524,13 +670,13 @@ body {
 }
 
 .review-btn { 
-    background: linear-gradient(135deg, #ffd700, #ffb347); 
+    background: var(--grad-warning); 
     color: #333; 
     box-shadow: 0 6px 20px rgba(255, 215, 0, 0.3);
 }
 
 .unflag-btn { 
-    background: linear-gradient(135deg, #56ab2f, #a8e6cf); 
+    background: var(--grad-success); 
     color: white; 
     box-shadow: 0 6px 20px rgba(86, 171, 47, 0.3);
 }
@@ -571,8 +717,39 @@ body {
 .notification.warning { background: rgba(255, 193, 7, 0.9); color: #333; }
 .notification.info { background: rgba(23, 162, 184, 0.9); color: white; }
 
+.confirm-overlay {
+    position: fixed;
+    inset: 0;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    background: rgba(0, 0, 0, 0.35);
+    z-index: 1001;
+}
+
+.confirm-box {
+    background: white;
+    border-radius: 16px;
+    padding: 1.5rem 2rem;
+    max-width: 420px;
+    box-shadow: 0 20px 40px rgba(0,0,0,0.2);
+}
+
+.confirm-box .qc-controls {
+    justify-content: flex-end;
+    margin-top: 1rem;
+}
+
 .hidden { display: none !important; }
 
+/* Filters: the body's data-filter hides every card whose data-status differs */
+body[data-filter="flagged"] .question-card:not([data-status="flagged"]),
+body[data-filter="reviewed"] .question-card:not([data-status="reviewed"]),
+body[data-filter="solved"] .question-card:not([data-status="solved"]),
+body[data-filter="pending"] .question-card:not([data-status="pending"]) {
+    display: none;
+}
+
 @media (max-width: 768px) {
     .question-content { 
         grid-template-columns: 1fr; 
@@ -591,326 +768,359 @@ body {
 }
 """
 
-def get_javascript_template(paper_folder, total_questions, subject):
-    """Fixed JavaScript with proper button event handling"""
-    return f"""
-<script>
-// Global variables
-const paperFolder = '{paper_folder}';
-const subject = '{subject}';
-const totalQuestions = {total_questions};
+# Page script shared by every paper; only paperFolder/subject/totalQuestions differ,
+# and get_javascript_template sets those in a small inline script before loading it
+_HYBRID_JS = """
 let currentFilter = 'all';
 
+// Per-card elements (solution-N, status-N, ...) looked up once; controls that are
+// still in their <template> aren't cached until the card has been hydrated
+const cardElementCache = new Map();
+
+function cardElement(prefix, questionNum) {
+    const id = `${prefix}-${questionNum}`;
+    let element = cardElementCache.get(id);
+    if (!element || !element.isConnected) {
+        element = document.getElementById(id);
+        if (element) cardElementCache.set(id, element);
+    }
+    return element;
+}
+
 // Utility functions
-function getPromptTemplate(questionNum) {{
-    return `Please analyze this ${{subject.toLowerCase()}} question image carefully and provide a complete solution in JSON format. Double check your reading of all values before proceeding as accuracy for exam is more important than speed. Before applying any physics principles, carefully examine the exact geometry and positioning shown in the diagram, ensuring distances are measured from correct reference points and segments are interpreted as additive or separate measurements as appropriate.
+// The prompt is the same for every question: fetched from /api/prompt once (on first
+// use, or when the browser is idle) and kept for the rest of the session
+let promptText = null;
+let promptRequest = null;
+
+function loadPromptTemplate() {
+    if (!promptRequest) {
+        promptRequest = fetch(`/api/prompt?subject=${encodeURIComponent(subject)}`)
+            .then(response => {
+                if (!response.ok) throw new Error(`Prompt request failed: HTTP ${response.status}`);
+                return response.text();
+            })
+            .then(text => (promptText = text))
+            .catch(err => {
+                promptRequest = null;  // allow a retry on the next click
+                throw err;
+            });
+    }
+    return promptRequest;
+}
 
-Required JSON structure:
-{{
-  "question_text": "Extract the complete question text exactly as shown",
-  "options": {{
-    "A": "Complete text for option A",
-    "B": "Complete text for option B", 
-    "C": "Complete text for option C",
-    "D": "Complete text for option D"
-  }},
-  "correct_answer": "A/B/C/D (single letter only)",
-  "simple_answer": "Brief but clear explanation of the correct answer",
-  "detailed_explanation": {{
-    "approach": "Method or principle used",
-    "calculation": "Key calculations if applicable", 
-    "reasoning": "Logical thought process",
-    "conclusion": "Why this answer is correct"
-  }},
-  "calculation_steps": [
-    "Step 1: Description of first step",
-    "Step 2: Description of second step",
-    "Continue as needed..."
-  ],
-  "topic": "Specific ${{subject.toLowerCase()}} topic",
-  "difficulty": "easy/medium/hard",
-  "confidence_score": 0.95
-}}
+async function getPromptTemplate(questionNum) {
+    return promptText !== null ? promptText : loadPromptTemplate();
+}
 
-Please be thorough and accurate in your analysis.`;
-}}
+(window.requestIdleCallback || setTimeout)(() => loadPromptTemplate().catch(() => {}));
 
-function showNotification(message, type = 'info') {{
+function showNotification(message, type = 'info') {
     // Remove existing notifications
     const existing = document.querySelectorAll('.notification');
     existing.forEach(n => n.remove());
     
     // Create new notification
     const notification = document.createElement('div');
-    notification.className = `notification ${{type}}`;
+    notification.className = `notification ${type}`;
     notification.textContent = message;
     document.body.appendChild(notification);
     
     // Auto-remove after 4 seconds
-    setTimeout(() => {{
-        if (notification.parentElement) {{
+    setTimeout(() => {
+        if (notification.parentElement) {
             notification.remove();
-        }}
-    }}, 4000);
-}}
+        }
+    }, 4000);
+}
+
+// In-page confirmation: resolves true/false without blocking the page like confirm()
+function confirmAsync(message) {
+    return new Promise(resolve => {
+        const overlay = document.createElement('div');
+        overlay.className = 'confirm-overlay';
+        overlay.innerHTML = `
+            <div class="confirm-box" role="dialog" aria-modal="true">
+                <p></p>
+                <div class="qc-controls">
+                    <button class="btn-small clear-btn" data-answer="no">Cancel</button>
+                    <button class="btn-small save-btn" data-answer="yes">OK</button>
+                </div>
+            </div>`;
+        overlay.querySelector('p').textContent = message;
+        
+        const close = answer => {
+            overlay.remove();
+            document.removeEventListener('keydown', onKey);
+            resolve(answer);
+        };
+        const onKey = e => {
+            if (e.key === 'Escape') close(false);
+            if (e.key === 'Enter') close(true);
+        };
+        overlay.addEventListener('click', e => {
+            const button = e.target.closest('[data-answer]');
+            if (button) close(button.dataset.answer === 'yes');
+            else if (e.target === overlay) close(false);
+        });
+        document.addEventListener('keydown', onKey);
+        
+        document.body.appendChild(overlay);
+        overlay.querySelector('[data-answer="yes"]').focus();
+    });
+}
 
 // Global function declarations (hoisted)
-window.copyPrompt = function(questionNum) {{
-    console.log(`Copy prompt called for question ${{questionNum}}`);
-    try {{
-        const prompt = getPromptTemplate(questionNum);
+window.copyPrompt = async function(questionNum) {
+    try {
+        const prompt = await getPromptTemplate(questionNum);
         
         // Use modern clipboard API if available
-        if (navigator.clipboard && window.isSecureContext) {{
-            navigator.clipboard.writeText(prompt).then(() => {{
-                showNotification(`Prompt for Question ${{questionNum}} copied!`, 'success');
-            }}).catch(err => {{
+        if (navigator.clipboard && window.isSecureContext) {
+            navigator.clipboard.writeText(prompt).then(() => {
+                showNotification(`Prompt for Question ${questionNum} copied!`, 'success');
+            }).catch(err => {
                 console.error('Clipboard API failed:', err);
                 fallbackCopy(prompt);
-            }});
-        }} else {{
+            });
+        } else {
             fallbackCopy(prompt);
-        }}
-    }} catch (e) {{
+        }
+    } catch (e) {
         console.error('Copy prompt error:', e);
         showNotification('Error copying prompt', 'error');
-    }}
-}};
+    }
+};
 
-window.togglePrompt = function(questionNum) {{
-    console.log(`Toggle prompt called for question ${{questionNum}}`);
-    try {{
-        const display = document.getElementById(`prompt-display-${{questionNum}}`);
-        const textDiv = document.getElementById(`prompt-text-${{questionNum}}`);
+window.togglePrompt = async function(questionNum) {
+    try {
+        hydrateCard(cardElement('question', questionNum));
+        const display = cardElement('prompt-display', questionNum);
+        const textDiv = cardElement('prompt-text', questionNum);
         
-        if (!display) {{
+        if (!display) {
             console.error('Prompt display element not found');
             showNotification('Error: Prompt display not found', 'error');
             return;
-        }}
+        }
         
         const isHidden = display.style.display === 'none' || display.style.display === '';
         
-        if (isHidden) {{
+        if (isHidden) {
+            const prompt = await getPromptTemplate(questionNum);
             display.style.display = 'block';
-            if (textDiv) {{
-                textDiv.textContent = getPromptTemplate(questionNum);
-            }} else {{
-                display.innerHTML = `<pre>${{getPromptTemplate(questionNum)}}</pre>`;
-            }}
-            showNotification(`Showing prompt for Question ${{questionNum}}`, 'info');
-        }} else {{
+            if (textDiv) {
+                textDiv.textContent = prompt;
+            } else {
+                display.innerHTML = `<pre>${prompt}</pre>`;
+            }
+            showNotification(`Showing prompt for Question ${questionNum}`, 'info');
+        } else {
             display.style.display = 'none';
-            showNotification(`Hidden prompt for Question ${{questionNum}}`, 'info');
-        }}
-    }} catch (e) {{
+            showNotification(`Hidden prompt for Question ${questionNum}`, 'info');
+        }
+    } catch (e) {
         console.error('Toggle prompt error:', e);
         showNotification('Error toggling prompt', 'error');
-    }}
-}};
-
-window.saveSolution = async function(questionNum) {{
-    console.log(`Save solution called for question ${{questionNum}}`);
-    try {{
-        const textarea = document.getElementById(`solution-${{questionNum}}`);
-        if (!textarea) {{
+    }
+};
+
+window.saveSolution = async function(questionNum) {
+    try {
+        const textarea = cardElement('solution', questionNum);
+        if (!textarea) {
             showNotification('Solution textarea not found', 'error');
             return;
-        }}
+        }
         
         const jsonText = textarea.value.trim();
-        if (!jsonText) {{
+        if (!jsonText) {
             showNotification('Please enter solution first', 'warning');
             return;
-        }}
+        }
         
         // Validate JSON
         let parsed;
-        try {{
+        try {
             parsed = JSON.parse(jsonText);
-        }} catch (e) {{
+        } catch (e) {
             showNotification('Invalid JSON format', 'error');
             return;
-        }}
+        }
         
         showNotification('Saving solution...', 'info');
         
-        const response = await fetch('/api/save-solution', {{
+        const response = await fetch('/api/save-solution', {
             method: 'POST',
-            headers: {{ 'Content-Type': 'application/json' }},
-            body: JSON.stringify({{
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
                 paper_folder: paperFolder,
                 question_number: questionNum,
                 solution: parsed
-            }})
-        }});
+            })
+        });
         
         const result = await response.json();
         
-        if (result.success) {{
-            const quality = result.quality_status || {{}};
-            let message = `Question ${{questionNum}} saved successfully!`;
+        if (result.success) {
+            const quality = result.quality_status || {};
+            let message = `Question ${questionNum} saved successfully!`;
             
-            if (quality.auto_flagged) {{
-                message += ` (Flagged: ${{quality.flag_reason}})`;
+            if (quality.auto_flagged) {
+                message += ` (Flagged: ${quality.flag_reason})`;
                 updateQuestionStatus(questionNum, 'flagged');
                 showNotification(message, 'warning');
-            }} else {{
+            } else {
                 updateQuestionStatus(questionNum, 'solved');
                 showNotification(message, 'success');
-            }}
-            
-            refreshProgress();
-        }} else {{
-            showNotification(`Save failed: ${{result.error}}`, 'error');
-        }}
-    }} catch (e) {{
+            }
+            progressChanged();
+        } else {
+            showNotification(`Save failed: ${result.error}`, 'error');
+        }
+    } catch (e) {
         console.error('Save solution error:', e);
-        showNotification(`Error: ${{e.message}}`, 'error');
-    }}
-}};
-
-window.validateJSON = function(questionNum) {{
-    console.log(`Validate JSON called for question ${{questionNum}}`);
-    try {{
-        const textarea = document.getElementById(`solution-${{questionNum}}`);
-        if (!textarea) {{
+        showNotification(`Error: ${e.message}`, 'error');
+    }
+};
+
+window.validateJSON = function(questionNum) {
+    try {
+        const textarea = cardElement('solution', questionNum);
+        if (!textarea) {
             showNotification('Solution textarea not found', 'error');
             return false;
-        }}
+        }
         
         const jsonText = textarea.value.trim();
-        if (!jsonText) {{
+        if (!jsonText) {
             showNotification('Please enter JSON response first', 'warning');
             return false;
-        }}
+        }
         
         const parsed = JSON.parse(jsonText);
         const required = ['question_text', 'options', 'correct_answer', 'simple_answer'];
         const missing = required.filter(field => !parsed[field]);
         
-        if (missing.length > 0) {{
-            showNotification(`Missing fields: ${{missing.join(', ')}}`, 'error');
+        if (missing.length > 0) {
+            showNotification(`Missing fields: ${missing.join(', ')}`, 'error');
             return false;
-        }}
+        }
         
-        const options = parsed.options || {{}};
-        if (Object.keys(options).length < 4) {{
-            showNotification(`Incomplete options: only ${{Object.keys(options).length}} found`, 'warning');
+        const options = parsed.options || {};
+        if (Object.keys(options).length < 4) {
+            showNotification(`Incomplete options: only ${Object.keys(options).length} found`, 'warning');
             return false;
-        }}
+        }
         
-        if (!['A', 'B', 'C', 'D'].includes(parsed.correct_answer)) {{
+        if (!['A', 'B', 'C', 'D'].includes(parsed.correct_answer)) {
             showNotification('Correct answer must be A, B, C, or D', 'error');
             return false;
-        }}
+        }
         
         showNotification('JSON is valid!', 'success');
         return true;
-    }} catch (e) {{
+    } catch (e) {
         console.error('JSON validation error:', e);
-        showNotification(`Invalid JSON: ${{e.message}}`, 'error');
+        showNotification(`Invalid JSON: ${e.message}`, 'error');
         return false;
-    }}
-}};
-
-window.clearSolution = function(questionNum) {{
-    console.log(`Clear solution called for question ${{questionNum}}`);
-    try {{
-        if (confirm('Clear this solution?')) {{
-            const textarea = document.getElementById(`solution-${{questionNum}}`);
-            if (textarea) {{
+    }
+};
+
+window.clearSolution = async function(questionNum) {
+    try {
+        if (await confirmAsync('Clear this solution?')) {
+            const textarea = cardElement('solution', questionNum);
+            if (textarea) {
                 textarea.value = '';
                 showNotification('Solution cleared', 'info');
-            }}
-        }}
-    }} catch (e) {{
+            }
+        }
+    } catch (e) {
         console.error('Clear solution error:', e);
         showNotification('Error clearing solution', 'error');
-    }}
-}};
+    }
+};
 
-window.reviewQuestion = async function(questionNum) {{
-    console.log(`Review question called for question ${{questionNum}}`);
-    try {{
-        const notesTextarea = document.getElementById(`qc-notes-${{questionNum}}`);
+window.reviewQuestion = async function(questionNum) {
+    try {
+        const notesTextarea = cardElement('qc-notes', questionNum);
         const reviewNotes = notesTextarea ? notesTextarea.value.trim() : '';
         
         showNotification('Marking as reviewed...', 'info');
         
-        const response = await fetch('/api/review-question', {{
+        const response = await fetch('/api/review-question', {
             method: 'POST',
-            headers: {{ 'Content-Type': 'application/json' }},
-            body: JSON.stringify({{
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
                 paper_folder: paperFolder,
                 question_number: questionNum,
                 review_notes: reviewNotes
-            }})
-        }});
+            })
+        });
         
         const result = await response.json();
         
-        if (result.success) {{
+        if (result.success) {
             updateQuestionStatus(questionNum, 'reviewed');
-            showNotification(`Question ${{questionNum}} marked as reviewed!`, 'success');
-            refreshProgress();
-        }} else {{
-            showNotification(`Review failed: ${{result.error}}`, 'error');
-        }}
-    }} catch (e) {{
+            showNotification(`Question ${questionNum} marked as reviewed!`, 'success');
+            progressChanged();
+        } else {
+            showNotification(`Review failed: ${result.error}`, 'error');
+        }
+    } catch (e) {
         console.error('Review question error:', e);
-        showNotification(`Error: ${{e.message}}`, 'error');
-    }}
-}};
-
-window.unflagQuestion = async function(questionNum) {{
-    console.log(`Unflag question called for question ${{questionNum}}`);
-    try {{
-        if (!confirm('Are you sure you want to unflag this question? This will override automatic quality checks.')) {{
+        showNotification(`Error: ${e.message}`, 'error');
+    }
+};
+
+window.unflagQuestion = async function(questionNum) {
+    try {
+        if (!await confirmAsync('Are you sure you want to unflag this question? This will override automatic quality checks.')) {
             return;
-        }}
+        }
         
-        const notesTextarea = document.getElementById(`qc-notes-${{questionNum}}`);
+        const notesTextarea = cardElement('qc-notes', questionNum);
         const reviewNotes = notesTextarea ? notesTextarea.value.trim() : '';
         
         showNotification('Unflagging question...', 'info');
         
-        const response = await fetch('/api/unflag-question', {{
+        const response = await fetch('/api/unflag-question', {
             method: 'POST',
-            headers: {{ 'Content-Type': 'application/json' }},
-            body: JSON.stringify({{
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
                 paper_folder: paperFolder,
                 question_number: questionNum,
                 review_notes: reviewNotes
-            }})
-        }});
+            })
+        });
         
         const result = await response.json();
         
-        if (result.success) {{
+        if (result.success) {
             updateQuestionStatus(questionNum, 'solved');
-            showNotification(`Question ${{questionNum}} unflagged successfully!`, 'success');
-            refreshProgress();
-        }} else {{
-            showNotification(`Unflag failed: ${{result.error}}`, 'error');
-        }}
-    }} catch (e) {{
+            showNotification(`Question ${questionNum} unflagged successfully!`, 'success');
+            progressChanged();
+        } else {
+            showNotification(`Unflag failed: ${result.error}`, 'error');
+        }
+    } catch (e) {
         console.error('Unflag question error:', e);
-        showNotification(`Error: ${{e.message}}`, 'error');
-    }}
-}};
+        showNotification(`Error: ${e.message}`, 'error');
+    }
+};
 
-window.openImage = function(imageUrl) {{
-    try {{
+window.openImage = function(imageUrl) {
+    try {
         window.open(imageUrl, '_blank');
-    }} catch (e) {{
+    } catch (e) {
         console.error('Error opening image:', e);
         showNotification('Error opening image', 'error');
-    }}
-}};
+    }
+};
 
 // Helper functions
-function fallbackCopy(text) {{
+function fallbackCopy(text) {
     const textArea = document.createElement("textarea");
     textArea.value = text;
     textArea.style.position = "fixed";
@@ -920,31 +1130,33 @@ function fallbackCopy(text) {{
     textArea.focus();
     textArea.select();
     
-    try {{
+    try {
         const successful = document.execCommand('copy');
-        if (successful) {{
+        if (successful) {
             showNotification('Prompt copied to clipboard!', 'success');
-        }} else {{
+        } else {
             showNotification('Failed to copy prompt', 'error');
-        }}
-    }} catch (err) {{
+        }
+    } catch (err) {
         showNotification('Failed to copy prompt', 'error');
-    }}
+    }
     
     document.body.removeChild(textArea);
-}}
+}
 
-function updateQuestionStatus(questionNum, status) {{
-    try {{
-        const statusEl = document.getElementById(`status-${{questionNum}}`);
-        if (!statusEl) {{
+function updateQuestionStatus(questionNum, status) {
+    try {
+        const statusEl = cardElement('status', questionNum);
+        if (!statusEl) {
             console.error('Status element not found for question', questionNum);
             return;
-        }}
+        }
         
-        statusEl.className = `status-indicator ${{status}}`;
+        statusEl.className = `status-indicator ${status}`;
+        const card = cardElement('question', questionNum);
+        if (card) card.dataset.status = status;
         
-        switch(status) {{
+        switch(status) {
             case 'solved':
                 statusEl.textContent = 'Solved';
                 break;
@@ -956,199 +1168,327 @@ function updateQuestionStatus(questionNum, status) {{
                 break;
             default:
                 statusEl.textContent = 'Pending';
-        }}
-    }} catch (e) {{
+        }
+    } catch (e) {
         console.error('Update question status error:', e);
-    }}
-}}
+    }
+}
 
 // Filter and control functions
-window.filterQuestions = function(filter) {{
-    try {{
+window.filterQuestions = function(filter) {
+    try {
         currentFilter = filter;
-        const cards = document.querySelectorAll('.question-card');
         
         // Update filter button states
-        document.querySelectorAll('.filter-btn').forEach(btn => {{
+        document.querySelectorAll('.filter-btn').forEach(btn => {
             btn.classList.remove('active');
             if (btn.textContent.toLowerCase().includes(filter.toLowerCase()) || 
-                (filter === 'all' && btn.textContent.toLowerCase().includes('all'))) {{
+                (filter === 'all' && btn.textContent.toLowerCase().includes('all'))) {
                 btn.classList.add('active');
-            }}
-        }});
+            }
+        });
         
-        let visibleCount = 0;
+        // CSS does the hiding (see body[data-filter]); no per-card work here
+        document.body.dataset.filter = filter;
+        const visibleCount = filter === 'all'
+            ? document.querySelectorAll('.question-card').length
+            : document.querySelectorAll(`.question-card[data-status="${filter}"]`).length;
         
-        cards.forEach(card => {{
-            const questionNum = card.id.replace('question-', '');
-            const statusEl = document.getElementById(`status-${{questionNum}}`);
-            
-            let status = 'pending';
-            if (statusEl) {{
-                const statusClasses = statusEl.className;
-                if (statusClasses.includes('flagged')) status = 'flagged';
-                else if (statusClasses.includes('reviewed')) status = 'reviewed';
-                else if (statusClasses.includes('solved')) status = 'solved';
-            }}
-            
-            let shouldShow = false;
-            switch(filter) {{
-                case 'all': shouldShow = true; break;
-                case 'flagged': shouldShow = (status === 'flagged'); break;
-                case 'reviewed': shouldShow = (status === 'reviewed'); break;
-                case 'solved': shouldShow = (status === 'solved'); break;
-                case 'pending': shouldShow = (status === 'pending'); break;
-            }}
-            
-            if (shouldShow) {{
-                card.classList.remove('hidden');
-                visibleCount++;
-            }} else {{
-                card.classList.add('hidden');
-            }}
-        }});
-        
-        showNotification(`Showing ${{visibleCount}} ${{filter}} questions`, 'info');
-    }} catch (e) {{
+        showNotification(`Showing ${visibleCount} ${filter} questions`, 'info');
+    } catch (e) {
         console.error('Filter questions error:', e);
         showNotification('Error filtering questions', 'error');
-    }}
-}};
+    }
+};
 
-window.refreshProgress = async function() {{
-    try {{
-        const response = await fetch('/api/get-progress', {{
+window.refreshProgress = async function() {
+    try {
+        const response = await fetch('/api/get-progress', {
             method: 'POST',
-            headers: {{ 'Content-Type': 'application/json' }},
-            body: JSON.stringify({{ paper_folder: paperFolder }})
-        }});
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ paper_folder: paperFolder })
+        });
         
         const result = await response.json();
         
-        if (result.success) {{
-            const progress = result.progress;
-            
-            // Update progress elements safely
-            const updateElement = (id, value) => {{
-                const element = document.getElementById(id);
-                if (element) element.textContent = value;
-            }};
-            
-            updateElement('totalQuestions', progress.total_questions);
-            updateElement('solvedCount', progress.solved_count);
-            updateElement('approvedCount', progress.high_confidence_count || 0);
-            updateElement('flaggedCount', progress.flagged_count || 0);
-            updateElement('reviewedCount', progress.reviewed_count || 0);
-            updateElement('avgConfidence', Math.round((progress.average_confidence || 0) * 100) + '%');
-            
-            const progressBar = document.getElementById('progressBar');
-            if (progressBar) {{
-                const percentage = Math.round(progress.completion_percentage || 0);
-                progressBar.style.width = percentage + '%';
-                progressBar.textContent = percentage + '% Complete';
-            }}
-        }}
-    }} catch (e) {{
+        if (result.success) {
+            updateProgressStats(result.progress);
+        }
+    } catch (e) {
         console.error('Refresh progress error:', e);
         showNotification('Error refreshing progress', 'error');
-    }}
-}};
+    }
+};
+
+function updateProgressStats(progress) {
+    // Update progress elements safely
+    const updateElement = (id, value) => {
+        const element = document.getElementById(id);
+        if (element) element.textContent = value;
+    };
+    
+    updateElement('totalQuestions', progress.total_questions);
+    updateElement('solvedCount', progress.solved_count);
+    updateElement('approvedCount', progress.high_confidence_count || 0);
+    updateElement('flaggedCount', progress.flagged_count || 0);
+    updateElement('reviewedCount', progress.reviewed_count || 0);
+    updateElement('avgConfidence', Math.round((progress.average_confidence || 0) * 100) + '%');
+    
+    const progressBar = document.getElementById('progressBar');
+    if (progressBar) {
+        const percentage = Math.round(progress.completion_percentage || 0);
+        progressBar.style.width = percentage + '%';
+        progressBar.textContent = percentage + '% Complete';
+    }
+}
+
+// Server pushes progress whenever solutions change. It ends each stream after a while and
+// the browser reconnects on its own; only once the stream is given up for good (no
+// EventSource, or the browser closed it) does each change refresh progress itself
+let progressStream = null;
+function startProgressStream() {
+    if (progressStream) return;
+    if (!('EventSource' in window)) {
+        refreshProgress();
+        return;
+    }
+    progressStream = new EventSource(`/api/progress-stream?paper_folder=${encodeURIComponent(paperFolder)}`);
+    progressStream.addEventListener('progress', e => {
+        const result = JSON.parse(e.data);
+        if (result.success) updateProgressStats(result.progress);
+    });
+    progressStream.onerror = () => {
+        if (progressStream.readyState !== EventSource.CLOSED) return;  // Reconnecting
+        console.warn('Progress stream unavailable - falling back to refreshes');
+        refreshProgress();
+    };
+}
 
-window.exportSolutions = async function() {{
-    try {{
+function progressChanged() {
+    if (!progressStream || progressStream.readyState === EventSource.CLOSED) {
+        refreshProgress();
+    }
+}
+
+window.exportSolutions = async function() {
+    try {
         showNotification('Creating export...', 'info');
         
-        const response = await fetch('/api/export-solutions', {{
+        const response = await fetch('/api/export-solutions', {
             method: 'POST',
-            headers: {{ 'Content-Type': 'application/json' }},
-            body: JSON.stringify({{ paper_folder: paperFolder }})
-        }});
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ paper_folder: paperFolder })
+        });
         
         const result = await response.json();
         
-        if (result.success) {{
+        if (result.success) {
             showNotification('Export completed!', 'success');
-            setTimeout(() => {{
-                const stats = result.statistics || {{}};
-                alert(`Export created successfully!\\nFile: ${{result.export_filename}}\\nSolved: ${{stats.solved_questions}}/${{stats.total_questions}}`);
-            }}, 500);
-        }} else {{
-            showNotification(`Export failed: ${{result.error}}`, 'error');
-        }}
-    }} catch (e) {{
+            setTimeout(() => {
+                const stats = result.statistics || {};
+                alert(`Export created successfully!\\nFile: ${result.export_filename}\\nSolved: ${stats.solved_questions}/${stats.total_questions}`);
+            }, 500);
+        } else {
+            showNotification(`Export failed: ${result.error}`, 'error');
+        }
+    } catch (e) {
         console.error('Export solutions error:', e);
-        showNotification(`Error: ${{e.message}}`, 'error');
-    }}
-}};
+        showNotification(`Error: ${e.message}`, 'error');
+    }
+};
 
-window.getBatchPrompts = function() {{
-    try {{
-        let allPrompts = `BATCH PROMPTS FOR ${{paperFolder.toUpperCase()}}\\n`;
+window.getBatchPrompts = async function() {
+    try {
+        const prompt = await getPromptTemplate();
+        let allPrompts = `BATCH PROMPTS FOR ${paperFolder.toUpperCase()}\\n`;
         allPrompts += `============================================================\\n\\n`;
         
-        for (let i = 1; i <= totalQuestions; i++) {{
-            allPrompts += `QUESTION ${{i}}:\\n`;
-            allPrompts += getPromptTemplate(i);
+        for (let i = 1; i <= totalQuestions; i++) {
+            allPrompts += `QUESTION ${i}:\\n`;
+            allPrompts += prompt;
             allPrompts += `\\n\\n========================================\\n\\n`;
-        }}
-        
-        if (navigator.clipboard && window.isSecureContext) {{
-            navigator.clipboard.writeText(allPrompts).then(() => {{
-                showNotification(`All ${{totalQuestions}} prompts copied!`, 'success');
-                setTimeout(() => {{
-                    alert(`Batch Prompts Copied!\\n\\n${{totalQuestions}} prompts copied to clipboard.`);
-                }}, 500);
-            }}).catch(() => {{
+        }
+        
+        if (navigator.clipboard && window.isSecureContext) {
+            navigator.clipboard.writeText(allPrompts).then(() => {
+                showNotification(`All ${totalQuestions} prompts copied!`, 'success');
+                setTimeout(() => {
+                    alert(`Batch Prompts Copied!\\n\\n${totalQuestions} prompts copied to clipboard.`);
+                }, 500);
+            }).catch(() => {
                 fallbackCopy(allPrompts);
-            }});
-        }} else {{
+            });
+        } else {
             fallbackCopy(allPrompts);
-        }}
-    }} catch (e) {{
+        }
+    } catch (e) {
         console.error('Get batch prompts error:', e);
         showNotification('Error getting batch prompts', 'error');
-    }}
-}};
+    }
+};
+
+// Card controls live in a <template> until the card nears the viewport
+function hydrateCard(card) {
+    const tmpl = card && card.querySelector('template.card-controls');
+    if (!tmpl) return;
+    const skeleton = card.querySelector('.card-skeleton');
+    if (skeleton) skeleton.remove();
+    tmpl.replaceWith(tmpl.content.cloneNode(true));
+}
+
+function observeCards() {
+    const cards = document.querySelectorAll('.question-card');
+    if (!('IntersectionObserver' in window)) {
+        cards.forEach(hydrateCard);
+        return;
+    }
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                hydrateCard(entry.target);
+                observer.unobserve(entry.target);
+            }
+        });
+    }, { rootMargin: '400px' });
+    cards.forEach(card => observer.observe(card));
+}
+
+// One delegated listener serves every card's buttons
+const cardActions = {
+    open: questionNum => {
+        const card = cardElement('question', questionNum);
+        const img = card && card.querySelector('.question-image');
+        if (img) openImage(img.dataset.full);
+    },
+    copy: questionNum => copyPrompt(questionNum),
+    prompt: questionNum => togglePrompt(questionNum),
+    save: questionNum => saveSolution(questionNum),
+    validate: questionNum => validateJSON(questionNum),
+    clear: questionNum => clearSolution(questionNum),
+    review: questionNum => reviewQuestion(questionNum),
+    unflag: questionNum => unflagQuestion(questionNum)
+};
+
+document.addEventListener('click', function(e) {
+    const button = e.target.closest('[data-action]');
+    if (!button) return;
+    const action = cardActions[button.dataset.action];
+    if (action) action(+button.dataset.q);
+});
+
+// Image load errors don't bubble, so catch them on the way down
+document.addEventListener('error', function(e) {
+    const img = e.target;
+    if (img.classList && img.classList.contains('question-image')) {
+        img.style.display = 'none';
+        img.nextElementSibling.style.display = 'block';
+    }
+}, true);
+
+// Stop the background/header animations while nobody can see them
+document.addEventListener('visibilitychange', function() {
+    document.documentElement.style.setProperty('--anim', document.hidden ? 'paused' : 'running');
+});
+
+function observeHeader() {
+    const header = document.querySelector('.header');
+    if (!header || !('IntersectionObserver' in window)) return;
+    new IntersectionObserver(entries => {
+        entries.forEach(entry => header.classList.toggle('offscreen', !entry.isIntersecting));
+    }).observe(header);
+}
 
 // Event listeners and initialization
-document.addEventListener('DOMContentLoaded', function() {{
+document.addEventListener('DOMContentLoaded', function() {
     console.log('DOM Content Loaded - initializing...');
+    observeCards();
+    observeHeader();
     showNotification('AxcelScore Hybrid Solver loaded!', 'success');
-    refreshProgress();
-}});
+    startProgressStream();
+});
 
 // Fallback for older browsers
-window.addEventListener('load', function() {{
+window.addEventListener('load', function() {
     console.log('Window loaded - fallback initialization...');
-    if (!document.querySelector('.notification')) {{
+    if (!document.querySelector('.notification')) {
         showNotification('AxcelScore Hybrid Solver loaded!', 'success');
-        refreshProgress();
-    }}
-}});
+        startProgressStream();
+    }
+});
 
 // Keyboard shortcuts
-document.addEventListener('keydown', function(e) {{
-    if ((e.ctrlKey || e.metaKey) && e.key === 's') {{
+document.addEventListener('keydown', function(e) {
+    if ((e.ctrlKey || e.metaKey) && e.key === 's') {
         e.preventDefault();
         const focused = document.activeElement;
-        if (focused && focused.id && focused.id.startsWith('solution-')) {{
+        if (focused && focused.id && focused.id.startsWith('solution-')) {
             const questionNum = parseInt(focused.id.replace('solution-', ''));
-            if (!isNaN(questionNum)) {{
+            if (!isNaN(questionNum)) {
                 saveSolution(questionNum);
-            }}
-        }}
-    }}
+            }
+        }
+    }
     
-    if ((e.ctrlKey || e.metaKey) && e.key === 'r') {{
+    if ((e.ctrlKey || e.metaKey) && e.key === 'r') {
         e.preventDefault();
         refreshProgress();
-    }}
-}});
+    }
+});
 
 console.log('JavaScript loaded successfully');
+"""
+
+def get_javascript_template(paper_folder, total_questions, subject):
+    """Per-paper variables inline, then the shared (browser-cached) page script"""
+    return f"""
+<script>
+// Global variables
+const paperFolder = {json.dumps(paper_folder)};
+const subject = {json.dumps(subject)};
+const totalQuestions = {int(total_questions)};
 </script>
+<script src="{_HYBRID_JS_URL}"></script>
 """
 
+@hybrid_assets.route('/api/prompt')
+def serve_prompt():
+    """Claude prompt for ?subject= as plain text (the solver page fetches it once)"""
+    response = make_response(get_claude_prompt_template(request.args.get('subject', 'physics'), 0))
+    response.mimetype = 'text/plain'
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+@hybrid_assets.route('/api/progress-stream')
+def progress_stream():
+    """
+    text/event-stream of a paper's progress: current state, then one event per change
+    Ends after PROGRESS_STREAM_LIFETIME so open tabs can't hold server threads forever;
+    the browser reconnects after PROGRESS_RETRY_MS and gets the current state again
+    """
+    paper_folder = request.args.get('paper_folder', '')
+    solver = current_app.extensions['hybrid_solver']
+    
+    def generate():
+        yield f"retry: {PROGRESS_RETRY_MS}\n\n"
+        deadline = time.monotonic() + PROGRESS_STREAM_LIFETIME
+        version = None
+        while (remaining := deadline - time.monotonic()) > 0:
+            new_version = solver.wait_for_progress(paper_folder, version, min(PROGRESS_KEEPALIVE, remaining))
+            if new_version == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = new_version
+            result = solver.get_progress(paper_folder)
+            yield f"event: progress\ndata: {json.dumps(result)}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+_HYBRID_CSS_URL = register_hybrid_asset("hybrid", "css", get_css_styles(), "text/css")
+_HYBRID_JS_URL = register_hybrid_asset("hybrid", "js", _HYBRID_JS, "text/javascript")
+
 @dataclass
 class QuestionData:
     question_number: int
@@ -1170,6 +1510,155 @@ class QuestionData:
     reviewer_notes: str = ""
     review_timestamp: str = ""
 
+# Fields of a saved solution worth reusing for an identical question image
+_CACHED_SOLUTION_FIELDS = (
+    "question_text", "options", "correct_answer", "simple_answer", "calculation_steps",
+    "detailed_explanation", "topic", "difficulty", "confidence_score"
+)
+
+class SolutionCache:
+    """
+    Saved solutions keyed by question-image content + subject, so the same image in a
+    re-uploaded or another paper is prefilled instead of being sent to Claude again.
+    One JSON file per entry; entries older than ttl seconds are ignored
+    """
+    
+    def __init__(self, cache_dir=SOLUTION_CACHE_DIR, ttl=SOLUTION_CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._digests = {}  # image path → ((mtime_ns, size), content digest)
+        self._lock = threading.Lock()
+    
+    def _image_digest(self, image_path):
+        """Content hash of an image, recomputed only when the file changes"""
+        stat = os.stat(image_path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._digests.get(image_path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        with open(image_path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: hashed in C straight from the file, no Python-level chunks
+                digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+            else:
+                hasher = hashlib.blake2b(digest_size=16)
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+                digest = hasher.hexdigest()
+        with self._lock:
+            self._digests[image_path] = (fingerprint, digest)
+        return digest
+    
+    def _entry_path(self, image_path, subject):
+        return self.cache_dir / f"{self._image_digest(image_path)}_{subject.lower()}.json"
+    
+    def get(self, image_path, subject):
+        """Cached solution dict for this image and subject, or None"""
+        try:
+            entry_path = self._entry_path(image_path, subject)
+            if time.time() - os.stat(entry_path).st_mtime > self.ttl:
+                raise FileNotFoundError(entry_path)
+            solution = read_json_file(entry_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return solution
+    
+    def put(self, image_path, subject, solution):
+        """Store the reusable fields of a saved solution (best effort)"""
+        try:
+            entry_path = self._entry_path(image_path, subject)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            write_json_file(tmp_file, {field: solution.get(field) for field in _CACHED_SOLUTION_FIELDS})
+            os.replace(tmp_file, entry_path)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Could not cache solution for {image_path}: {str(e)}")
+    
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups * 100, 1) if lookups else 0
+        }
+
+solution_cache = SolutionCache()
+
+def question_stats(questions):
+    """Progress counters of a paper's questions, gathered in one pass"""
+    solved = flagged = reviewed = high_confidence = high_quality = 0
+    confidence_sum = 0
+    for q in questions:
+        is_solved = q.get('solved_by_ai', False)
+        is_flagged = q.get('auto_flagged', False)
+        confidence = q.get('confidence_score', 0)
+        if is_solved:
+            solved += 1
+            confidence_sum += confidence
+            if not is_flagged:
+                high_quality += 1
+        if is_flagged:
+            flagged += 1
+        if q.get('manually_reviewed', False):
+            reviewed += 1
+        if confidence >= CONFIDENCE_THRESHOLD:
+            high_confidence += 1
+    
+    return {
+        "total": len(questions),
+        "solved": solved,
+        "flagged": flagged,
+        "reviewed": reviewed,
+        "high_confidence": high_confidence,
+        "high_quality": high_quality,  # Solved and not auto-flagged
+        "average_confidence": confidence_sum / max(solved, 1)
+    }
+
+def progress_stats_metadata(stats):
+    """metadata['progress_stats'] block of solutions.json from question_stats()"""
+    total = stats["total"]
+    return {
+        'total_questions': total,
+        'solved_questions': stats["solved"],
+        'completion_rate': round((stats["solved"] / total) * 100, 1) if total > 0 else 0,
+        'flagged_questions': stats["flagged"],
+        'reviewed_questions': stats["reviewed"],
+        'high_confidence_questions': stats["high_confidence"],
+        'average_confidence': round(stats["average_confidence"], 3)
+    }
+
+@contextmanager
+def _exclusive_file_lock(lock_path):
+    """Hold an exclusive lock on lock_path across processes (no-op where fcntl is missing)"""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
 class ScalableAISolverManager:
     """Complete Scalable AI Solver Manager with QC workflow"""
     
@@ -1178,6 +1667,277 @@ class ScalableAISolverManager:
         self.current_paper_path = None
         self.solver_data = {}
         
+        # Requests are served concurrently: one lock per paper serializes the
+        # read-modify-write of its solutions.json so saves can't overwrite each other
+        self._paper_locks = {}
+        self._paper_locks_guard = threading.Lock()
+        
+        # Write-behind cache of parsed solutions.json files: saves update the dict in
+        # memory and a timer rewrites each changed file once per SOLUTIONS_FLUSH_DELAY.
+        # Until then every change is appended to this process's solutions.log.<pid>.jsonl, so
+        # a crash loses nothing. Another process (main.py and hybrid.py share question banks)
+        # may rewrite the file meanwhile: a rewrite merges our changed questions into its copy
+        self._solutions = {}  # paper_folder → [data, (mtime_ns, size) of the file it matches, question index]
+        self._dirty_papers = set()
+        self._journal_counts = {}  # paper_folder → changes journaled since the last rewrite
+        self._changed_questions = {}  # paper_folder → question numbers changed since the last rewrite
+        self._adopted_journals = {}  # paper_folder → replayed journals of dead processes, removed on rewrite
+        self._flush_timer = None
+        self._flush_timer_lock = threading.Lock()
+        atexit.register(self.flush_solutions)
+        
+        # Bumped on every in-memory change so progress streams push only when needed
+        self._progress_versions = {}
+        self._progress_changed = threading.Condition()
+    
+    def _paper_lock(self, paper_folder):
+        """Lock guarding one paper's solutions.json"""
+        with self._paper_locks_guard:
+            lock = self._paper_locks.get(paper_folder)
+            if lock is None:
+                lock = self._paper_locks[paper_folder] = threading.Lock()
+            return lock
+        
+    def _question_image_path(self, paper_folder, image_filename):
+        """Path of a question image (images/ first, then extracted_images/), None if missing"""
+        paper_folder_path = self.question_banks_dir / paper_folder
+        for folder in ("images", "extracted_images"):
+            image_path = paper_folder_path / folder / image_filename
+            if image_path.is_file():
+                return str(image_path)
+        return None
+    
+    def _solutions_file(self, paper_folder):
+        return self.question_banks_dir / paper_folder / "solutions.json"
+    
+    def _journal_file(self, paper_folder):
+        return self.question_banks_dir / paper_folder / f"solutions.log.{os.getpid()}.jsonl"
+    
+    def _remove_journals(self, paper_folder):
+        """Drop every journal of a paper (its solutions.json was just created from scratch)"""
+        for journal in (self.question_banks_dir / paper_folder).glob("solutions.log.*.jsonl"):
+            journal.unlink(missing_ok=True)
+        self._journal_counts.pop(paper_folder, None)
+        self._changed_questions.pop(paper_folder, None)
+        self._adopted_journals.pop(paper_folder, None)
+    
+    def _replay_journals(self, paper_folder, data, dead_only=False):
+        """
+        Apply changes journaled after the last solutions.json rewrite; returns how many
+        Journals of live processes are left to their owners, who merge them on their next rewrite.
+        Records older than the question's last save or review are stale and skipped
+        """
+        replayed = 0
+        questions = {q.get('question_number'): q for q in data.get('questions', [])}
+        journals = sorted((self.question_banks_dir / paper_folder).glob("solutions.log.*.jsonl"),
+                          key=lambda path: path.stat().st_mtime_ns)
+        for journal in journals:
+            try:
+                pid = int(journal.name.split('.')[2])
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                if dead_only:
+                    continue
+            elif _pid_alive(pid):
+                continue
+            try:
+                with open(journal, 'r') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                continue
+            
+            changed = self._changed_questions.setdefault(paper_folder, set())
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash mid-append
+                stamp = record.get('ts', '')
+                question = questions.get(record.get('q'))
+                if question is not None:
+                    if stamp < max(question.get('saved_at') or '', question.get('review_timestamp') or ''):
+                        continue
+                    question.update(record.get('question', {}))
+                    changed.add(record.get('q'))
+                if record.get('metadata') is not None and stamp >= data.get('metadata', {}).get('last_updated', ''):
+                    data['metadata'] = record['metadata']
+                replayed += 1
+            if pid != os.getpid():
+                self._adopted_journals.setdefault(paper_folder, []).append(journal)
+        
+        if replayed:
+            metadata = data.setdefault('metadata', {})
+            if 'progress_stats' in metadata:
+                metadata['progress_stats'] = progress_stats_metadata(question_stats(data.get('questions', [])))
+            print(f"Replayed {replayed} journaled change(s) into {paper_folder}/solutions.json")
+        return replayed
+    
+    def _merge_from_disk(self, paper_folder):
+        """
+        solutions.json changed under our unsaved changes (another process rewrote it): take the
+        file's copy and re-apply the questions and metadata we changed (call with the paper lock held)
+        """
+        entry = self._solutions[paper_folder]
+        ours = entry[0]
+        stat = os.stat(self._solutions_file(paper_folder))
+        data = read_json_file(self._solutions_file(paper_folder))
+        
+        our_questions = {q.get('question_number'): q for q in ours.get('questions', [])}
+        for question in data.get('questions', []):
+            number = question.get('question_number')
+            if number in self._changed_questions.get(paper_folder, ()):
+                question.update(our_questions.get(number, {}))
+        
+        metadata = data.setdefault('metadata', {})
+        metadata.update(ours.get('metadata', {}))
+        if 'progress_stats' in metadata:
+            metadata['progress_stats'] = progress_stats_metadata(question_stats(data.get('questions', [])))
+        
+        self._solutions[paper_folder] = [data, (stat.st_mtime_ns, stat.st_size), None]
+        return data
+    
+    def _load_solutions(self, paper_folder):
+        """
+        Parsed solutions.json of a paper (call with the paper lock held), None if missing
+        The cached copy is reused while the file is unchanged on disk; if another process
+        rewrote it under unsaved changes, those changes are merged into its copy
+        """
+        solutions_file = self._solutions_file(paper_folder)
+        cached = self._solutions.get(paper_folder)
+        dirty = cached is not None and paper_folder in self._dirty_papers
+        
+        try:
+            stat = os.stat(solutions_file)
+        except FileNotFoundError:
+            if dirty:
+                return cached[0]  # Our next rewrite recreates it
+            self._solutions.pop(paper_folder, None)
+            return None
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        if cached is not None and cached[1] == fingerprint:
+            return cached[0]
+        if dirty:
+            try:
+                return self._merge_from_disk(paper_folder)
+            except ValueError:
+                return cached[0]  # Caught mid-write; merged on the next load or rewrite
+        
+        data = read_json_file(solutions_file)
+        self._solutions[paper_folder] = [data, fingerprint, None]
+        
+        # Changes journaled but never rewritten (their process stopped first): fold them in
+        replayed = self._replay_journals(paper_folder, data)
+        if replayed:
+            self._journal_counts[paper_folder] = replayed
+            self._dirty_papers.add(paper_folder)
+            self._schedule_flush(replayed >= SOLUTIONS_JOURNAL_LIMIT)
+        return data
+    
+    def _find_question(self, paper_folder, question_number):
+        """Question dict by number from the loaded solutions (call after _load_solutions), None if absent"""
+        entry = self._solutions[paper_folder]
+        if entry[2] is None:
+            # Built once per load; saves update questions in place and never add or remove any
+            entry[2] = {q.get('question_number'): q for q in entry[0].get('questions', [])}
+        return entry[2].get(question_number)
+    
+    def _mark_dirty(self, paper_folder, question_number):
+        """
+        Journal a changed question and schedule a rewrite of the paper's solutions.json
+        (call with the paper lock held)
+        """
+        entry = self._solutions[paper_folder]
+        record = {
+            "q": question_number,
+            "question": self._find_question(paper_folder, question_number),
+            "metadata": entry[0].get('metadata'),
+            "ts": datetime.now().isoformat()
+        }
+        try:
+            with open(self._journal_file(paper_folder), 'a') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+        except OSError as e:
+            # Still saved by the next rewrite, just not crash-safe until then
+            print(f"Error journaling {paper_folder} question {question_number}: {str(e)}")
+        journaled = self._journal_counts.get(paper_folder, 0) + 1
+        self._journal_counts[paper_folder] = journaled
+        self._changed_questions.setdefault(paper_folder, set()).add(question_number)
+        
+        self._dirty_papers.add(paper_folder)
+        with self._progress_changed:
+            self._progress_versions[paper_folder] = self._progress_versions.get(paper_folder, 0) + 1
+            self._progress_changed.notify_all()
+        self._schedule_flush(journaled >= SOLUTIONS_JOURNAL_LIMIT)
+    
+    def _schedule_flush(self, immediate=False):
+        """Start the rewrite timer (or restart it with no delay once the journal is long)"""
+        with self._flush_timer_lock:
+            if immediate and self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._flush_timer is None:
+                delay = 0 if immediate else SOLUTIONS_FLUSH_DELAY
+                self._flush_timer = threading.Timer(delay, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush_from_timer(self):
+        with self._flush_timer_lock:
+            self._flush_timer = None
+        self.flush_solutions()
+    
+    def flush_solutions(self, paper_folder=None):
+        """Write pending solutions.json changes (of one paper, or all) to disk now"""
+        papers = [paper_folder] if paper_folder is not None else list(self._dirty_papers)
+        for paper in papers:
+            with self._paper_lock(paper):
+                if paper not in self._dirty_papers:
+                    continue
+                solutions_file = self._solutions_file(paper)
+                
+                # One process rewrites a paper at a time; if another rewrote it since we
+                # loaded it, merge our changes into that version instead of overwriting it,
+                # and take over journals of processes that died before rewriting it
+                with _exclusive_file_lock(solutions_file.with_name("solutions.json.lock")):
+                    try:
+                        stat = os.stat(solutions_file)
+                        if (stat.st_mtime_ns, stat.st_size) != self._solutions[paper][1]:
+                            self._merge_from_disk(paper)
+                        data = self._solutions[paper][0]
+                        self._replay_journals(paper, data, dead_only=True)
+                        
+                        # Write then rename so readers never see a partial file
+                        tmp_file = solutions_file.with_name(f"solutions.json.{os.getpid()}.tmp")
+                        write_json_file(tmp_file, data)
+                        os.replace(tmp_file, solutions_file)
+                    except Exception as e:
+                        print(f"Error writing {solutions_file}: {str(e)}")
+                        traceback.print_exc()
+                        continue
+                    
+                    stat = os.stat(solutions_file)
+                    self._solutions[paper][1] = (stat.st_mtime_ns, stat.st_size)
+                    
+                    # Everything we journaled (or replayed) is in solutions.json now; live
+                    # processes' journals stay until they rewrite it themselves
+                    self._journal_file(paper).unlink(missing_ok=True)
+                    for journal in self._adopted_journals.pop(paper, []):
+                        journal.unlink(missing_ok=True)
+                self._dirty_papers.discard(paper)
+                self._journal_counts.pop(paper, None)
+                self._changed_questions.pop(paper, None)
+    
+    def wait_for_progress(self, paper_folder, seen_version, timeout):
+        """Block until a paper's progress version differs from seen_version (or timeout); return it"""
+        with self._progress_changed:
+            self._progress_changed.wait_for(
+                lambda: self._progress_versions.get(paper_folder, 0) != seen_version,
+                timeout=timeout
+            )
+            return self._progress_versions.get(paper_folder, 0)
+    
     def extract_subject_from_folder(self, folder_name):
         """Extract subject from folder name"""
         folder_lower = folder_name.lower()
@@ -1193,8 +1953,7 @@ class ScalableAISolverManager:
 
     def extract_year_from_folder(self, folder_name):
         """Extract year from folder name"""
-        import re
-        match = re.search(r'(\d{4})', folder_name)
+        match = _YEAR_RE.search(folder_name)
         return match.group(1) if match else '2025'
 
     def extract_month_from_folder(self, folder_name):
@@ -1246,80 +2005,82 @@ class ScalableAISolverManager:
             
             image_files.sort()
             
-            # CREATE solutions.json if it doesn't exist
-            solutions_file = paper_folder_path / "solutions.json"
-            if not solutions_file.exists():
-                # Create from scratch based on images
-                master_data = {
-                    "metadata": {
-                        "paper_folder": paper_folder,
-                        "subject": self.extract_subject_from_folder(paper_folder),
-                        "year": self.extract_year_from_folder(paper_folder),
-                        "month": self.extract_month_from_folder(paper_folder),
-                        "paper_code": self.extract_paper_code_from_folder(paper_folder),
-                        "created_at": datetime.now().isoformat(),
-                        "workflow": "hybrid_manual_gen_alpha",
-                        "total_questions": len(image_files)
-                    },
-                    "questions": []
-                }
-                
-                # Create question entries from images
-                for i, img_file in enumerate(image_files, 1):
-                    master_data["questions"].append({
-                        "question_number": i,
-                        "image_filename": img_file.name,
-                        "question_text": "",
-                        "options": {},
-                        "correct_answer": "",
-                        "explanation": "",
-                        "detailed_explanation": {},
-                        "calculation_steps": [],
-                        "topic": "",
-                        "difficulty": "medium",
-                        "confidence_score": 0.0,
-                        "solved_by_ai": False,
-                        "auto_flagged": False,
-                        "needs_review": False,
-                        "flag_reason": "",
-                        "manually_reviewed": False,
-                        "reviewer_notes": "",
-                        "review_timestamp": "",
-                        "created_at": datetime.now().isoformat()
-                    })
-                
-                # Save the initial structure
-                with open(solutions_file, 'w') as f:
-                    json.dump(master_data, f, indent=2)
-                
-                print(f"Created solutions.json with {len(image_files)} questions")
-            else:
-                # Load existing file and add missing QC fields if needed
-                with open(solutions_file, 'r') as f:
-                    master_data = json.load(f)
-                
-                # Upgrade existing questions with QC fields if missing
-                updated = False
-                for question in master_data.get('questions', []):
-                    if 'manually_reviewed' not in question:
-                        question.update({
-                            'manually_reviewed': False,
-                            'reviewer_notes': "",
-                            'review_timestamp': ""
+            with self._paper_lock(paper_folder):
+                # CREATE solutions.json if it doesn't exist
+                solutions_file = paper_folder_path / "solutions.json"
+                # The resident copy (with any unsaved changes) when there is one; read once otherwise
+                master_data = self._load_solutions(paper_folder)
+                if master_data is None:
+                    # Create from scratch based on images
+                    master_data = {
+                        "metadata": {
+                            "paper_folder": paper_folder,
+                            "subject": self.extract_subject_from_folder(paper_folder),
+                            "year": self.extract_year_from_folder(paper_folder),
+                            "month": self.extract_month_from_folder(paper_folder),
+                            "paper_code": self.extract_paper_code_from_folder(paper_folder),
+                            "created_at": datetime.now().isoformat(),
+                            "workflow": "hybrid_manual_gen_alpha",
+                            "total_questions": len(image_files)
+                        },
+                        "questions": []
+                    }
+                    
+                    # Create question entries from images
+                    for i, img_file in enumerate(image_files, 1):
+                        master_data["questions"].append({
+                            "question_number": i,
+                            "image_filename": img_file.name,
+                            "question_text": "",
+                            "options": {},
+                            "correct_answer": "",
+                            "explanation": "",
+                            "detailed_explanation": {},
+                            "calculation_steps": [],
+                            "topic": "",
+                            "difficulty": "medium",
+                            "confidence_score": 0.0,
+                            "solved_by_ai": False,
+                            "auto_flagged": False,
+                            "needs_review": False,
+                            "flag_reason": "",
+                            "manually_reviewed": False,
+                            "reviewer_notes": "",
+                            "review_timestamp": "",
+                            "created_at": datetime.now().isoformat()
                         })
-                        updated = True
-                
-                if updated:
-                    with open(solutions_file, 'w') as f:
-                        json.dump(master_data, f, indent=2)
-                    print(f"Updated solutions.json with QC fields")
+                    
+                    # Save the initial structure; journals left from an earlier file don't apply
+                    self._remove_journals(paper_folder)
+                    write_json_file(solutions_file, master_data)
+                    master_data = self._load_solutions(paper_folder)
+                    
+                    print(f"Created solutions.json with {len(image_files)} questions")
+                else:
+                    # Upgrade existing questions with QC fields if missing
+                    updated = False
+                    for question in master_data.get('questions', []):
+                        if 'manually_reviewed' not in question:
+                            question.update({
+                                'manually_reviewed': False,
+                                'reviewer_notes': "",
+                                'review_timestamp': ""
+                            })
+                            updated = True
+                    
+                    if updated:
+                        # Rewritten with the next flush (recomputed on the next load if lost)
+                        self._dirty_papers.add(paper_folder)
+                        self._schedule_flush()
+                        print(f"Updated solutions.json with QC fields")
             
             questions = master_data.get('questions', [])
-            total_questions = len(questions)
-            solved_count = sum(1 for q in questions if q.get('solved_by_ai', False))
-            flagged_count = sum(1 for q in questions if q.get('auto_flagged', False))
-            reviewed_count = sum(1 for q in questions if q.get('manually_reviewed', False))
-            high_confidence_count = sum(1 for q in questions if q.get('confidence_score', 0) >= CONFIDENCE_THRESHOLD)
+            stats = question_stats(questions)
+            total_questions = stats["total"]
+            solved_count = stats["solved"]
+            flagged_count = stats["flagged"]
+            reviewed_count = stats["reviewed"]
+            high_confidence_count = stats["high_confidence"]
             
             self.current_paper_path = paper_folder_path
             
@@ -1336,8 +2097,10 @@ class ScalableAISolverManager:
                 "flagged_count": flagged_count,
                 "reviewed_count": reviewed_count,
                 "high_confidence_count": high_confidence_count,
+                "average_confidence": stats["average_confidence"],
                 "initialized_at": datetime.now().isoformat()
             }
+            pregenerate_thumbnails(image_files)
             
             return {
                 "success": True,
@@ -1366,251 +2129,203 @@ class ScalableAISolverManager:
     
     def save_solution(self, paper_folder, question_number, solution_json):
         """Save solution with enhanced quality control"""
-        try:
-            paper_folder_path = self.question_banks_dir / paper_folder
-            master_solutions_file = paper_folder_path / "solutions.json"
-            
-            if not master_solutions_file.exists():
-                return {"success": False, "error": "Master solutions.json file not found"}
-            
-            with open(master_solutions_file, 'r') as f:
-                master_data = json.load(f)
-            
-            # Parse and validate solution
-            if isinstance(solution_json, str):
-                solution = json.loads(solution_json)
-            else:
-                solution = solution_json
-            
-            # Enhanced metadata
-            solution['question_number'] = question_number
-            solution['saved_at'] = datetime.now().isoformat()
-            solution['solver_version'] = "Hybrid Gen Alpha v2.0"
-            solution['solved_by_ai'] = True
-            
-            # Enhanced quality control
-            confidence = solution.get('confidence_score', 0)
-            
-            # Comprehensive validation
-            required_fields = [
-                'question_text', 'options', 'correct_answer', 
-                'simple_answer', 'detailed_explanation', 
-                'topic', 'confidence_score'
-            ]
-            
-            missing_fields = [field for field in required_fields if not solution.get(field)]
-            
-            # Enhanced auto-flagging with 91% threshold
-            flag_reasons = []
-            if confidence < CONFIDENCE_THRESHOLD:
-                flag_reasons.append(f"Low confidence: {confidence:.1%} (< 91%)")
-            if missing_fields:
-                flag_reasons.append(f"Missing fields: {', '.join(missing_fields)}")
-            
-            # Options validation
-            options = solution.get("options", {})
-            if len(options) < 4:
-                flag_reasons.append(f"Incomplete options: only {len(options)} found")
-            
-            # Set flagging status
-            solution['auto_flagged'] = len(flag_reasons) > 0
-            solution['needs_review'] = len(flag_reasons) > 0
-            solution['flag_reason'] = '; '.join(flag_reasons) if flag_reasons else None
-            solution['quality_threshold'] = '91%'
-            
-            # Update question in master data
-            question_found = False
-            if 'questions' in master_data:
-                for i, question in enumerate(master_data['questions']):
-                    if question.get('question_number') == question_number:
-                        master_data['questions'][i].update({
-                            'question_text': solution.get('question_text'),
-                            'options': solution.get('options'),
-                            'correct_answer': solution.get('correct_answer'),
-                            'explanation': solution.get('simple_answer'),
-                            'detailed_explanation': solution.get('detailed_explanation'),
-                            'calculation_steps': solution.get('calculation_steps'),
-                            'topic': solution.get('topic'),
-                            'difficulty': solution.get('difficulty'),
-                            'confidence_score': confidence,
-                            'solved_by_ai': True,
-                            'saved_at': solution['saved_at'],
-                            'auto_flagged': solution['auto_flagged'],
-                            'needs_review': solution['needs_review'],
-                            'flag_reason': solution['flag_reason']
-                        })
-                        question_found = True
-                        break
-            
-            if not question_found:
-                return {"success": False, "error": f"Question {question_number} not found in master file"}
-            
-            # Update comprehensive metadata
-            master_data['metadata'].update({
-                'last_updated': datetime.now().isoformat(),
-                'ai_solver_version': 'Hybrid Gen Alpha v2.0',
-                'solving_in_progress': True
-            })
-            
-            # Calculate enhanced statistics
-            solved_questions = sum(1 for q in master_data['questions'] if q.get('solved_by_ai'))
-            total_questions = len(master_data['questions'])
-            flagged_questions = sum(1 for q in master_data['questions'] if q.get('auto_flagged'))
-            reviewed_questions = sum(1 for q in master_data['questions'] if q.get('manually_reviewed'))
-            high_confidence = sum(1 for q in master_data['questions'] if q.get('confidence_score', 0) >= CONFIDENCE_THRESHOLD)
-            avg_confidence = sum(q.get('confidence_score', 0) for q in master_data['questions'] if q.get('solved_by_ai')) / max(solved_questions, 1)
-            
-            master_data['metadata'].update({
-                'progress_stats': {
-                    'total_questions': total_questions,
-                    'solved_questions': solved_questions,
-                    'completion_rate': round((solved_questions / total_questions) * 100, 1),
-                    'flagged_questions': flagged_questions,
-                    'reviewed_questions': reviewed_questions,
-                    'high_confidence_questions': high_confidence,
-                    'average_confidence': round(avg_confidence, 3)
-                }
-            })
-            
-            # Save back to master file
-            with open(master_solutions_file, 'w') as f:
-                json.dump(master_data, f, indent=2)
-            
-            print(f"Updated master solutions.json: Question {question_number} saved")
-            print(f"Progress: {solved_questions}/{total_questions} ({master_data['metadata']['progress_stats']['completion_rate']}%)")
-            
-            return {
-                "success": True,
-                "message": f"Solution for Question {question_number} saved successfully",
-                "progress": master_data['metadata']['progress_stats'],
-                "quality_status": {
-                    "confidence": confidence,
-                    "auto_flagged": solution['auto_flagged'],
-                    "needs_review": solution['needs_review'],
-                    "flag_reason": solution['flag_reason']
+        with self._paper_lock(paper_folder):
+            try:
+                master_data = self._load_solutions(paper_folder)
+                if master_data is None:
+                    return {"success": False, "error": "Master solutions.json file not found"}
+                
+                # Parse and validate solution
+                if isinstance(solution_json, str):
+                    solution = json.loads(solution_json)
+                else:
+                    solution = solution_json
+                
+                # Enhanced metadata
+                solution['question_number'] = question_number
+                solution['saved_at'] = datetime.now().isoformat()
+                solution['solver_version'] = "Hybrid Gen Alpha v2.0"
+                solution['solved_by_ai'] = True
+                
+                # Enhanced quality control
+                confidence = solution.get('confidence_score', 0)
+                
+                # Comprehensive validation
+                required_fields = [
+                    'question_text', 'options', 'correct_answer', 
+                    'simple_answer', 'detailed_explanation', 
+                    'topic', 'confidence_score'
+                ]
+                
+                missing_fields = [field for field in required_fields if not solution.get(field)]
+                
+                # Enhanced auto-flagging with 91% threshold
+                flag_reasons = []
+                if confidence < CONFIDENCE_THRESHOLD:
+                    flag_reasons.append(f"Low confidence: {confidence:.1%} (< 91%)")
+                if missing_fields:
+                    flag_reasons.append(f"Missing fields: {', '.join(missing_fields)}")
+                
+                # Options validation
+                options = solution.get("options", {})
+                if len(options) < 4:
+                    flag_reasons.append(f"Incomplete options: only {len(options)} found")
+                
+                # Set flagging status
+                solution['auto_flagged'] = len(flag_reasons) > 0
+                solution['needs_review'] = len(flag_reasons) > 0
+                solution['flag_reason'] = '; '.join(flag_reasons) if flag_reasons else None
+                solution['quality_threshold'] = '91%'
+                
+                # Update question in master data
+                question = self._find_question(paper_folder, question_number)
+                if question is None:
+                    return {"success": False, "error": f"Question {question_number} not found in master file"}
+                
+                question.update({
+                    'question_text': solution.get('question_text'),
+                    'options': solution.get('options'),
+                    'correct_answer': solution.get('correct_answer'),
+                    'explanation': solution.get('simple_answer'),
+                    'detailed_explanation': solution.get('detailed_explanation'),
+                    'calculation_steps': solution.get('calculation_steps'),
+                    'topic': solution.get('topic'),
+                    'difficulty': solution.get('difficulty'),
+                    'confidence_score': confidence,
+                    'solved_by_ai': True,
+                    'saved_at': solution['saved_at'],
+                    'auto_flagged': solution['auto_flagged'],
+                    'needs_review': solution['needs_review'],
+                    'flag_reason': solution['flag_reason']
+                })
+                
+                # Write-through: an identical image elsewhere gets this solution prefilled
+                image_path = self._question_image_path(paper_folder, question.get('image_filename', ''))
+                if image_path and not solution['auto_flagged']:
+                    subject = master_data.get('metadata', {}).get('subject', 'physics')
+                    solution_cache.put(image_path, subject, solution)
+                
+                # Update comprehensive metadata
+                master_data['metadata'].update({
+                    'last_updated': datetime.now().isoformat(),
+                    'ai_solver_version': 'Hybrid Gen Alpha v2.0',
+                    'solving_in_progress': True
+                })
+                
+                # Calculate enhanced statistics
+                stats = question_stats(master_data['questions'])
+                master_data['metadata']['progress_stats'] = progress_stats_metadata(stats)
+                
+                # Save back to master file (written shortly, together with any other saves)
+                self._mark_dirty(paper_folder, question_number)
+                
+                print(f"Updated master solutions.json: Question {question_number} saved")
+                print(f"Progress: {stats['solved']}/{stats['total']} ({master_data['metadata']['progress_stats']['completion_rate']}%)")
+                
+                return {
+                    "success": True,
+                    "message": f"Solution for Question {question_number} saved successfully",
+                    "progress": master_data['metadata']['progress_stats'],
+                    "quality_status": {
+                        "confidence": confidence,
+                        "auto_flagged": solution['auto_flagged'],
+                        "needs_review": solution['needs_review'],
+                        "flag_reason": solution['flag_reason']
+                    }
                 }
-            }
-            
-        except Exception as e:
-            print(f"Error in save_solution: {str(e)}")
-            traceback.print_exc()
-            return {"success": False, "error": str(e)}
-    
+                
+            except Exception as e:
+                print(f"Error in save_solution: {str(e)}")
+                traceback.print_exc()
+                return {"success": False, "error": str(e)}
+        
     def review_question(self, paper_folder, question_number, review_notes=""):
         """Mark question as manually reviewed"""
-        try:
-            paper_folder_path = self.question_banks_dir / paper_folder
-            master_solutions_file = paper_folder_path / "solutions.json"
-            
-            if not master_solutions_file.exists():
-                return {"success": False, "error": "Master solutions file not found"}
-            
-            with open(master_solutions_file, 'r') as f:
-                master_data = json.load(f)
-            
-            # Find and update the question
-            question_found = False
-            if 'questions' in master_data:
-                for i, question in enumerate(master_data['questions']):
-                    if question.get('question_number') == question_number:
-                        master_data['questions'][i].update({
-                            'manually_reviewed': True,
-                            'reviewer_notes': review_notes,
-                            'review_timestamp': datetime.now().isoformat()
-                        })
-                        question_found = True
-                        break
-            
-            if not question_found:
-                return {"success": False, "error": f"Question {question_number} not found"}
-            
-            # Update metadata
-            master_data['metadata']['last_updated'] = datetime.now().isoformat()
-            
-            # Save back to file
-            with open(master_solutions_file, 'w') as f:
-                json.dump(master_data, f, indent=2)
-            
-            return {
-                "success": True,
-                "message": f"Question {question_number} marked as reviewed"
-            }
-            
-        except Exception as e:
-            print(f"Error in review_question: {str(e)}")
-            return {"success": False, "error": str(e)}
-    
+        with self._paper_lock(paper_folder):
+            try:
+                master_data = self._load_solutions(paper_folder)
+                if master_data is None:
+                    return {"success": False, "error": "Master solutions file not found"}
+                
+                # Find and update the question
+                question = self._find_question(paper_folder, question_number)
+                if question is None:
+                    return {"success": False, "error": f"Question {question_number} not found"}
+                
+                question.update({
+                    'manually_reviewed': True,
+                    'reviewer_notes': review_notes,
+                    'review_timestamp': datetime.now().isoformat()
+                })
+                
+                # Update metadata
+                master_data['metadata']['last_updated'] = datetime.now().isoformat()
+                
+                # Save back to file (written shortly, together with any other saves)
+                self._mark_dirty(paper_folder, question_number)
+                
+                return {
+                    "success": True,
+                    "message": f"Question {question_number} marked as reviewed"
+                }
+                
+            except Exception as e:
+                print(f"Error in review_question: {str(e)}")
+                return {"success": False, "error": str(e)}
+        
     def unflag_question(self, paper_folder, question_number, review_notes=""):
         """Unflag a question (manual override)"""
-        try:
-            paper_folder_path = self.question_banks_dir / paper_folder
-            master_solutions_file = paper_folder_path / "solutions.json"
-            
-            if not master_solutions_file.exists():
-                return {"success": False, "error": "Master solutions file not found"}
-            
-            with open(master_solutions_file, 'r') as f:
-                master_data = json.load(f)
-            
-            # Find and update the question
-            question_found = False
-            if 'questions' in master_data:
-                for i, question in enumerate(master_data['questions']):
-                    if question.get('question_number') == question_number:
-                        master_data['questions'][i].update({
-                            'auto_flagged': False,
-                            'needs_review': False,
-                            'flag_reason': None,
-                            'manually_reviewed': True,
-                            'reviewer_notes': review_notes or "Manually unflagged",
-                            'review_timestamp': datetime.now().isoformat()
-                        })
-                        question_found = True
-                        break
-            
-            if not question_found:
-                return {"success": False, "error": f"Question {question_number} not found"}
-            
-            # Update metadata
-            master_data['metadata']['last_updated'] = datetime.now().isoformat()
-            
-            # Save back to file
-            with open(master_solutions_file, 'w') as f:
-                json.dump(master_data, f, indent=2)
-            
-            return {
-                "success": True,
-                "message": f"Question {question_number} unflagged successfully"
-            }
-            
-        except Exception as e:
-            print(f"Error in unflag_question: {str(e)}")
-            return {"success": False, "error": str(e)}
-    
+        with self._paper_lock(paper_folder):
+            try:
+                master_data = self._load_solutions(paper_folder)
+                if master_data is None:
+                    return {"success": False, "error": "Master solutions file not found"}
+                
+                # Find and update the question
+                question = self._find_question(paper_folder, question_number)
+                if question is None:
+                    return {"success": False, "error": f"Question {question_number} not found"}
+                
+                question.update({
+                    'auto_flagged': False,
+                    'needs_review': False,
+                    'flag_reason': None,
+                    'manually_reviewed': True,
+                    'reviewer_notes': review_notes or "Manually unflagged",
+                    'review_timestamp': datetime.now().isoformat()
+                })
+                
+                # Update metadata
+                master_data['metadata']['last_updated'] = datetime.now().isoformat()
+                
+                # Save back to file (written shortly, together with any other saves)
+                self._mark_dirty(paper_folder, question_number)
+                
+                return {
+                    "success": True,
+                    "message": f"Question {question_number} unflagged successfully"
+                }
+                
+            except Exception as e:
+                print(f"Error in unflag_question: {str(e)}")
+                return {"success": False, "error": str(e)}
+        
     def get_progress(self, paper_folder):
         """Get comprehensive progress with all metrics including QC"""
         try:
-            paper_folder_path = self.question_banks_dir / paper_folder
-            master_solutions_file = paper_folder_path / "solutions.json"
-            
-            if not master_solutions_file.exists():
+            with self._paper_lock(paper_folder):
+                master_data = self._load_solutions(paper_folder)
+            if master_data is None:
                 return {"success": False, "error": "Master solutions file not found"}
             
-            with open(master_solutions_file, 'r') as f:
-                master_data = json.load(f)
-            
-            questions = master_data.get('questions', [])
-            total_questions = len(questions)
-            
             # Comprehensive metrics including QC
-            solved_count = sum(1 for q in questions if q.get('solved_by_ai'))
-            flagged_count = sum(1 for q in questions if q.get('auto_flagged'))
-            reviewed_count = sum(1 for q in questions if q.get('manually_reviewed'))
-            high_confidence_count = sum(1 for q in questions if q.get('confidence_score', 0) >= CONFIDENCE_THRESHOLD)
-            
-            # Average confidence calculation
-            solved_questions = [q for q in questions if q.get('solved_by_ai')]
-            avg_confidence = sum(q.get('confidence_score', 0) for q in solved_questions) / max(len(solved_questions), 1)
+            stats = question_stats(master_data.get('questions', []))
+            total_questions = stats["total"]
+            solved_count = stats["solved"]
+            flagged_count = stats["flagged"]
+            reviewed_count = stats["reviewed"]
+            high_confidence_count = stats["high_confidence"]
+            avg_confidence = stats["average_confidence"]
             
             return {
                 "success": True,
@@ -1632,40 +2347,40 @@ class ScalableAISolverManager:
     
     def export_solutions(self, paper_folder):
         """Enhanced export with comprehensive backup"""
+        # Back up what is on disk, including saves still waiting to be written
+        self.flush_solutions(paper_folder)
         try:
             paper_folder_path = self.question_banks_dir / paper_folder
-            master_solutions_file = paper_folder_path / "solutions.json"
-            
-            if not master_solutions_file.exists():
-                return {"success": False, "error": "No master solutions file found"}
-            
-            with open(master_solutions_file, 'r') as f:
-                master_data = json.load(f)
             
-            # Create comprehensive export
-            export_data = dict(master_data)
-            export_data['export_info'] = {
-                "export_date": datetime.now().isoformat(),
-                "format_version": "hybrid_gen_alpha_v2.0",
-                "export_type": "complete_backup",
-                "exported_from": "master_solutions_json"
-            }
-            
-            # Save timestamped backup
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            export_filename = f"{paper_folder}_hybrid_backup_{timestamp}.json"
-            export_path = paper_folder_path / export_filename
-            
-            with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
-            
-            # Calculate comprehensive statistics including QC
-            questions = master_data.get('questions', [])
-            solved_count = sum(1 for q in questions if q.get('solved_by_ai'))
-            total_count = len(questions)
-            flagged_count = sum(1 for q in questions if q.get('auto_flagged'))
-            reviewed_count = sum(1 for q in questions if q.get('manually_reviewed'))
-            high_quality_count = sum(1 for q in questions if q.get('solved_by_ai', False) and not q.get('auto_flagged', False))
+            # The resident copy matches the file just written; serialize it under the
+            # lock so a concurrent save can't change it mid-dump
+            with self._paper_lock(paper_folder):
+                master_data = self._load_solutions(paper_folder)
+                if master_data is None:
+                    return {"success": False, "error": "No master solutions file found"}
+                
+                # Create comprehensive export
+                export_data = dict(master_data)
+                export_data['export_info'] = {
+                    "export_date": datetime.now().isoformat(),
+                    "format_version": "hybrid_gen_alpha_v2.0",
+                    "export_type": "complete_backup",
+                    "exported_from": "master_solutions_json"
+                }
+                
+                # Save timestamped backup
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                export_filename = f"{paper_folder}_hybrid_backup_{timestamp}.json"
+                export_path = paper_folder_path / export_filename
+                write_json_file(export_path, export_data)
+                
+                # Calculate comprehensive statistics including QC
+                stats = question_stats(master_data.get('questions', []))
+            solved_count = stats["solved"]
+            total_count = stats["total"]
+            flagged_count = stats["flagged"]
+            reviewed_count = stats["reviewed"]
+            high_quality_count = stats["high_quality"]
             
             return {
                 "success": True,
@@ -1714,11 +2429,23 @@ class ScalableAISolverManager:
                 question_num = question.get("question_number")
                 filename = question.get("image_filename")
                 
-                # Smart image URL generation
+                # Smart image URL generation (versioned by mtime so it can be cached as immutable)
+                image_path = os.path.join(self.solver_data["images_folder"], filename or "")
                 if "images" in self.solver_data["images_folder"]:
                     image_url = f"/images/{paper_folder}/{filename}"
                 else:
                     image_url = f"/images/{paper_folder}/extracted_images/{filename}"
+                thumb_url = f"/thumbs/{paper_folder}/{filename}"
+                thumb_dims = ""
+                try:
+                    version = _image_version(os.stat(image_path))
+                    image_url += f"?v={version}"
+                    thumb_url += f"?v={version}"
+                    # Intrinsic size up front so lazy images don't reflow the grid
+                    thumb_width, thumb_height = _thumbnail_size(image_path, version)
+                    thumb_dims = f'width="{thumb_width}" height="{thumb_height}" '
+                except Exception:
+                    pass
                 
                 # Enhanced status determination with QC
                 is_solved = question.get('solved_by_ai', False)
@@ -1760,6 +2487,12 @@ class ScalableAISolverManager:
                         existing_solution = json.dumps(solution_data, indent=2)
                     except:
                         existing_solution = ""
+                else:
+                    # Same image already solved (re-upload or another paper): prefill it
+                    cached_solution = solution_cache.get(image_path, subject) if os.path.isfile(image_path) else None
+                    if cached_solution:
+                        existing_solution = json.dumps(cached_solution, indent=2)
+                        status_text = "Pending (cached solution - review & save)"
                 
                 # QC section for flagged or reviewed questions
                 qc_section = ""
@@ -1771,13 +2504,13 @@ class ScalableAISolverManager:
                         {f'<p><strong>Review Notes:</strong> {reviewer_notes}</p>' if reviewer_notes else ''}
                         <textarea id="qc-notes-{question_num}" placeholder="Add review notes..." class="qc-notes">{reviewer_notes}</textarea>
                         <div class="qc-controls">
-                            <button onclick="reviewQuestion({question_num})" class="btn-small review-btn">Mark Reviewed</button>
-                            {f'<button onclick="unflagQuestion({question_num})" class="btn-small unflag-btn">Unflag</button>' if is_flagged else ''}
+                            <button data-action="review" data-q="{question_num}" class="btn-small review-btn">Mark Reviewed</button>
+                            {f'<button data-action="unflag" data-q="{question_num}" class="btn-small unflag-btn">Unflag</button>' if is_flagged else ''}
                         </div>
                     </div>'''
                 
                 questions_html += f'''
-                <div class="question-card" id="question-{question_num}">
+                <div class="question-card" id="question-{question_num}" data-status="{status_class}">
                     <div class="question-header">
                         <h3>Question {question_num}</h3>
                         <div class="status-indicator {status_class}" id="status-{question_num}">
@@ -1786,19 +2519,21 @@ class ScalableAISolverManager:
                     </div>
                     <div class="question-content">
                         <div class="image-section">
-                            <img src="{image_url}" alt="Question {question_num}" class="question-image" onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
+                            <img src="{thumb_url}" data-full="{image_url}" {thumb_dims}loading="lazy" decoding="async" alt="Question {question_num}" class="question-image">
                             <div style="display:none; padding: 2rem; text-align: center; color: #dc3545; border: 1px solid #dc3545; border-radius: 8px;">
                                 Image not found<br>
                                 <small>{filename}</small>
                             </div>
                             <div class="image-controls">
-                                <button onclick="openImage('{image_url}')" class="btn-small">Full Size</button>
-                                <button onclick="copyPrompt({question_num})" class="btn-small">Copy Prompt</button>
+                                <button data-action="open" data-q="{question_num}" class="btn-small">Full Size</button>
+                                <button data-action="copy" data-q="{question_num}" class="btn-small">Copy Prompt</button>
                                 <a href="https://claude.ai" target="_blank" class="btn-small claude-link">Claude.ai</a>
-                                <button onclick="togglePrompt({question_num})" class="btn-small">View Prompt</button>
+                                <button data-action="prompt" data-q="{question_num}" class="btn-small">View Prompt</button>
                             </div>
                         </div>
                         <div class="solution-section">
+                            <div class="card-skeleton"></div>
+                            <template class="card-controls">
                             {qc_section}
                             <div class="prompt-area">
                                 <div id="prompt-display-{question_num}" class="prompt-display" style="display: none;">
@@ -1808,11 +2543,12 @@ class ScalableAISolverManager:
                             <div class="solution-input-area">
                                 <textarea id="solution-{question_num}" placeholder="Paste Claude.ai JSON response here..." class="solution-textarea">{existing_solution}</textarea>
                                 <div class="solution-controls">
-                                    <button onclick="saveSolution({question_num})" class="btn-small save-btn">Save</button>
-                                    <button onclick="validateJSON({question_num})" class="btn-small validate-btn">Validate</button>
-                                    <button onclick="clearSolution({question_num})" class="btn-small clear-btn">Clear</button>
+                                    <button data-action="save" data-q="{question_num}" class="btn-small save-btn">Save</button>
+                                    <button data-action="validate" data-q="{question_num}" class="btn-small validate-btn">Validate</button>
+                                    <button data-action="clear" data-q="{question_num}" class="btn-small clear-btn">Clear</button>
                                 </div>
                             </div>
+                            </template>
                         </div>
                     </div>
                 </div>'''
@@ -1825,7 +2561,7 @@ class ScalableAISolverManager:
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800;900&display=swap" rel="stylesheet">
-    <style>{get_css_styles()}</style>
+    <link rel="stylesheet" href="{_HYBRID_CSS_URL}">
 </head>
 <body>
     <div class="container">
@@ -1862,7 +2598,7 @@ class ScalableAISolverManager:
                 </div>
                 <div class="stat-card">
                     <h4>Avg Confidence</h4>
-                    <div id="avgConfidence">{int(sum(q.get('confidence_score', 0) for q in questions if q.get('solved_by_ai')) / max(solved_count, 1) * 100) if solved_count > 0 else 0}%</div>
+                    <div id="avgConfidence">{int(self.solver_data.get("average_confidence", 0) * 100) if solved_count > 0 else 0}%</div>
                 </div>
             </div>
         </div>
@@ -1903,6 +2639,31 @@ class ScalableAISolverManager:
 scalable_solver = ScalableAISolverManager()
 
 # Flask Routes
+app.register_blueprint(hybrid_assets)
+app.extensions['hybrid_solver'] = scalable_solver
+
+@app.after_request
+def compress_response(response):
+    """Compress text pages and JSON on the fly (Brotli when available, else gzip)"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.mimetype not in _COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 304)):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if BROTLI_AVAILABLE and request.accept_encodings['br'] > 0:
+        response.set_data(brotli.compress(body, quality=5))
+        response.headers['Content-Encoding'] = 'br'
+    elif request.accept_encodings['gzip'] > 0:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @app.route('/solver/<paper_folder>')
 def serve_scalable_solver(paper_folder):
     try:
@@ -1971,17 +2732,102 @@ def export_solutions():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
+@app.route('/api/cache-stats')
+def cache_stats():
+    return jsonify({"success": True, "solution_cache": solution_cache.stats()})
+
+def _send_question_image(directory, filename):
+    """Send an image with ETag/Last-Modified 304s, ranges and long browser caching"""
+    response = send_from_directory(str(directory), filename, conditional=True, max_age=IMAGE_MAX_AGE)
+    if request.args.get('v'):
+        # Versioned URL: the bytes behind it never change
+        response.headers['Cache-Control'] = f'public, max-age={IMAGE_MAX_AGE}, immutable'
+    return response
+
+_thumb_lock = threading.Lock()
+
+def _image_version(stat):
+    """
+    Exact (mtime, size) fingerprint of an image. Copies restored from the extraction
+    cache may carry older mtimes than what they replace, so "newer than" is not enough
+    """
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+@lru_cache(maxsize=4096)
+def _thumbnail_size(image_path, version):
+    """Pixel size of the grid thumbnail for an image (reads the header only)"""
+    with Image.open(image_path) as img:
+        width, height = img.size
+    scale = min(1.0, THUMB_MAX_SIZE[0] / width, THUMB_MAX_SIZE[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def ensure_thumbnail(image_path):
+    """
+    WebP thumbnail for a question image (next to it in .thumbs/), named after the source's
+    fingerprint so any change to the source gets a new one
+    """
+    image_path = Path(image_path)
+    thumb_dir = image_path.parent / THUMB_DIR_NAME
+    thumb_path = thumb_dir / f"{image_path.stem}.{_image_version(image_path.stat())}.thumb.webp"
+    if thumb_path.exists():
+        return thumb_path
+    
+    with _thumb_lock:
+        thumb_dir.mkdir(exist_ok=True)
+        with Image.open(image_path) as img:
+            img.draft('RGB', THUMB_MAX_SIZE)  # JPEG: decode at reduced scale
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            img.thumbnail(THUMB_MAX_SIZE, Image.Resampling.LANCZOS)
+            tmp_path = thumb_path.with_name(thumb_path.name + '.tmp')
+            img.save(tmp_path, 'WEBP', quality=82, method=4)
+        os.replace(tmp_path, thumb_path)
+        
+        # Thumbnails of earlier versions of this image
+        for old_thumb in thumb_dir.glob(f"{image_path.stem}.*.thumb.webp"):
+            if old_thumb != thumb_path:
+                old_thumb.unlink(missing_ok=True)
+    return thumb_path
+
+def pregenerate_thumbnails(image_files):
+    """Build missing grid thumbnails in the background so the first page view is cheap"""
+    def worker():
+        built = 0
+        for image_file in image_files:
+            try:
+                ensure_thumbnail(image_file)
+                built += 1
+            except Exception as e:
+                print(f"⚠️ Thumbnail failed for {image_file}: {e}")
+        print(f"🖼️ Thumbnails ready: {built}/{len(image_files)}")
+    threading.Thread(target=worker, name="thumbnails", daemon=True).start()
+
 @app.route('/images/<paper_folder>/<filename>')
 def serve_paper_image(paper_folder, filename):
     try:
         paper_folder_path = QUESTION_BANKS_DIR / paper_folder
-        images_dir = paper_folder_path / "images"
-        if images_dir.exists():
-            return send_from_directory(str(images_dir), filename)
+        for folder in ("images", "extracted_images"):
+            image_dir = paper_folder_path / folder
+            if (image_dir / filename).is_file():
+                return _send_question_image(image_dir, filename)
         
-        extracted_images_dir = paper_folder_path / "extracted_images"
-        if extracted_images_dir.exists():
-            return send_from_directory(str(extracted_images_dir), filename)
+        return f"Image not found: {filename}", 404
+    except Exception as e:
+        return f"Error: {str(e)}", 500
+
+@app.route('/thumbs/<paper_folder>/<filename>')
+def serve_thumbnail(paper_folder, filename):
+    try:
+        paper_folder_path = QUESTION_BANKS_DIR / paper_folder
+        for folder in ("images", "extracted_images"):
+            image_path = paper_folder_path / folder / filename
+            if image_path.is_file():
+                try:
+                    thumb_path = ensure_thumbnail(image_path)
+                except Exception as e:
+                    print(f"⚠️ Thumbnail failed for {image_path}: {e}")
+                    return _send_question_image(image_path.parent, filename)
+                return _send_question_image(thumb_path.parent, thumb_path.name)
         
         return f"Image not found: {filename}", 404
     except Exception as e:
@@ -1992,7 +2838,7 @@ def serve_extracted_image(paper_folder, filename):
     try:
         extracted_images_dir = QUESTION_BANKS_DIR / paper_folder / "extracted_images"
         if extracted_images_dir.exists():
-            return send_from_directory(str(extracted_images_dir), filename)
+            return _send_question_image(extracted_images_dir, filename)
         return f"Image not found: {filename}", 404
     except Exception as e:
         return f"Error: {str(e)}", 500
@@ -2013,9 +2859,9 @@ def home():
                     # Count total images
                     total_images = 0
                     if images_folder.exists():
-                        total_images += len([f for f in images_folder.glob("*") if f.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.webp']])
+                        total_images += len([f for f in images_folder.glob("*") if f.suffix.lower() in _IMAGE_EXTENSIONS])
                     if extracted_images_folder.exists():
-                        total_images += len([f for f in extracted_images_folder.glob("*") if f.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.webp']])
+                        total_images += len([f for f in extracted_images_folder.glob("*") if f.suffix.lower() in _IMAGE_EXTENSIONS])
                     
                     # Check if solutions.json exists
                     solutions_file = paper_folder / "solutions.json"
@@ -2023,9 +2869,10 @@ def home():
                     
                     if solutions_file.exists():
                         try:
-                            with open(solutions_file, 'r') as f:
-                                data = json.load(f)
-                                questions = data.get('questions', [])
+                            # Resident copy, including saves not yet written to disk
+                            with scalable_solver._paper_lock(paper_folder.name):
+                                data = scalable_solver._load_solutions(paper_folder.name)
+                                questions = data.get('questions', []) if data else []
                                 solved_count = sum(1 for q in questions if q.get('solved_by_ai', False))
                         except:
                             solved_count = 0
@@ -2050,10 +2897,13 @@ def home():
             padding: 2rem; 
             background: linear-gradient(135deg, #667eea 0%, #764ba2 25%, #f093fb 50%, #f5576c 75%, #4facfe 100%); 
             background-size: 400% 400%;
-            animation: gradientShift 8s ease infinite;
             min-height: 100vh; 
         }
         
+        @media (prefers-reduced-motion: no-preference) {
+            body { animation: gradientShift 8s ease infinite; }
+        }
+        
         @keyframes gradientShift {
             0% { background-position: 0% 50%; }
             50% { background-position: 100% 50%; }
@@ -2144,20 +2994,43 @@ def home():
     
     return html
 
+def create_asgi_app():
+    """
+    ASGI entry point for uvicorn:
+        uvicorn --factory hybrid:create_asgi_app --port 5006
+    The Flask handlers run on the server's thread pool, so slow file I/O in one
+    request does not hold up the others. Returns None when asgiref is not installed
+    """
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+    except ImportError:
+        print("asgiref not installed - ASGI entry point unavailable (pip install asgiref)")
+        return None
+    return WsgiToAsgi(app)
+
 if __name__ == '__main__':
     print("Starting AxcelScore Hybrid Solver - Standalone Version...")
     print("=" * 70)
     print(f"Question banks: {QUESTION_BANKS_DIR}")
     print(f"Confidence threshold: {CONFIDENCE_THRESHOLD * 100}%")
-    print(f"Port: 5006 (standalone)")
-    print("Interface: http://localhost:5006")
+    print(f"Port: {HYBRID_PORT} (standalone)")
+    print(f"Interface: http://localhost:{HYBRID_PORT}")
     print("=" * 70)
     
     # Ensure directories exist
     QUESTION_BANKS_DIR.mkdir(exist_ok=True)
     
-    app.run(
-        host='0.0.0.0',
-        port=5006,
-        debug=True
-    )
\ No newline at end of file
+    # Serve requests concurrently with waitress when installed; otherwise the
+    # threaded Flask development server (with the debugger, as before)
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(
+            host='0.0.0.0',
+            port=HYBRID_PORT,
+            debug=True,
+            threaded=True
+        )
+    else:
+        # Each open page holds one thread for its progress stream
+        serve(app, host='0.0.0.0', port=HYBRID_PORT, threads=max(8, 2 * (os.cpu_count() or 1)))
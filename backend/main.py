@@ -31,10 +31,11 @@ sys.path.append(str(Path(__file__).parent))
 from review import ReviewManager, create_review_html_tab, get_review_css
 
 # Import the hybrid solver
-from hybrid import ScalableAISolverManager
+from hybrid import ScalableAISolverManager, hybrid_assets
 
 app = Flask(__name__)
 CORS(app)
+app.register_blueprint(hybrid_assets)  # CSS/JS of the hybrid solver page
 
 # Configuration - Proper separation for frontend integration
 BASE_DIR = Path("/Users/wynceaxcel/Apps/axcelscore/backend")
@@ -53,6 +54,7 @@ review_manager = ReviewManager(QUESTION_BANKS_DIR)
 
 # Initialize Hybrid Solver
 hybrid_solver = ScalableAISolverManager(QUESTION_BANKS_DIR)
+app.extensions['hybrid_solver'] = hybrid_solver  # Reported by /api/progress-stream
 
 # Global variables to track current file and metadata
 CURRENT_FILE_PATH = None
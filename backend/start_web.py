@@ -9,8 +9,9 @@ from pathlib import Path
 
 # Import the Flask app and functions from extractor
 try:
-    from extractor import WEB_MODE, app
-    if not WEB_MODE:
+    from extractor import create_web_app
+    app = create_web_app()
+    if app is None:
         print("❌ Flask not available. Install with: pip install flask flask-cors")
         sys.exit(1)
 except ImportError as e:
@@ -56,7 +57,7 @@ def start_server():
             print("=" * 60)
             
             # Start server WITHOUT debug mode to prevent restart loop
-            app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
+            app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False, threaded=True)
             return
             
         except OSError: